@@ -114,6 +114,7 @@ get_user_input() {
     
     read -p "Email address for notifications (optional): " EMAIL_ADDRESS
     read -p "Slack webhook URL for notifications (optional): " SLACK_WEBHOOK
+    read -p "Prometheus textfile collector directory for timing metrics (optional): " METRICS_DIR
 }
 
 # Create audit execution script
@@ -122,6 +123,7 @@ create_audit_script() {
     local website_url="$2"
     local email="$3"
     local slack_webhook="$4"
+    local metrics_dir="$5"
     
     local script_path="$PROJECT_ROOT/automation/scripts/run_${audit_type}_audit.sh"
     
@@ -139,6 +141,13 @@ AUDIT_TYPE="$audit_type"
 PROJECT_ROOT="$PROJECT_ROOT"
 EMAIL_ADDRESS="$email"
 SLACK_WEBHOOK="$slack_webhook"
+METRICS_DIR="$metrics_dir"
+
+# Per-stage timing histograms for node_exporter's textfile collector
+METRICS_ARGS=()
+if [ -n "\$METRICS_DIR" ]; then
+    METRICS_ARGS=(--metrics-dir "\$METRICS_DIR")
+fi
 
 # Logging
 LOG_FILE="\$PROJECT_ROOT/logs/automated_audit_\$(date +%Y%m%d_%H%M%S).log"
@@ -164,19 +173,19 @@ fi
 case \$AUDIT_TYPE in
     "quick")
         echo "Running quick audit (technical + performance)..."
-        python3 scripts/technical-audit.py "\$WEBSITE_URL" || echo "Technical audit failed"
+        python3 scripts/technical-audit.py "\${METRICS_ARGS[@]}" "\$WEBSITE_URL" || echo "Technical audit failed"
         python3 scripts/performance-audit.py "\$WEBSITE_URL" || echo "Performance audit failed"
         ;;
     "comprehensive")
         echo "Running comprehensive audit (all modules)..."
-        python3 scripts/technical-audit.py "\$WEBSITE_URL" || echo "Technical audit failed"
+        python3 scripts/technical-audit.py "\${METRICS_ARGS[@]}" "\$WEBSITE_URL" || echo "Technical audit failed"
         python3 scripts/performance-audit.py "\$WEBSITE_URL" || echo "Performance audit failed"
-        python3 scripts/content-audit.py "\$WEBSITE_URL" || echo "Content audit failed"
+        python3 scripts/content-audit.py "\${METRICS_ARGS[@]}" "\$WEBSITE_URL" || echo "Content audit failed"
         python3 scripts/competitive-audit.py "\$WEBSITE_URL" || echo "Competitive audit failed"
         ;;
     "technical")
         echo "Running technical audit..."
-        python3 scripts/technical-audit.py "\$WEBSITE_URL"
+        python3 scripts/technical-audit.py "\${METRICS_ARGS[@]}" "\$WEBSITE_URL"
         ;;
     "performance")
         echo "Running performance audit..."
@@ -184,7 +193,7 @@ case \$AUDIT_TYPE in
         ;;
     "content")
         echo "Running content audit..."
-        python3 scripts/content-audit.py "\$WEBSITE_URL"
+        python3 scripts/content-audit.py "\${METRICS_ARGS[@]}" "\$WEBSITE_URL"
         ;;
     "competitive")
         echo "Running competitive audit..."
@@ -204,6 +213,7 @@ python3 scripts/generate-report.py --latest || echo "Report generation failed"
 ARCHIVE_DIR="\$PROJECT_ROOT/data/history/\$(date +%Y-%m)"
 mkdir -p "\$ARCHIVE_DIR"
 cp reports/*.json "\$ARCHIVE_DIR/" 2>/dev/null || true
+cp reports/*.pages.ndjson* "\$ARCHIVE_DIR/" 2>/dev/null || true
 
 echo "Audit completed successfully!"
 
@@ -372,6 +382,7 @@ SEO Audit Trend Monitoring
 Monitor SEO performance trends over time
 """
 
+import gzip
 import json
 import logging
 from datetime import datetime, timedelta
@@ -415,6 +426,11 @@ class SEOTrendMonitor:
                     with open(audit_file, 'r') as f:
                         audit_data = json.load(f)
                         
+                    # Streamed technical audits keep pages in a separate NDJSON file
+                    if 'pages_file' in audit_data:
+                        audit_data['pages'] = self.read_pages(audit_file.parent / audit_data['pages_file'],
+                                                              url=audit_data.get('base_url'))
+                        
                     # Extract scores based on audit type
                     if 'technical_audit' in audit_file.name:
                         score = self.calculate_technical_score(audit_data)
@@ -436,6 +452,27 @@ class SEOTrendMonitor:
                     
         return historical_data
     
+    def read_pages(self, pages_file: Path, url: str = None) -> List[Dict]:
+        """
+        Read page records from a (possibly gzipped) NDJSON pages file, or only
+        the record for url. Records are in completion order, so the homepage
+        has to be found by URL rather than taken from the first line.
+        """
+        pages = []
+        if not pages_file.exists():
+            return pages
+        opener = gzip.open if pages_file.suffix == '.gz' else open
+        with opener(pages_file, 'rt') as f:
+            for line in f:
+                record = json.loads(line)
+                if 'annotation' in record:
+                    continue
+                if url is None:
+                    pages.append(record)
+                elif record.get('url', '').rstrip('/') == url.rstrip('/'):
+                    return [record]
+        return pages
+    
     def calculate_technical_score(self, technical_data: Dict) -> int:
         """Calculate technical SEO score from audit data"""
         score = 0
@@ -447,15 +484,18 @@ class SEOTrendMonitor:
         if technical_data.get('ssl_certificate', {}).get('https_supported'):
             score += 20
             
-        # Check pages for meta tags and headers
+        # Check the homepage for meta tags and headers
+        base_url = (technical_data.get('base_url') or '').rstrip('/')
         for page in technical_data.get('pages', []):
-            meta_issues = len(page.get('meta_tags', {}).get('issues', []))
+            if page.get('url', '').rstrip('/') != base_url:
+                continue
+            meta_issues = len((page.get('meta_tags') or {}).get('issues', []))
             if meta_issues == 0:
                 score += 20
             elif meta_issues <= 2:
                 score += 10
                 
-            header_issues = len(page.get('header_structure', {}).get('issues', []))
+            header_issues = len((page.get('header_structure') or {}).get('issues', []))
             if header_issues == 0:
                 score += 20
             elif header_issues <= 1:
@@ -562,7 +602,7 @@ EOF
     
     # Create necessary scripts
     print_status "Creating audit execution script..."
-    audit_script=$(create_audit_script "$AUDIT_TYPE" "$WEBSITE_URL" "$EMAIL_ADDRESS" "$SLACK_WEBHOOK")
+    audit_script=$(create_audit_script "$AUDIT_TYPE" "$WEBSITE_URL" "$EMAIL_ADDRESS" "$SLACK_WEBHOOK" "$METRICS_DIR")
     
     print_status "Creating notification script..."
     create_notification_script
@@ -605,6 +645,10 @@ EOF
         echo "Slack Notifications: Configured"
     fi
     
+    if [ -n "$METRICS_DIR" ]; then
+        echo "Timing Metrics: $METRICS_DIR/seo_audit_*.prom"
+    fi
+    
     echo ""
     echo "Management Commands:"
     echo "==================="
@@ -0,0 +1,7 @@
+"""
+Shared building blocks for the SEO audit scripts.
+
+The audit scripts themselves live next to this package as standalone
+executables (``technical-audit.py`` etc.); anything that more than one
+script needs, or that is big enough to deserve its own module, lives here.
+"""
@@ -0,0 +1,221 @@
+"""
+Canonical Clusters
+==================
+
+Crawl-wide resolution of ``rel=canonical``. Each page's declared canonical
+is an edge between integer URL IDs; a union-find over those edges groups
+pages into canonical clusters, and following the edges from a page finds
+chains (A -> B -> C) and loops (A -> B -> A).
+
+Canonical targets are checked against what the run already knows: the
+page records and the fetch memo (status, redirect history and headers are
+kept there after bodies are released). Nothing is fetched again; targets
+the run never fetched are counted as unresolved.
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from audit_core import issues
+from audit_core.fetch_memo import FetchMemo
+from audit_core.issues import IssueList
+from audit_core.records import PageRecord
+from audit_core.union_find import UnionFind
+from audit_core.url_index import URLIndex
+
+# Cluster listings in the results are cut to the largest ones
+MAX_LISTED_CLUSTERS = 50
+
+
+def declared_canonical(page: PageRecord) -> Optional[str]:
+    """The page's canonical as an absolute http(s) URL, None when missing or unusable"""
+    if page.error is not None or not page.meta_tags:
+        return None
+    href = page.meta_tags.get('canonical')
+    if not href:
+        return None
+    url = urljoin(page.url, href.strip())
+    if urlparse(url).scheme not in ('http', 'https'):
+        return None
+    return url
+
+
+def _is_noindex(value: Optional[str]) -> bool:
+    return bool(value) and 'noindex' in value.lower().replace(' ', '').split(',')
+
+
+class TargetStatus:
+    """What the run knows about a canonical target"""
+
+    __slots__ = ('status_code', 'redirects_to', 'noindex')
+
+    def __init__(self, status_code: Optional[int], redirects_to: Optional[str] = None,
+                 noindex: bool = False):
+        self.status_code = status_code
+        self.redirects_to = redirects_to
+        self.noindex = noindex
+
+
+def target_status(url: str, page: Optional[PageRecord], fetch_memo: FetchMemo) -> Optional[TargetStatus]:
+    """
+    Status of a canonical target from the fetch memo and its page record;
+    None when the run never fetched it (a fetch that failed is status 0)
+    """
+    known = url in fetch_memo
+    response = fetch_memo.peek(url)
+    if not known and page is None:
+        return None
+
+    status = TargetStatus(0)
+    if response is not None:
+        status.status_code = response.status_code
+        history = getattr(response, 'history', None) or ()
+        if history:
+            status.redirects_to = str(response.url)
+        status.noindex = _is_noindex(response.headers.get('x-robots-tag'))
+    elif page is not None and page.error is None:
+        status.status_code = page.status_code
+        status.redirects_to = page.final_url
+
+    if page is not None and page.meta_tags:
+        status.noindex = status.noindex or _is_noindex(page.meta_tags.get('robots'))
+    return status
+
+
+def _follow(start: int, declared: Dict[int, int],
+            memo: Dict[int, Tuple[Optional[int], int, Optional[List[int]]]]
+            ) -> Tuple[Optional[int], int, Optional[List[int]]]:
+    """
+    (terminal, hops, loop) for the canonical path from start: terminal is the
+    first URL that is self-canonical or declares nothing, or None when the
+    path runs into a loop, whose members are then listed in loop
+    """
+    path = []
+    position = {}
+    current = start
+    while current not in memo:
+        target = declared.get(current)
+        if target is None or target == current:
+            memo[current] = (current, 0, None)
+            break
+        if current in position:
+            cycle = path[position[current]:]
+            for member in cycle:
+                memo[member] = (None, len(cycle), cycle)
+            path = path[:position[current]]
+            break
+        position[current] = len(path)
+        path.append(current)
+        current = target
+
+    # Everything before the memoized node is one hop further from its terminal
+    for node in reversed(path):
+        if node in memo:
+            continue
+        terminal, hops, loop = memo[declared[node]]
+        memo[node] = (terminal, hops + 1, loop)
+    return memo[start]
+
+
+def resolve_canonicals(pages: Iterable[PageRecord], url_index: URLIndex,
+                       fetch_memo: FetchMemo) -> Dict:
+    """
+    Cluster pages by canonical, attach each declaring page's resolution to
+    ``page.canonical`` and return the crawl-wide summary
+    """
+    pages_by_id = {page.url_id: page for page in pages}
+    declared: Dict[int, int] = {}
+    for page in pages_by_id.values():
+        page.canonical = None
+        url = declared_canonical(page)
+        if url is not None:
+            declared[page.url_id] = url_index.id_for(url)
+
+    clusters = UnionFind()
+    for page_id, target_id in declared.items():
+        clusters.union(page_id, target_id)
+    cluster_members = clusters.groups(min_size=2)
+
+    paths: Dict[int, Tuple[Optional[int], int, Optional[List[int]]]] = {}
+    statuses: Dict[int, Optional[TargetStatus]] = {}
+    summary = {
+        'pages_with_canonical': len(declared),
+        'self_canonical': 0,
+        'canonicalized': 0,
+        'chains': 0,
+        'loops': 0,
+        'non_200_targets': 0,
+        'redirecting_targets': 0,
+        'noindex_targets': 0,
+        'unresolved_targets': 0
+    }
+    problem_targets = set()
+
+    for page_id, target_id in declared.items():
+        page = pages_by_id[page_id]
+        target_url = url_index.url(target_id)
+        members = cluster_members.get(clusters.find(page_id), ())
+        resolution = {
+            'target': target_url,
+            'resolved': None,
+            'hops': 0,
+            'cluster_size': len(members) or 1,
+            'issues': IssueList()
+        }
+        page.canonical = resolution
+        if target_id == page_id:
+            summary['self_canonical'] += 1
+            resolution['resolved'] = target_url
+            continue
+        summary['canonicalized'] += 1
+
+        terminal, hops, loop = _follow(page_id, declared, paths)
+        resolution['hops'] = hops
+        if loop is not None:
+            summary['loops'] += 1
+            page.add_issue(resolution['issues'], issues.CANONICAL_LOOP,
+                           urls=' -> '.join(url_index.url(member) for member in loop + loop[:1]))
+        else:
+            resolution['resolved'] = url_index.url(terminal)
+            if hops > 1:
+                summary['chains'] += 1
+                page.add_issue(resolution['issues'], issues.CANONICAL_CHAIN,
+                               hops=hops, url=resolution['resolved'])
+
+        if target_id not in statuses:
+            statuses[target_id] = target_status(target_url, pages_by_id.get(target_id), fetch_memo)
+        status = statuses[target_id]
+        if status is None:
+            summary['unresolved_targets'] += 1
+            continue
+        if status.redirects_to is not None:
+            summary['redirecting_targets'] += 1
+            page.add_issue(resolution['issues'], issues.CANONICAL_TARGET_REDIRECT,
+                           url=target_url, final=status.redirects_to)
+        elif status.status_code != 200:
+            summary['non_200_targets'] += 1
+            problem_targets.add(target_id)
+            page.add_issue(resolution['issues'], issues.CANONICAL_TARGET_NON_200,
+                           url=target_url, status=status.status_code or 'no response')
+        if status.noindex:
+            summary['noindex_targets'] += 1
+            problem_targets.add(target_id)
+            page.add_issue(resolution['issues'], issues.CANONICAL_TARGET_NOINDEX, url=target_url)
+
+    listed = []
+    for root, members in cluster_members.items():
+        # A cluster's canonical is the terminal most of its members resolve to
+        terminals = Counter(paths[member][0] for member in members
+                            if member in paths and paths[member][0] is not None)
+        canonical_id = terminals.most_common(1)[0][0] if terminals else None
+        listed.append({
+            'canonical': url_index.url(canonical_id) if canonical_id is not None else None,
+            'size': len(members),
+            'urls': url_index.urls_for(members)
+        })
+    listed.sort(key=lambda cluster: cluster['size'], reverse=True)
+    summary['clusters'] = len(listed)
+    summary['largest_clusters'] = listed[:MAX_LISTED_CLUSTERS]
+    summary['problem_targets'] = url_index.urls_for(problem_targets)[:100]
+    return summary
@@ -0,0 +1,139 @@
+"""
+Crawl Checkpoints
+=================
+
+Periodic snapshots of a technical crawl in a local SQLite file (WAL mode):
+the frontier and visited set as ``(url, depth, done)`` rows and every
+finished page record as compressed JSON. ``technical-audit.py --resume``
+loads the snapshot and continues the crawl instead of refetching everything.
+
+Rows are buffered in memory and written in one transaction every
+``checkpoint.interval_seconds``, so checkpointing costs one short commit per
+interval rather than one per page.
+"""
+
+import json
+import logging
+import sqlite3
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS frontier (
+    url TEXT PRIMARY KEY,
+    depth INTEGER NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    record BLOB NOT NULL
+);
+"""
+
+
+class CrawlCheckpoint:
+    """Buffered SQLite snapshot of one crawl's frontier, visited set and pages"""
+
+    def __init__(self, path: str, base_url: str, interval: float = 30):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.base_url = base_url
+        self.interval = interval
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+        self.queued_rows: Dict[str, int] = {}
+        self.page_rows: Dict[str, bytes] = {}
+        self.last_flush = time.monotonic()
+
+    @classmethod
+    def from_config(cls, config: Dict, base_url: str) -> Optional['CrawlCheckpoint']:
+        checkpoint_config = config.get('checkpoint', {})
+        if not checkpoint_config.get('enabled', True):
+            return None
+        return cls(
+            checkpoint_config.get('path', 'data/crawl-checkpoint.sqlite'),
+            base_url,
+            interval=checkpoint_config.get('interval_seconds', 30)
+        )
+
+    def _meta(self) -> Dict[str, str]:
+        return dict(self.conn.execute('SELECT key, value FROM meta'))
+
+    def start(self) -> None:
+        """Discard any previous snapshot and begin a new one"""
+        with self.conn:
+            self.conn.execute('DELETE FROM meta')
+            self.conn.execute('DELETE FROM frontier')
+            self.conn.execute('DELETE FROM pages')
+            self.conn.executemany('INSERT INTO meta VALUES (?, ?)', [
+                ('base_url', self.base_url),
+                ('started_at', datetime.now().isoformat()),
+                ('complete', '0')
+            ])
+        self.queued_rows.clear()
+        self.page_rows.clear()
+
+    def load(self) -> Optional[Tuple[Dict[str, int], List[Dict]]]:
+        """Visited URLs with their depths and the finished page records, if resumable"""
+        meta = self._meta()
+        if meta.get('base_url') != self.base_url:
+            if meta:
+                logger.warning(f"Checkpoint {self.path} is for {meta.get('base_url')}, not {self.base_url}")
+            return None
+        if meta.get('complete') == '1':
+            logger.info(f"Checkpoint {self.path} belongs to a finished run, nothing to resume")
+            return None
+
+        visited = dict(self.conn.execute('SELECT url, depth FROM frontier'))
+        pages = [json.loads(zlib.decompress(blob))
+                 for (blob,) in self.conn.execute('SELECT record FROM pages')]
+        logger.info(f"Resuming crawl from {self.path}: {len(pages)} pages done, "
+                    f"{len(visited) - len(pages)} still in the frontier")
+        return visited, pages
+
+    def queued(self, url: str, depth: int) -> None:
+        self.queued_rows[url] = depth
+
+    def completed(self, url: str, record: Dict) -> None:
+        self.page_rows[url] = zlib.compress(json.dumps(record, default=str).encode('utf-8'))
+        if time.monotonic() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write everything buffered since the last flush in one transaction"""
+        if self.queued_rows or self.page_rows:
+            with self.conn:
+                self.conn.executemany(
+                    'INSERT OR IGNORE INTO frontier (url, depth) VALUES (?, ?)',
+                    self.queued_rows.items())
+                self.conn.executemany(
+                    'INSERT OR REPLACE INTO pages VALUES (?, ?)', self.page_rows.items())
+                self.conn.executemany(
+                    'UPDATE frontier SET done = 1 WHERE url = ?', ((url,) for url in self.page_rows))
+            self.queued_rows.clear()
+            self.page_rows.clear()
+        self.last_flush = time.monotonic()
+
+    def finish(self) -> None:
+        """Mark the run complete and drop its rows so the file stays small"""
+        self.queued_rows.clear()
+        self.page_rows.clear()
+        with self.conn:
+            self.conn.execute('DELETE FROM frontier')
+            self.conn.execute('DELETE FROM pages')
+            self.conn.execute("UPDATE meta SET value = '1' WHERE key = 'complete'")
+        self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+
+    def close(self) -> None:
+        self.conn.close()
@@ -0,0 +1,65 @@
+"""
+Sitemap Coverage
+================
+
+Compares the URLs a sitemap declares with what a crawl actually found, using
+integer URL IDs from ``URLIndex`` so the set algebra stays cheap on large
+sites.
+"""
+
+from typing import Dict, Iterable, Mapping, Set
+
+from audit_core.url_index import URLIndex
+
+
+def linked_url_ids(internal_links: Mapping[int, Iterable[int]]) -> Set[int]:
+    """
+    IDs of every URL some other page links to; a page's links to itself
+    (nav, breadcrumbs) don't make it discoverable
+    """
+    linked_ids = set()
+    for source_id, targets in internal_links.items():
+        linked_ids.update(target_id for target_id in targets if target_id != source_id)
+    return linked_ids
+
+
+def diff_sitemap_coverage(url_index: URLIndex, sitemap_ids: Set[int], linked_ids: Set[int],
+                          statuses: Dict[int, int], crawlable_ids: Iterable[int] = None,
+                          sample_size: int = 100) -> Dict:
+    """
+    Diff sitemap URLs against discovered links and crawl statuses.
+
+    ``statuses`` maps audited URL IDs to their HTTP status (0 for fetch
+    errors). ``crawlable_ids`` limits "missing from sitemap" to URLs the
+    crawler would audit (same host, HTML), defaulting to every linked URL.
+    """
+    audited_ids = set(statuses)
+    crawlable = linked_ids if crawlable_ids is None else linked_ids & set(crawlable_ids)
+
+    failed = {url_id for url_id in audited_ids if statuses[url_id] != 200}
+
+    orphans = sitemap_ids - linked_ids
+    # Linked URLs that fail are broken links, not sitemap omissions
+    missing_from_sitemap = crawlable - sitemap_ids - failed
+    non_200 = sitemap_ids & failed
+    not_audited = sitemap_ids - audited_ids
+
+    def listing(url_ids: Set[int]) -> Dict:
+        return {
+            'count': len(url_ids),
+            'urls': url_index.urls_for(url_ids)[:sample_size]
+        }
+
+    return {
+        'sitemap_urls': len(sitemap_ids),
+        'linked_urls': len(linked_ids),
+        'audited_urls': len(audited_ids),
+        'orphans': listing(orphans),
+        'missing_from_sitemap': listing(missing_from_sitemap),
+        'sitemap_non_200': {
+            **listing(non_200),
+            'statuses': {url_index.url(url_id): statuses[url_id]
+                         for url_id in sorted(non_200)[:sample_size]}
+        },
+        'sitemap_not_audited': listing(not_audited)
+    }
@@ -0,0 +1,270 @@
+"""
+Site Crawler
+============
+
+Asyncio crawler used by ``TechnicalSEOAuditor.run_full_audit``.
+
+Each page goes through the three stages of the auditor's ``audit_url`` as a
+pipeline::
+
+    frontier -> fetchers -> analysis queue -> analyzers -> result queue -> writer
+
+``general.concurrent_requests`` fetcher tasks download pages; the analyzers
+hand the bodies to the auditor's process pool, so parsing runs on every core
+while downloads continue; a single writer merges each analysis into the
+crawl-wide state and queues the internal links it records in
+``auditor.internal_links`` (page ID -> target IDs in ``auditor.url_index``).
+Both inner queues are bounded, so fetchers wait while the analyzers are
+behind instead of holding an unbounded number of bodies in memory.
+
+The frontier is a ``PriorityFrontier`` (audit_core/frontier.py): with a
+``CrawlPriority`` the highest-value URLs are audited first, without one it
+is plain breadth-first. ``max_pages`` caps the pages audited and
+``max_seconds`` the crawl's duration; once either is spent the fetchers
+drain the rest of the frontier without fetching it. ``stopped_by`` names the
+budget only if a URL was actually refused that way, so a site that fits its
+budget exactly is not reported as cut short.
+"""
+
+import asyncio
+import logging
+import time
+from typing import AsyncIterable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urldefrag, urlparse
+
+from audit_core.fetching import FetchResult
+from audit_core.frontier import CrawlPriority, PriorityFrontier
+
+logger = logging.getLogger(__name__)
+
+# Links to these are recorded but never queued for an HTML audit
+SKIPPED_EXTENSIONS = (
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ico', '.avif',
+    '.css', '.js', '.mjs', '.json', '.xml', '.txt', '.zip', '.mp4', '.webm',
+    '.mp3', '.woff', '.woff2', '.ttf'
+)
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used for frontier de-duplication"""
+    url, _ = urldefrag(url.strip())
+    parsed = urlparse(url)
+    path = parsed.path or '/'
+    normalized = f"{parsed.scheme.lower()}://{parsed.netloc.lower()}{path}"
+    if parsed.query:
+        normalized += f"?{parsed.query}"
+    return normalized
+
+
+class SiteCrawler:
+    """Crawl a site from one or more seed URLs, auditing every page"""
+
+    def __init__(self, auditor, max_depth: int = 3, max_pages: int = 500,
+                 concurrency: int = 5, on_page: Optional[Callable] = None,
+                 on_enqueue: Optional[Callable] = None, analyzers: int = 1,
+                 queue_size: int = 32, priority: Optional[CrawlPriority] = None,
+                 max_seconds: Optional[float] = None):
+        self.auditor = auditor
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.max_seconds = max_seconds
+        self.priority = priority
+        self.concurrency = max(1, concurrency)
+        self.analyzers = max(1, analyzers)
+        self.queue_size = max(1, queue_size)
+        self.on_page = on_page
+        self.on_enqueue = on_enqueue
+        self.domain = urlparse(auditor.base_url).netloc.lower()
+        self.url_index = auditor.url_index
+        self.seen: Set[int] = set()
+        self.depths: Dict[int, int] = {}
+        self.results: List = []
+        # Pages taken off the frontier to audit (restored pages included)
+        self.taken = 0
+        self.deadline: Optional[float] = None
+        self.stopped_by: Optional[str] = None
+
+    def is_crawlable(self, url: str) -> bool:
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https'):
+            return False
+        if parsed.netloc.lower() != self.domain:
+            return False
+        return not parsed.path.lower().endswith(SKIPPED_EXTENSIONS)
+
+    def score(self, url_id: int, depth: int) -> float:
+        """Frontier priority of a URL; 0 for every URL without a CrawlPriority"""
+        if self.priority is None:
+            return 0.0
+        auditor = self.auditor
+        return self.priority.score(depth, auditor.sitemap_entries.get(url_id),
+                                   auditor.duplicate_index.changed_last_run(self.url_index.url(url_id)))
+
+    def enqueue(self, frontier: PriorityFrontier, url: str, depth: int) -> bool:
+        """
+        Queue a URL unless it was already seen; a URL still waiting is
+        re-queued if it now scores higher (e.g. its sitemap entry arrived)
+        """
+        url = normalize_url(url)
+        if not self.is_crawlable(url):
+            return False
+        url_id = self.url_index.id_for(url)
+        url = self.url_index.url(url_id)
+        if url_id in self.seen:
+            if self.priority is not None and url_id in frontier.pending:
+                depth = min(depth, self.depths[url_id])
+                self.depths[url_id] = depth
+                frontier.promote(url_id, url, depth, self.score(url_id, depth))
+            return False
+        self.seen.add(url_id)
+        self.depths[url_id] = depth
+        if self.on_enqueue is not None:
+            self.on_enqueue(url, depth)
+        frontier.push(url_id, url, depth, self.score(url_id, depth))
+        return True
+
+    def budget_spent(self) -> Optional[str]:
+        """The budget that is used up ('max_pages' or 'max_seconds'), None while both remain"""
+        if self.taken >= self.max_pages:
+            return 'max_pages'
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return 'max_seconds'
+        return None
+
+    def budget_stats(self) -> Dict:
+        return {
+            'max_pages': self.max_pages,
+            'max_seconds': self.max_seconds,
+            'audited': len(self.results),
+            'skipped': len(self.seen) - len(self.results),
+            'stopped_by': self.stopped_by
+        }
+
+    def restore(self, visited: Dict[str, int], pages: List) -> List[Tuple[str, int]]:
+        """Resume from a checkpoint; returns the (url, depth) pairs still to audit"""
+        done = {page.url_id for page in pages}
+        self.results.extend(pages)
+        self.taken += len(pages)
+        pending = []
+        for url, depth in visited.items():
+            url_id = self.url_index.id_for(url)
+            self.seen.add(url_id)
+            self.depths[url_id] = depth
+            if url_id not in done:
+                pending.append((self.url_index.url(url_id), depth))
+        return pending
+
+    def discovered_links(self, url: str) -> Iterable[str]:
+        url_id = self.url_index.get(url)
+        targets = self.auditor.internal_links.get(url_id, ())
+        return [self.url_index.url(target_id) for target_id in targets]
+
+    async def fetcher(self, frontier: PriorityFrontier, analysis_queue: asyncio.Queue,
+                      result_queue: asyncio.Queue) -> None:
+        while True:
+            item = await frontier.pop()
+            if item is None:
+                continue
+            spent = self.budget_spent()
+            if spent is not None:
+                # A URL is refused, so the budget really did stop the crawl
+                if self.stopped_by is None:
+                    self.stopped_by = spent
+                frontier.task_done()
+                continue
+            self.taken += 1
+            url, depth = item
+            try:
+                fetched = await self.auditor.fetch_for_audit(url)
+            except Exception as e:
+                logger.error(f"Crawler failed on {url}: {e}")
+                fetched = self.auditor.failed_page(url, str(e))
+            if isinstance(fetched, FetchResult):
+                await analysis_queue.put((url, depth, fetched))
+            else:
+                await result_queue.put((url, depth, fetched, None, None))
+
+    async def analyzer(self, analysis_queue: asyncio.Queue, result_queue: asyncio.Queue) -> None:
+        while True:
+            url, depth, response = await analysis_queue.get()
+            try:
+                analysis = await self.auditor.analyze_response(response)
+            except Exception as e:
+                logger.error(f"Analysis failed on {url}: {e}")
+                await result_queue.put((url, depth, self.auditor.failed_page(url, str(e)), None, None))
+            else:
+                await result_queue.put((url, depth, None, response, analysis))
+
+    async def writer(self, frontier: PriorityFrontier, result_queue: asyncio.Queue) -> None:
+        """The only stage that touches crawl-wide state, so it needs no locking"""
+        while True:
+            url, depth, page, response, analysis = await result_queue.get()
+            try:
+                if page is None:
+                    try:
+                        page = self.auditor.complete_page(url, response, analysis)
+                    except Exception as e:
+                        logger.error(f"Crawler failed on {url}: {e}")
+                        page = self.auditor.failed_page(url, str(e))
+                page.crawl_depth = depth
+                self.results.append(page)
+
+                # Links are queued even with the budget spent: the fetchers
+                # refuse them, which is what records the crawl as cut short
+                if depth < self.max_depth and page.error is None:
+                    for link in self.discovered_links(url):
+                        self.enqueue(frontier, link, depth + 1)
+                # After the page's links are queued, so a checkpoint taken
+                # here never records a page without its outgoing frontier
+                if self.on_page is not None:
+                    self.on_page(page)
+            except Exception as e:
+                # e.g. the NDJSON or checkpoint write; the writer must keep
+                # running or join() would wait forever
+                logger.error(f"Recording {url} failed: {e}")
+            finally:
+                # The frontier counts a URL as done only once it is written
+                frontier.task_done()
+
+    async def feed(self, frontier: PriorityFrontier, seed_stream: AsyncIterable[str]) -> None:
+        """Add seeds as a producer (e.g. the sitemap engine) yields them"""
+        async for url in seed_stream:
+            self.enqueue(frontier, url, 0)
+
+    async def crawl(self, seeds: Iterable[str],
+                    seed_stream: Optional[AsyncIterable[str]] = None,
+                    pending: Iterable[Tuple[str, int]] = ()) -> List:
+        """Crawl from the seed URLs (and any streamed seeds) and return the page records"""
+        queue = PriorityFrontier()
+        analysis_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        result_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.max_seconds is not None:
+            self.deadline = time.monotonic() + self.max_seconds
+        for url, depth in pending:
+            url_id = self.url_index.id_for(url)
+            queue.push(url_id, url, depth, self.score(url_id, depth))
+        for seed in seeds:
+            self.enqueue(queue, seed, 0)
+
+        workers = [asyncio.create_task(self.fetcher(queue, analysis_queue, result_queue))
+                   for _ in range(self.concurrency)]
+        workers.extend(asyncio.create_task(self.analyzer(analysis_queue, result_queue))
+                       for _ in range(self.analyzers))
+        workers.append(asyncio.create_task(self.writer(queue, result_queue)))
+        try:
+            if seed_stream is not None:
+                # The queue may drain while seeds are still arriving, so only
+                # wait for it once the producer is exhausted
+                await self.feed(queue, seed_stream)
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        logger.info(f"Crawl finished: {len(self.results)} pages audited, "
+                    f"{len(self.seen)} URLs discovered")
+        if self.stopped_by is not None:
+            logger.warning(f"Crawl budget ({self.stopped_by}) reached; "
+                           f"{len(self.seen) - len(self.results)} discovered URLs were not audited")
+        return self.results
@@ -0,0 +1,118 @@
+"""
+Run-scoped Fetch Memo
+=====================
+
+Remembers every response fetched during one audit run so that robots.txt,
+sitemaps and the homepage are downloaded once no matter how many analyzers
+ask for them. Fetches are single-flight: concurrent requests for the same
+URL (from coroutines or from threads) wait on the one fetch in progress and
+all receive the same response object. The fetch options that change what
+comes back (accepted content types, body size limit) are part of the key,
+so a headers-only or truncated fetch is never handed to a caller that asked
+for the full body.
+
+Page bodies can be released once a page has been analyzed; the status and
+headers stay available for crawl-wide checks such as canonical resolution.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from audit_core.crawler import normalize_url
+from audit_core.fetching import FetchResult
+
+_MISSING = object()
+
+
+class FetchMemo:
+    """Per-run (URL, fetch options) -> response memo with single-flight semantics"""
+
+    def __init__(self):
+        self.responses: Dict[Tuple, Any] = {}
+        # Normalized URL -> keys of its memoized responses, one per option set
+        self.variants: Dict[str, List[Tuple]] = {}
+        self.inflight: Dict[Tuple, asyncio.Task] = {}
+        self.key_locks: Dict[Tuple, threading.Lock] = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(url: str, *options: Hashable) -> Tuple:
+        return (normalize_url(url),) + options
+
+    def peek(self, url: str) -> Optional[Any]:
+        """
+        Return a memoized response for url without fetching, whatever options
+        it was fetched with (status, history and headers are the same)
+        """
+        keys = self.variants.get(normalize_url(url))
+        return self.responses[keys[0]] if keys else None
+
+    def __contains__(self, url: str) -> bool:
+        return normalize_url(url) in self.variants
+
+    def _store(self, key: Tuple, response: Any) -> None:
+        if key not in self.responses:
+            self.variants.setdefault(key[0], []).append(key)
+        self.responses[key] = response
+
+    def _lookup(self, key: Tuple):
+        response = self.responses.get(key, _MISSING)
+        if response is not _MISSING:
+            self.hits += 1
+        return response
+
+    def fetch_sync(self, url: str, fetch: Callable[[str], Any], *options: Hashable) -> Any:
+        """
+        Return the memoized response or call fetch(url) exactly once per
+        URL and options; options are whatever fetch was bound to
+        """
+        key = self.key(url, *options)
+        response = self._lookup(key)
+        if response is not _MISSING:
+            return response
+
+        with self.lock:
+            key_lock = self.key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            response = self._lookup(key)
+            if response is not _MISSING:
+                return response
+            self.misses += 1
+            response = fetch(url)
+            self._store(key, response)
+            return response
+
+    async def fetch(self, url: str, fetch: Callable[[str], Awaitable[Any]], *options: Hashable) -> Any:
+        """Async variant of fetch_sync; concurrent callers share one task"""
+        key = self.key(url, *options)
+        response = self._lookup(key)
+        if response is not _MISSING:
+            return response
+
+        task = self.inflight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.ensure_future(fetch(url))
+            self.inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.hits += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Tuple, task: asyncio.Task) -> None:
+        self.inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is None:
+            self._store(key, task.result())
+
+    def release_body(self, url: str) -> None:
+        """Drop a page body that has been analyzed, keeping status and headers"""
+        for key in self.variants.get(normalize_url(url), ()):
+            response = self.responses[key]
+            if isinstance(response, FetchResult):
+                response.content = b''
+
+    def stats(self) -> Dict[str, int]:
+        return {'urls': len(self.responses), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,275 @@
+"""
+Async HTTP fetching
+===================
+
+A small response object that looks enough like ``requests.Response`` for the
+analyzers (``status_code``, ``headers``, ``content``, ``text``, ``elapsed``)
+plus the aiohttp helpers used to fill it.
+
+Sessions from ``build_client_session`` carry a trace config that splits each
+fetch into DNS, connect, time-to-first-byte and download phases; pass a
+``StageTimings`` to ``fetch_async`` to record them.
+
+Bodies are streamed, never read whole: reading stops at ``max_bytes`` of
+decoded content (gzip/deflate/brotli are decompressed chunk by chunk as
+they arrive, so a compression bomb can't get past the cap either), and
+with ``content_types`` a response of any other type is closed right after
+its headers.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import aiohttp
+from multidict import CIMultiDict
+
+from audit_core.http_cache import CachedResponse, HTTPValidatorCache
+from audit_core.timings import StageTimings
+
+logger = logging.getLogger(__name__)
+
+CHARSET_RE = re.compile(r'charset=([\w\-]+)', re.IGNORECASE)
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+DEFAULT_MAX_BODY_BYTES = 5 * 1024 * 1024
+READ_CHUNK_BYTES = 64 * 1024
+
+
+class FetchResult:
+    """Response data for one fetched URL"""
+
+    def __init__(self, url: str, status_code: int, headers, content: bytes,
+                 elapsed: float, final_url: str = None, history: List[str] = None,
+                 from_cache: bool = False, truncated: bool = False, body_skipped: bool = False):
+        self.url = final_url or url
+        self.requested_url = url
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.elapsed = timedelta(seconds=elapsed)
+        self.history = history or []
+        self.from_cache = from_cache
+        # Body cut off at the max-bytes cap / not read because of its content type
+        self.truncated = truncated
+        self.body_skipped = body_skipped
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 400
+
+    @property
+    def encoding(self) -> str:
+        match = CHARSET_RE.search(self.headers.get('content-type', ''))
+        return match.group(1) if match else 'utf-8'
+
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding, errors='replace')
+        except LookupError:
+            return self.content.decode('utf-8', errors='replace')
+
+
+class FetchPhases:
+    """
+    Phase durations of one fetch, filled in by the session's trace config.
+    DNS and connect are None when a pooled connection was reused; TTFB and
+    download add up over redirect hops.
+    """
+
+    __slots__ = ('dns', 'connect', 'ttfb', '_dns_start', '_connect_start', '_dns_before',
+                 '_ready')
+
+    def __init__(self):
+        self.dns: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.ttfb = 0.0
+        self._dns_start = self._connect_start = self._ready = None
+        self._dns_before = 0.0
+
+    def record(self, timings: StageTimings, download: float, total: float) -> None:
+        if self.dns is not None:
+            timings.observe('fetch_dns', self.dns)
+        if self.connect is not None:
+            timings.observe('fetch_connect', self.connect)
+        timings.observe('fetch_ttfb', self.ttfb)
+        timings.observe('fetch_download', download)
+        timings.observe('fetch', total)
+
+
+def _phases(context: SimpleNamespace) -> Optional[FetchPhases]:
+    phases = context.trace_request_ctx
+    return phases if isinstance(phases, FetchPhases) else None
+
+
+async def _on_dns_start(session, context, params) -> None:
+    phases = _phases(context)
+    if phases is not None:
+        phases._dns_start = time.perf_counter()
+
+
+async def _on_dns_end(session, context, params) -> None:
+    phases = _phases(context)
+    if phases is not None and phases._dns_start is not None:
+        phases.dns = (phases.dns or 0.0) + time.perf_counter() - phases._dns_start
+
+
+async def _on_connect_start(session, context, params) -> None:
+    phases = _phases(context)
+    if phases is not None:
+        phases._connect_start = time.perf_counter()
+        phases._dns_before = phases.dns or 0.0
+
+
+async def _on_connect_end(session, context, params) -> None:
+    phases = _phases(context)
+    if phases is not None and phases._connect_start is not None:
+        now = time.perf_counter()
+        # Resolution happens inside connection setup; count it only as DNS
+        dns = (phases.dns or 0.0) - phases._dns_before
+        phases.connect = (phases.connect or 0.0) + now - phases._connect_start - dns
+        phases._ready = now
+
+
+async def _on_connection_ready(session, context, params) -> None:
+    phases = _phases(context)
+    if phases is not None:
+        phases._ready = time.perf_counter()
+
+
+async def _on_response_headers(session, context, params) -> None:
+    phases = _phases(context)
+    if phases is not None and phases._ready is not None:
+        phases.ttfb += time.perf_counter() - phases._ready
+        phases._ready = None
+
+
+def accepts_content_type(headers, content_types: Optional[Tuple[str, ...]]) -> bool:
+    """Whether a response's media type is one of content_types (no header counts as a match)"""
+    if not content_types:
+        return True
+    media_type = headers.get('content-type', '').split(';', 1)[0].strip().lower()
+    return not media_type or media_type in content_types
+
+
+def read_limited(chunks: Iterable[bytes], max_bytes: Optional[int]) -> Tuple[bytes, bool]:
+    """Join decoded body chunks up to max_bytes; returns (body, truncated)"""
+    body = bytearray()
+    for chunk in chunks:
+        body += chunk
+        if max_bytes is not None and len(body) > max_bytes:
+            del body[max_bytes:]
+            return bytes(body), True
+    return bytes(body), False
+
+
+async def read_limited_async(response: aiohttp.ClientResponse,
+                             max_bytes: Optional[int]) -> Tuple[bytes, bool]:
+    """read_limited for an aiohttp response, which decompresses as it streams"""
+    body = bytearray()
+    async for chunk in response.content.iter_chunked(READ_CHUNK_BYTES):
+        body += chunk
+        if max_bytes is not None and len(body) > max_bytes:
+            del body[max_bytes:]
+            return bytes(body), True
+    return bytes(body), False
+
+
+def phase_trace_config() -> aiohttp.TraceConfig:
+    """Trace config that fills in the FetchPhases passed as trace_request_ctx"""
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(_on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_end)
+    trace_config.on_connection_create_start.append(_on_connect_start)
+    trace_config.on_connection_create_end.append(_on_connect_end)
+    trace_config.on_connection_reuseconn.append(_on_connection_ready)
+    # Headers of a redirect hop arrive with on_request_redirect, the last with on_request_end
+    trace_config.on_request_redirect.append(_on_response_headers)
+    trace_config.on_request_end.append(_on_response_headers)
+    return trace_config
+
+
+def build_client_session(config: Dict, limit: int = None) -> aiohttp.ClientSession:
+    """Create an aiohttp session configured from audit-settings.json"""
+    general = config.get('general', {})
+    timeout_ms = general.get('timeout', 60000)
+    connector = aiohttp.TCPConnector(
+        limit=limit or general.get('concurrent_requests', 5),
+        ttl_dns_cache=300
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout_ms / 1000),
+        trace_configs=[phase_trace_config()],
+        headers={'User-Agent': general.get('user_agent',
+                                           'SEO-Audit-Bot/1.0 (Ultimate SEO Audit System)')}
+    )
+
+
+def result_from_cache(url: str, cached: CachedResponse, elapsed: float) -> FetchResult:
+    """Replay a cached body after the server answered 304 Not Modified"""
+    return FetchResult(url, cached.status, CIMultiDict(cached.headers), cached.body,
+                       elapsed, from_cache=True)
+
+
+async def fetch_async(session: aiohttp.ClientSession, url: str, timeout: float = None,
+                      cache: Optional[HTTPValidatorCache] = None,
+                      timings: Optional[StageTimings] = None,
+                      max_bytes: Optional[int] = DEFAULT_MAX_BODY_BYTES,
+                      content_types: Optional[Tuple[str, ...]] = None,
+                      revalidate: bool = True) -> FetchResult:
+    """
+    GET a URL and stream up to max_bytes of its body, or only its headers
+    when content_types is given and the response is of another type;
+    network errors propagate
+    """
+    request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+    headers = cache.conditional_headers(url) if cache and revalidate else {}
+    phases = FetchPhases() if timings is not None else None
+    start = time.perf_counter()
+    async with session.get(url, allow_redirects=True, timeout=request_timeout,
+                           headers=headers, trace_request_ctx=phases) as response:
+        if response.status == 304 and cache:
+            cached = cache.get(url)
+            if cached:
+                elapsed = time.perf_counter() - start
+                if phases is not None:
+                    phases.record(timings, 0.0, elapsed)
+                return result_from_cache(url, cached, elapsed)
+            if headers:
+                # The entry was evicted after its validators were read, so
+                # there is no body to replay: ask again unconditionally
+                response.release()
+                return await fetch_async(session, url, timeout, cache, timings, max_bytes,
+                                         content_types, revalidate=False)
+        download_start = time.perf_counter()
+        body_skipped = not accepts_content_type(response.headers, content_types)
+        if body_skipped:
+            content, truncated = b'', False
+        else:
+            content, truncated = await read_limited_async(response, max_bytes)
+        elapsed = time.perf_counter() - start
+        if phases is not None:
+            phases.record(timings, elapsed - (download_start - start), elapsed)
+        # A partial body must not be replayed on a later 304
+        if cache and not (truncated or body_skipped):
+            cache.store(url, response.status, response.headers, content)
+        return FetchResult(
+            url,
+            response.status,
+            response.headers,
+            content,
+            elapsed,
+            final_url=str(response.url),
+            history=[str(r.url) for r in response.history],
+            truncated=truncated,
+            body_skipped=body_skipped
+        )
+
+
+FETCH_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError)
@@ -0,0 +1,152 @@
+"""
+HTTP Validator Cache
+====================
+
+On-disk cache of response bodies keyed by URL, used to make repeat audits
+conditional: requests carry ``If-None-Match`` / ``If-Modified-Since`` from
+the previous run and a ``304 Not Modified`` is answered from the cache.
+
+Entries live in a single SQLite file with zlib-compressed bodies. The cache
+is bounded by total compressed size and evicts least recently used entries
+first.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+"""
+
+
+class CachedResponse:
+    """A cached body with the response metadata needed to replay it"""
+
+    __slots__ = ('url', 'status', 'headers', 'body', 'etag', 'last_modified')
+
+    def __init__(self, url: str, status: int, headers: Dict[str, str], body: bytes,
+                 etag: Optional[str], last_modified: Optional[str]):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+class HTTPValidatorCache:
+    """SQLite-backed LRU cache of validated response bodies"""
+
+    def __init__(self, path: str = 'data/http-cache.sqlite', max_bytes: int = 200 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.total_bytes = self.conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    @classmethod
+    def from_config(cls, config: Dict) -> Optional['HTTPValidatorCache']:
+        cache_config = config.get('cache', {})
+        if not cache_config.get('enabled', False):
+            return None
+        return cls(
+            path=cache_config.get('path', 'data/http-cache.sqlite'),
+            max_bytes=int(cache_config.get('max_megabytes', 200) * 1024 * 1024)
+        )
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Request headers that revalidate the cached copy of url, if any"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT etag, last_modified FROM entries WHERE url = ?', (url,)).fetchone()
+        if not row:
+            return {}
+        headers = {}
+        if row[0]:
+            headers['If-None-Match'] = row[0]
+        if row[1]:
+            headers['If-Modified-Since'] = row[1]
+        return headers
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        """Return the cached response for url and mark it recently used"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT status, headers, body, etag, last_modified FROM entries WHERE url = ?',
+                (url,)).fetchone()
+            if not row:
+                return None
+            self.conn.execute('UPDATE entries SET accessed_at = ? WHERE url = ?',
+                              (time.time(), url))
+            self.conn.commit()
+        status, headers, body, etag, last_modified = row
+        return CachedResponse(url, status, json.loads(headers), zlib.decompress(body),
+                              etag, last_modified)
+
+    def store(self, url: str, status: int, headers, body: bytes) -> bool:
+        """Cache a 200 response that carries validators; returns whether it was stored"""
+        headers = {k.lower(): v for k, v in headers.items()}
+        etag = headers.get('etag')
+        last_modified = headers.get('last-modified')
+        if status != 200 or not (etag or last_modified):
+            return False
+        if 'no-store' in headers.get('cache-control', '').lower():
+            return False
+
+        compressed = zlib.compress(body, 6)
+        if len(compressed) > self.max_bytes:
+            return False
+        header_json = json.dumps(headers)
+        now = time.time()
+
+        with self.lock:
+            previous = self.conn.execute(
+                'SELECT size FROM entries WHERE url = ?', (url,)).fetchone()
+            self.conn.execute(
+                'INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, etag, last_modified, status, header_json, compressed,
+                 len(compressed), now, now))
+            self.total_bytes += len(compressed) - (previous[0] if previous else 0)
+            self._evict()
+            self.conn.commit()
+        return True
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits; caller holds the lock"""
+        while self.total_bytes > self.max_bytes:
+            rows = self.conn.execute(
+                'SELECT url, size FROM entries ORDER BY accessed_at LIMIT 64').fetchall()
+            if not rows:
+                self.total_bytes = 0
+                return
+            for url, size in rows:
+                self.conn.execute('DELETE FROM entries WHERE url = ?', (url,))
+                self.total_bytes -= size
+                if self.total_bytes <= self.max_bytes:
+                    break
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,89 @@
+"""
+Incremental Re-audits
+=====================
+
+Page records from the previous technical audit, so that a nightly run only
+re-analyzes pages that changed. A previous record is reused when any of
+these says the page is unchanged:
+
+- its sitemap ``lastmod`` is older than the previous audit of the page
+  (no request at all)
+- the server answered the conditional request with 304 Not Modified
+- the body hash matches the previous body hash
+
+Records are kept zlib-compressed per URL until they are needed.
+"""
+
+import json
+import logging
+import zlib
+from pathlib import Path
+from typing import Dict, Optional
+
+from audit_core.crawler import normalize_url
+from audit_core.result_stream import iter_ndjson
+from audit_core.sitemaps import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+# Fields added by crawl-wide analyses; recomputed every run
+POST_CRAWL_FIELDS = ('link_graph',)
+
+
+class PreviousRun:
+    """Page records of an earlier streamed technical audit, by normalized URL"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.records: Dict[str, bytes] = {}
+        self.stats = {'loaded': 0, 'sitemap_lastmod': 0, 'not_modified': 0, 'body_hash': 0}
+
+    @classmethod
+    def load(cls, summary_path: str) -> Optional['PreviousRun']:
+        """Load a results summary written by ResultStreamWriter"""
+        summary_path = Path(summary_path)
+        try:
+            with open(summary_path, 'r') as f:
+                summary = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read previous results {summary_path}: {e}")
+            return None
+        if 'pages_file' not in summary:
+            logger.warning(f"{summary_path} has no streamed pages file, running a full audit")
+            return None
+
+        previous = cls(summary_path)
+        # Annotation lines carry post-crawl fields, which are recomputed anyway
+        for record in iter_ndjson(summary_path.parent / summary['pages_file']):
+            if 'annotation' in record or 'error' in record or record.get('status_code') != 200:
+                continue
+            for field in POST_CRAWL_FIELDS:
+                record.pop(field, None)
+            previous.records[normalize_url(record['url'])] = zlib.compress(
+                json.dumps(record).encode('utf-8'))
+        previous.stats['loaded'] = len(previous.records)
+        logger.info(f"Loaded {len(previous.records)} page records from {summary_path}")
+        return previous
+
+    @classmethod
+    def latest(cls, reports_dir: str = 'reports') -> Optional['PreviousRun']:
+        """The most recent streamed technical audit in reports_dir"""
+        candidates = sorted(Path(reports_dir).glob('technical_audit_*.json'),
+                            key=lambda path: path.stat().st_mtime, reverse=True)
+        for path in candidates:
+            previous = cls.load(path)
+            if previous is not None:
+                return previous
+        logger.info("No previous technical audit found, running a full audit")
+        return None
+
+    def get(self, url: str) -> Optional[Dict]:
+        blob = self.records.get(normalize_url(url))
+        return json.loads(zlib.decompress(blob)) if blob else None
+
+    @staticmethod
+    def unchanged_since(record: Dict, lastmod: Optional[str]) -> bool:
+        """True when the sitemap says the page last changed before it was audited"""
+        changed = parse_timestamp(lastmod)
+        audited = parse_timestamp(record.get('timestamp'))
+        return changed is not None and audited is not None and changed < audited
@@ -0,0 +1,233 @@
+"""
+Issue Registry
+==============
+
+Every issue the technical analyzers can report, with a stable integer code,
+a category and a severity. Analyzers record issues through ``IssueList``,
+which keeps the human-readable message (what the reports show) next to the
+code; page records carry the codes as a compact ``array('H')`` and the
+crawl-wide summary is a handful of ``numpy.bincount`` calls over them.
+
+Codes are grouped by category (1xx meta tags, 2xx headers, 3xx links,
+4xx mobile, 5xx structured data). Never renumber an issue: codes are stored in result files.
+"""
+
+import re
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+CRITICAL = 'critical'
+WARNING = 'warning'
+SEVERITIES = (WARNING, CRITICAL)
+
+
+class IssueType:
+    """One kind of issue; template is formatted with the issue's parameters"""
+
+    __slots__ = ('code', 'name', 'category', 'severity', 'template', 'pattern')
+
+    def __init__(self, code: int, name: str, category: str, severity: str, template: str):
+        self.code = code
+        self.name = name
+        self.category = category
+        self.severity = severity
+        self.template = template
+        # Matches messages written from the template, for records without codes
+        literal_parts = re.split(r'\{\w+\}', template)
+        self.pattern = re.compile('.*?'.join(re.escape(part) for part in literal_parts) + '$',
+                                  re.DOTALL)
+
+    def message(self, **params) -> str:
+        return self.template.format(**params)
+
+
+class IssueRegistry:
+    """All issue types, indexed by code"""
+
+    def __init__(self):
+        self.types: Dict[int, IssueType] = {}
+        self.categories: List[str] = []
+
+    def register(self, code: int, name: str, category: str, severity: str,
+                 template: str) -> IssueType:
+        if code in self.types:
+            raise ValueError(f"Issue code {code} is already registered")
+        if severity not in SEVERITIES:
+            raise ValueError(f"Unknown severity: {severity}")
+        if category not in self.categories:
+            self.categories.append(category)
+        issue_type = IssueType(code, name, category, severity, template)
+        self.types[code] = issue_type
+        return issue_type
+
+    def __getitem__(self, code: int) -> IssueType:
+        return self.types[code]
+
+    @property
+    def size(self) -> int:
+        """One past the highest code, the length of per-code count arrays"""
+        return max(self.types) + 1
+
+    def code_for_message(self, message: str, category: str = None) -> int:
+        """Best-effort code for a message from an older result file; 0 if unknown"""
+        for issue_type in self.types.values():
+            if category is not None and issue_type.category != category:
+                continue
+            if issue_type.pattern.match(message):
+                return issue_type.code
+        return 0
+
+    def lookup_arrays(self):
+        """Per-code severity index and category index arrays (unknown codes -> -1)"""
+        severity_of = np.full(self.size, -1, dtype=np.int8)
+        category_of = np.full(self.size, -1, dtype=np.int16)
+        for code, issue_type in self.types.items():
+            severity_of[code] = SEVERITIES.index(issue_type.severity)
+            category_of[code] = self.categories.index(issue_type.category)
+        return severity_of, category_of
+
+
+ISSUES = IssueRegistry()
+
+# Meta tags
+TITLE_MISSING = ISSUES.register(
+    101, 'title_missing', 'meta_tags', CRITICAL, "Missing title tag")
+TITLE_TOO_SHORT = ISSUES.register(
+    102, 'title_too_short', 'meta_tags', WARNING, "Title too short ({length} chars, min: {minimum})")
+TITLE_TOO_LONG = ISSUES.register(
+    103, 'title_too_long', 'meta_tags', WARNING, "Title too long ({length} chars, max: {maximum})")
+DESCRIPTION_MISSING = ISSUES.register(
+    104, 'meta_description_missing', 'meta_tags', CRITICAL, "Missing meta description")
+DESCRIPTION_TOO_SHORT = ISSUES.register(
+    105, 'meta_description_too_short', 'meta_tags', WARNING, "Meta description too short ({length} chars)")
+DESCRIPTION_TOO_LONG = ISSUES.register(
+    106, 'meta_description_too_long', 'meta_tags', WARNING, "Meta description too long ({length} chars)")
+META_KEYWORDS_PRESENT = ISSUES.register(
+    107, 'meta_keywords_present', 'meta_tags', WARNING, "Meta keywords tag found (not recommended)")
+CANONICAL_MISSING = ISSUES.register(
+    108, 'canonical_missing', 'meta_tags', CRITICAL, "Missing canonical tag")
+CANONICAL_INVALID = ISSUES.register(
+    109, 'canonical_invalid', 'meta_tags', CRITICAL, "Invalid canonical URL: {url}")
+CANONICAL_CHAIN = ISSUES.register(
+    110, 'canonical_chain', 'meta_tags', WARNING, "Canonical chain of {hops} hops ends at {url}")
+CANONICAL_LOOP = ISSUES.register(
+    111, 'canonical_loop', 'meta_tags', CRITICAL, "Canonical loop: {urls}")
+CANONICAL_TARGET_NON_200 = ISSUES.register(
+    112, 'canonical_target_non_200', 'meta_tags', CRITICAL, "Canonical target returns {status}: {url}")
+CANONICAL_TARGET_REDIRECT = ISSUES.register(
+    113, 'canonical_target_redirect', 'meta_tags', WARNING, "Canonical target redirects: {url} -> {final}")
+CANONICAL_TARGET_NOINDEX = ISSUES.register(
+    114, 'canonical_target_noindex', 'meta_tags', CRITICAL, "Canonical target is noindex: {url}")
+
+# Header hierarchy
+H1_MISSING = ISSUES.register(
+    201, 'h1_missing', 'header_structure', CRITICAL, "No H1 tag found")
+H1_MULTIPLE = ISSUES.register(
+    202, 'h1_multiple', 'header_structure', WARNING, "Multiple H1 tags found ({count})")
+HEADER_LEVEL_SKIPPED = ISSUES.register(
+    203, 'header_level_skipped', 'header_structure', WARNING, "Header hierarchy skip: {tag} after H{previous}")
+
+# Links
+GENERIC_ANCHOR_TEXT = ISSUES.register(
+    301, 'generic_anchor_text', 'internal_links', WARNING, "Generic anchor text: '{text}'")
+BROKEN_LINKS = ISSUES.register(
+    302, 'broken_links', 'internal_links', WARNING, "{count} broken links")
+
+# Mobile
+VIEWPORT_MISSING = ISSUES.register(
+    401, 'viewport_missing', 'mobile_friendliness', CRITICAL, "Missing viewport meta tag")
+VIEWPORT_NOT_DEVICE_WIDTH = ISSUES.register(
+    402, 'viewport_not_device_width', 'mobile_friendliness', WARNING,
+    "Viewport tag doesn't include 'width=device-width'")
+VIEWPORT_NO_INITIAL_SCALE = ISSUES.register(
+    403, 'viewport_no_initial_scale', 'mobile_friendliness', WARNING,
+    "Viewport tag doesn't include 'initial-scale=1'")
+
+# Structured data
+SCHEMA_INVALID_JSON = ISSUES.register(
+    501, 'schema_invalid_json', 'schema_markup', CRITICAL, "Invalid JSON-LD: {error}")
+SCHEMA_TYPE_UNKNOWN = ISSUES.register(
+    502, 'schema_type_unknown', 'schema_markup', CRITICAL, "Unknown schema.org type: {type}")
+SCHEMA_PROPERTY_UNKNOWN = ISSUES.register(
+    503, 'schema_property_unknown', 'schema_markup', WARNING, "Unknown schema.org property: {property}")
+SCHEMA_PROPERTY_UNEXPECTED = ISSUES.register(
+    504, 'schema_property_unexpected', 'schema_markup', WARNING,
+    "Property '{property}' is not expected on {type}")
+SCHEMA_REQUIRED_MISSING = ISSUES.register(
+    505, 'schema_required_missing', 'schema_markup', CRITICAL,
+    "{type} is missing required property '{property}'")
+SCHEMA_RECOMMENDED_MISSING = ISSUES.register(
+    506, 'schema_recommended_missing', 'schema_markup', WARNING,
+    "{type} is missing recommended property '{property}'")
+SCHEMA_TERM_SUPERSEDED = ISSUES.register(
+    507, 'schema_term_superseded', 'schema_markup', WARNING,
+    "Superseded schema.org term: {term} (use {replacement})")
+
+
+class IssueList(list):
+    """
+    An analyzer section's issue messages, with their codes alongside.
+
+    Serializes as the plain list of messages, so result files keep their
+    shape; the codes travel separately on the page record.
+    """
+
+    __slots__ = ('codes',)
+
+    def __init__(self, messages: Iterable[str] = (), codes: Iterable[int] = ()):
+        super().__init__(messages)
+        self.codes = array('H', codes)
+
+    def add(self, issue_type: IssueType, **params) -> str:
+        message = issue_type.message(**params)
+        self.append(message)
+        self.codes.append(issue_type.code)
+        return message
+
+
+def summarize_issues(code_arrays: Iterable[array]) -> Dict:
+    """Crawl-wide issue counts from every page's issue code array"""
+    code_arrays = list(code_arrays)
+    lengths = np.fromiter((len(codes) for codes in code_arrays), dtype=np.int64,
+                          count=len(code_arrays))
+    codes = np.frombuffer(b''.join(codes.tobytes() for codes in code_arrays), dtype=np.uint16)
+    codes = codes.astype(np.int64)
+
+    size = max(ISSUES.size, int(codes.max()) + 1 if codes.size else 0)
+    counts = np.bincount(codes, minlength=size)
+    severity_of, category_of = ISSUES.lookup_arrays()
+    severity_of = np.pad(severity_of, (0, size - severity_of.size), constant_values=-1)
+    category_of = np.pad(category_of, (0, size - category_of.size), constant_values=-1)
+
+    # Pages affected: distinct (page, code) pairs, counted per code
+    page_of = np.repeat(np.arange(lengths.size), lengths)
+    pairs = np.unique(page_of * size + codes)
+    pages_affected = np.bincount(pairs % size, minlength=size)
+
+    known = severity_of >= 0
+    by_severity = np.bincount(severity_of[known], weights=counts[known], minlength=len(SEVERITIES))
+    by_category = np.bincount(category_of[known], weights=counts[known],
+                              minlength=len(ISSUES.categories))
+
+    top_issues = []
+    for code in np.argsort(-counts, kind='stable'):
+        if not counts[code]:
+            break
+        issue_type: Optional[IssueType] = ISSUES.types.get(int(code))
+        top_issues.append({
+            'code': int(code),
+            'name': issue_type.name if issue_type else 'unknown',
+            'category': issue_type.category if issue_type else None,
+            'severity': issue_type.severity if issue_type else None,
+            'count': int(counts[code]),
+            'pages': int(pages_affected[code])
+        })
+
+    return {
+        'total_issues': int(counts.sum()),
+        'by_severity': {severity: int(by_severity[i]) for i, severity in enumerate(SEVERITIES)},
+        'by_category': {category: int(by_category[i]) for i, category in enumerate(ISSUES.categories)},
+        'issues': top_issues
+    }
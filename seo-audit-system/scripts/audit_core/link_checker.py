@@ -0,0 +1,141 @@
+"""
+Broken Link Checker
+===================
+
+Verifies every unique link target of a crawl exactly once. Statuses already
+known for the run (pages the crawler fetched) are reused, recent results are
+read from an on-disk cache with a TTL, and the rest are checked concurrently
+over the shared connection pool with ``HEAD``, falling back to ``GET`` for
+servers that reject ``HEAD``.
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Statuses that mean "HEAD not supported here", not "link broken"
+HEAD_REJECTED = frozenset((400, 403, 405, 501))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS link_status (
+    url TEXT PRIMARY KEY,
+    status INTEGER NOT NULL,
+    checked_at REAL NOT NULL
+);
+"""
+
+
+def is_broken(status: int) -> bool:
+    return status == 0 or status >= 400
+
+
+class LinkStatusCache:
+    """SQLite store of link statuses that expire after ttl seconds"""
+
+    def __init__(self, path: str, ttl: float):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+
+    def fresh(self, urls: Iterable[str]) -> Dict[str, int]:
+        """Cached statuses for urls that have not expired"""
+        cutoff = time.time() - self.ttl
+        found = {}
+        with self.lock:
+            for url in urls:
+                row = self.conn.execute(
+                    'SELECT status FROM link_status WHERE url = ? AND checked_at >= ?',
+                    (url, cutoff)).fetchone()
+                if row:
+                    found[url] = row[0]
+        return found
+
+    def store(self, statuses: Dict[str, int]) -> None:
+        now = time.time()
+        with self.lock:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO link_status VALUES (?, ?, ?)',
+                [(url, status, now) for url, status in statuses.items() if status])
+            self.conn.execute('DELETE FROM link_status WHERE checked_at < ?', (now - self.ttl,))
+            self.conn.commit()
+
+    def close(self) -> None:
+        with self.lock:
+            self.conn.close()
+
+
+class LinkChecker:
+    """Check a set of link targets concurrently, each one once"""
+
+    def __init__(self, session: aiohttp.ClientSession, scheduler=None,
+                 cache: Optional[LinkStatusCache] = None, concurrency: int = 10,
+                 timeout: float = 15):
+        self.session = session
+        self.scheduler = scheduler
+        self.cache = cache
+        self.concurrency = max(1, concurrency)
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.stats = {'unique': 0, 'known': 0, 'cached': 0, 'checked': 0, 'get_fallbacks': 0}
+
+    async def _request(self, method: str, url: str) -> int:
+        async with self.session.request(method, url, allow_redirects=True,
+                                        timeout=self.timeout) as response:
+            return response.status
+
+    async def check(self, url: str) -> int:
+        """HTTP status for url, 0 when it cannot be fetched at all"""
+        try:
+            if self.scheduler is not None:
+                async with self.scheduler.slot(url):
+                    status = await self._request('HEAD', url)
+            else:
+                status = await self._request('HEAD', url)
+            if status in HEAD_REJECTED:
+                self.stats['get_fallbacks'] += 1
+                if self.scheduler is not None:
+                    await self.scheduler.wait(url)
+                status = await self._request('GET', url)
+            return status
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.debug(f"Link check failed for {url}: {e}")
+            return 0
+
+    async def check_all(self, urls: Iterable[str], known: Dict[str, int] = None) -> Dict[str, int]:
+        """Statuses for every unique url; known statuses from this run are not re-checked"""
+        unique = set(urls)
+        known = known or {}
+        statuses = {url: known[url] for url in unique if url in known}
+        self.stats['unique'] = len(unique)
+        self.stats['known'] = len(statuses)
+
+        remaining = unique - statuses.keys()
+        if self.cache:
+            cached = self.cache.fresh(remaining)
+            statuses.update(cached)
+            self.stats['cached'] = len(cached)
+            remaining -= cached.keys()
+
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(url: str):
+            async with limit:
+                return url, await self.check(url)
+
+        checked = dict(await asyncio.gather(*(bounded(url) for url in remaining)))
+        self.stats['checked'] = len(checked)
+        statuses.update(checked)
+
+        if self.cache:
+            self.cache.store(checked)
+        return statuses
@@ -0,0 +1,172 @@
+"""
+Internal Link Graph
+===================
+
+Compressed sparse row (CSR) adjacency over integer URL IDs with vectorized
+graph metrics for a crawl:
+
+- internal PageRank by power iteration (``np.bincount`` over the edge list)
+- click depth from the homepage by level-synchronous BFS
+- in/out degree, orphan pages (no inbound links) and dead ends (no outbound links)
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+UNREACHABLE = -1
+
+
+def _pairs(edges: Iterable[Tuple[int, int]]) -> np.ndarray:
+    return np.fromiter((v for edge in edges for v in edge), dtype=np.int64).reshape(-1, 2)
+
+
+class LinkGraph:
+    """Directed graph of internal links in CSR form"""
+
+    def __init__(self, num_nodes: int, indptr: np.ndarray, indices: np.ndarray):
+        self.num_nodes = num_nodes
+        self.indptr = indptr
+        self.indices = indices
+
+    @classmethod
+    def from_edges(cls, num_nodes: int, edges: Iterable[Tuple[int, int]]) -> 'LinkGraph':
+        """Build from (source, target) ID pairs; duplicates and self-links are dropped"""
+        return cls._from_pairs(num_nodes, _pairs(edges))
+
+    @classmethod
+    def from_url_ids(cls, edges: Iterable[Tuple[int, int]],
+                     nodes: Iterable[int] = ()) -> Tuple['LinkGraph', np.ndarray]:
+        """
+        Build over only the URL IDs that appear in ``edges`` or ``nodes``,
+        renumbered 0..n-1 so unrelated IDs (assets, external URLs) are not
+        nodes. Returns the graph and the URL ID of each node.
+        """
+        pairs = _pairs(edges)
+        url_ids = np.unique(np.concatenate([pairs.ravel(), np.fromiter(nodes, dtype=np.int64)]))
+        return cls._from_pairs(int(url_ids.size), np.searchsorted(url_ids, pairs)), url_ids
+
+    @classmethod
+    def _from_pairs(cls, num_nodes: int, pairs: np.ndarray) -> 'LinkGraph':
+        src, dst = pairs[:, 0], pairs[:, 1]
+        keep = src != dst
+        # One edge per (source, target), sorted by source for the CSR layout
+        keys = np.unique(src[keep] * num_nodes + dst[keep])
+        src, dst = keys // num_nodes, keys % num_nodes
+
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=num_nodes), out=indptr[1:])
+        return cls(num_nodes, indptr, dst.astype(np.int32))
+
+    @property
+    def num_edges(self) -> int:
+        return int(self.indices.size)
+
+    def out_degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def in_degree(self) -> np.ndarray:
+        return np.bincount(self.indices, minlength=self.num_nodes)
+
+    def sources(self) -> np.ndarray:
+        """Source ID of every edge, aligned with ``indices``"""
+        return np.repeat(np.arange(self.num_nodes, dtype=np.int32), self.out_degree())
+
+    def pagerank(self, damping: float = 0.85, tol: float = 1e-10, max_iter: int = 100) -> np.ndarray:
+        n = self.num_nodes
+        if n == 0:
+            return np.zeros(0)
+        out_degree = self.out_degree().astype(np.float64)
+        src, dst = self.sources(), self.indices
+        dangling = out_degree == 0
+        inv_out = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            flow = np.bincount(dst, weights=rank[src] * inv_out[src], minlength=n)
+            new_rank = (1.0 - damping) / n + damping * (flow + rank[dangling].sum() / n)
+            converged = np.abs(new_rank - rank).sum() < tol
+            rank = new_rank
+            if converged:
+                break
+        return rank
+
+    def _neighbours(self, frontier: np.ndarray) -> np.ndarray:
+        """All out-neighbours of the frontier nodes, gathered without a Python loop"""
+        starts = self.indptr[frontier]
+        counts = self.indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.zeros(0, dtype=np.int32)
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        return self.indices[np.arange(total) + offsets]
+
+    def click_depth(self, root: int) -> np.ndarray:
+        """BFS distance in clicks from root; UNREACHABLE where there is no path"""
+        depth = np.full(self.num_nodes, UNREACHABLE, dtype=np.int32)
+        if not 0 <= root < self.num_nodes:
+            return depth
+        depth[root] = 0
+        frontier = np.array([root], dtype=np.int64)
+        level = 0
+        while frontier.size:
+            level += 1
+            neighbours = np.unique(self._neighbours(frontier))
+            frontier = neighbours[depth[neighbours] == UNREACHABLE].astype(np.int64)
+            depth[frontier] = level
+        return depth
+
+
+def analyze_link_graph(graph: LinkGraph, root: int, crawled: np.ndarray,
+                       urls: List[str], sample_size: int = 20) -> Tuple[Dict, Dict[int, Dict]]:
+    """
+    Compute crawl-wide link metrics.
+
+    ``crawled`` is a boolean mask of nodes whose outbound links were actually
+    seen; dead ends are only reported among those. Returns the summary and a
+    per-node metrics dict for the crawled nodes.
+    """
+    n = graph.num_nodes
+    in_degree = graph.in_degree()
+    out_degree = graph.out_degree()
+    rank = graph.pagerank()
+    depth = graph.click_depth(root)
+    relative_rank = rank * n
+
+    not_root = np.arange(n) != root
+    orphans = np.flatnonzero(crawled & (in_degree == 0) & not_root)
+    dead_ends = np.flatnonzero(crawled & (out_degree == 0))
+    unreachable = np.flatnonzero(crawled & (depth == UNREACHABLE))
+
+    crawled_ids = np.flatnonzero(crawled)
+    starved = crawled_ids[np.argsort(rank[crawled_ids], kind='stable')][:sample_size]
+    reachable_depths = depth[crawled & (depth != UNREACHABLE)]
+
+    def listing(ids: np.ndarray) -> Dict:
+        return {'count': int(ids.size), 'urls': [urls[i] for i in ids[:sample_size]]}
+
+    summary = {
+        'nodes': n,
+        'edges': graph.num_edges,
+        'max_click_depth': int(reachable_depths.max()) if reachable_depths.size else None,
+        'click_depth_histogram': np.bincount(reachable_depths).tolist() if reachable_depths.size else [],
+        'orphan_pages': listing(orphans),
+        'dead_end_pages': listing(dead_ends),
+        'unreachable_from_home': listing(unreachable),
+        'lowest_pagerank': [
+            {'url': urls[i], 'pagerank_relative': round(float(relative_rank[i]), 4)}
+            for i in starved
+        ]
+    }
+
+    per_node = {
+        int(i): {
+            'pagerank': float(rank[i]),
+            'pagerank_relative': round(float(relative_rank[i]), 4),
+            'click_depth': None if depth[i] == UNREACHABLE else int(depth[i]),
+            'in_degree': int(in_degree[i]),
+            'out_degree': int(out_degree[i])
+        }
+        for i in crawled_ids
+    }
+    return summary, per_node
@@ -0,0 +1,172 @@
+"""
+Near-Duplicate Detection
+========================
+
+64-bit SimHash fingerprints over word shingles, indexed with LSH banding so
+that near-duplicate pages are found without comparing every pair.
+
+With a maximum Hamming distance of ``d`` the fingerprint is split into
+``d + 1`` bands; by the pigeonhole principle two fingerprints within
+distance ``d`` agree exactly on at least one band, so only pages sharing a
+band bucket are compared. Hashes come from BLAKE2b rather than the builtin
+``hash()``, which is salted per process, so fingerprints are stable and are
+persisted between runs.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from audit_core.union_find import UnionFind
+
+logger = logging.getLogger(__name__)
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+FINGERPRINT_BITS = 64
+
+
+def content_digest(text: str) -> str:
+    """Stable exact-content hash"""
+    return hashlib.sha256(text.encode('utf-8', errors='replace')).hexdigest()
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """64-bit SimHash of the word shingles in text"""
+    words = WORD_RE.findall(text.lower())
+    if not words:
+        return 0
+    if len(words) < shingle_size:
+        shingles = [' '.join(words)]
+    else:
+        shingles = [' '.join(words[i:i + shingle_size])
+                    for i in range(len(words) - shingle_size + 1)]
+
+    hashes = np.fromiter((_shingle_hash(s) for s in shingles), dtype='<u8', count=len(shingles))
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(shingles)
+    return int.from_bytes(np.packbits(majority, bitorder='little').tobytes(), 'little')
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+class NearDuplicateIndex:
+    """SimHash LSH index for one crawl, with fingerprints persisted across runs"""
+
+    def __init__(self, max_distance: int = 3, path: Optional[str] = None):
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.bands
+        self.band_mask = (1 << self.band_bits) - 1
+        self.buckets: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        self.urls: List[str] = []
+        self.fingerprints: List[int] = []
+        self.content_hashes: List[str] = []
+        self.digests: Dict[str, int] = {}
+        self.pairs = UnionFind()
+        self.path = Path(path) if path else None
+        self.previous: Dict[str, Dict] = self._load()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'NearDuplicateIndex':
+        dup_config = config.get('duplicates', {})
+        return cls(
+            max_distance=dup_config.get('max_hamming_distance', 3),
+            path=dup_config.get('fingerprint_path', 'data/fingerprints.json')
+        )
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path or not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f).get('pages', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read fingerprints from {self.path}: {e}")
+            return {}
+
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        return [(fingerprint >> (band * self.band_bits)) & self.band_mask
+                for band in range(self.bands)]
+
+    def add(self, url: str, text: str) -> Dict:
+        """Fingerprint a page, index it and report matches among pages seen so far"""
+        return self.add_fingerprint(url, content_digest(text), simhash(text))
+
+    def add_fingerprint(self, url: str, digest: str, fingerprint: int) -> Dict:
+        """Index an already computed fingerprint (e.g. a page restored from a checkpoint)"""
+        doc_id = len(self.urls)
+
+        exact_of = self.digests.get(digest)
+        candidates = set()
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            bucket = self.buckets[band].setdefault(key, [])
+            candidates.update(bucket)
+            bucket.append(doc_id)
+
+        near = []
+        for other in candidates:
+            distance = hamming(fingerprint, self.fingerprints[other])
+            if distance <= self.max_distance:
+                near.append((self.urls[other], distance))
+                self.pairs.union(doc_id, other)
+
+        self.urls.append(url)
+        self.fingerprints.append(fingerprint)
+        self.content_hashes.append(digest)
+        self.digests.setdefault(digest, doc_id)
+        self.pairs.find(doc_id)
+
+        previous = self.previous.get(url)
+        return {
+            'content_hash': digest,
+            'simhash': f"{fingerprint:016x}",
+            'is_duplicate': exact_of is not None,
+            'duplicate_of': self.urls[exact_of] if exact_of is not None else None,
+            'near_duplicates': [{'url': u, 'distance': d} for u, d in sorted(near, key=lambda m: m[1])],
+            'changed_since_last_run': None if previous is None else previous.get('content_hash') != digest
+        }
+
+    def changed_last_run(self, url: str) -> Optional[bool]:
+        """Whether url's content changed in the run that saved the fingerprints (None if unknown)"""
+        previous = self.previous.get(url)
+        return previous.get('changed') if previous is not None else None
+
+    def clusters(self) -> List[Dict]:
+        """Near-duplicate clusters (two or more pages) across the crawl"""
+        clusters = []
+        for members in self.pairs.groups(min_size=2).values():
+            urls = sorted(self.urls[m] for m in members)
+            clusters.append({'size': len(urls), 'urls': urls})
+        clusters.sort(key=lambda c: c['size'], reverse=True)
+        return clusters
+
+    def save(self) -> None:
+        """Persist this run's fingerprints, keeping pages the run did not visit"""
+        if not self.path:
+            return
+        pages = dict(self.previous)
+        now = datetime.now().isoformat()
+        for doc_id, url in enumerate(self.urls):
+            previous = self.previous.get(url)
+            pages[url] = {
+                'simhash': f"{self.fingerprints[doc_id]:016x}",
+                'content_hash': self.content_hashes[doc_id],
+                'changed': previous is None or previous.get('content_hash') != self.content_hashes[doc_id],
+                'updated': now
+            }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump({'version': 1, 'pages': pages}, f)
@@ -0,0 +1,124 @@
+"""
+Offline Build Audits
+====================
+
+Helpers for auditing a static build directory (Astro's ``dist/``) instead of
+the live site: map output files to the URLs they are served at, read them
+with memory-mapped I/O, and analyze them in worker processes.
+
+Workers receive file paths rather than page bodies, so the HTML never
+crosses the process pool's pipe; each worker maps the file itself.
+"""
+
+import logging
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from lxml import etree
+
+from audit_core.page_analysis import DocumentAnalysis, analyze_document
+from audit_core.sitemaps import SitemapURL, iter_sitemap
+
+logger = logging.getLogger(__name__)
+
+ASTRO_CONFIGS = ('astro.config.mjs', 'astro.config.js', 'astro.config.ts', 'astro.config.mts')
+ASTRO_SITE_PATTERN = re.compile(r'''\bsite\s*:\s*['"`]([^'"`]+)['"`]''')
+
+# Astro's @astrojs/sitemap writes sitemap-index.xml; the others are common names
+SITEMAP_NAMES = ('sitemap-index.xml', 'sitemap_index.xml', 'sitemap.xml', 'sitemaps.xml')
+
+
+def astro_site_url(project_dir: Path) -> Optional[str]:
+    """The ``site`` option from the Astro config in project_dir, if any"""
+    for name in ASTRO_CONFIGS:
+        config_path = Path(project_dir) / name
+        if config_path.is_file():
+            match = ASTRO_SITE_PATTERN.search(config_path.read_text(encoding='utf-8', errors='replace'))
+            if match:
+                return match.group(1).rstrip('/')
+    return None
+
+
+def iter_build_files(build_dir: Path) -> List[Path]:
+    """Every HTML file in the build, in a stable order"""
+    return sorted(path for path in Path(build_dir).rglob('*.html') if path.is_file())
+
+
+def path_to_url(build_dir: Path, path: Path, site_url: str) -> str:
+    """
+    URL a static host serves path at: ``about/index.html`` is ``/about/``,
+    ``404.html`` is ``/404``.
+    """
+    relative = Path(path).relative_to(build_dir).as_posix()
+    if relative == 'index.html':
+        url_path = '/'
+    elif relative.endswith('/index.html'):
+        url_path = '/' + relative[:-len('index.html')]
+    else:
+        url_path = '/' + relative[:-len('.html')]
+    return site_url.rstrip('/') + url_path
+
+
+def url_to_path(build_dir: Path, url: str) -> Optional[Path]:
+    """Build file for a URL on the site, the inverse of path_to_url"""
+    url_path = urlparse(url).path.lstrip('/')
+    candidates = [url_path] if Path(url_path).suffix else [
+        f"{url_path.rstrip('/')}/index.html".lstrip('/'), f"{url_path.rstrip('/')}.html"]
+    for candidate in candidates:
+        path = Path(build_dir) / candidate
+        if path.is_file():
+            return path
+    return None
+
+
+def read_mapped(path: Path) -> bytes:
+    """File contents through a read-only memory map"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return mapped[:]
+
+
+def analyze_file(path: Path, seo_config: Dict) -> DocumentAnalysis:
+    """Process pool entry point: analyze one built HTML file"""
+    return analyze_document(read_mapped(path), seo_config)
+
+
+def read_local_sitemaps(build_dir: Path, site_url: str,
+                        declared: List[str] = ()) -> Tuple[List[SitemapURL], List[str], List[str]]:
+    """
+    Sitemap entries, sitemap URLs found and parse issues from the build
+    directory; index children are resolved to files in the build.
+    """
+    pending = [f"{site_url}/{name}" for name in SITEMAP_NAMES]
+    pending.extend(declared)
+    entries: List[SitemapURL] = []
+    found: List[str] = []
+    issues: List[str] = []
+    seen = set()
+
+    while pending:
+        sitemap_url = pending.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        path = url_to_path(build_dir, sitemap_url)
+        if path is None:
+            continue
+        found.append(sitemap_url)
+        try:
+            with open(path, 'rb') as f:
+                for kind, item in iter_sitemap(f, source=sitemap_url):
+                    if kind == 'sitemap':
+                        pending.append(item)
+                    else:
+                        entries.append(item)
+        except etree.XMLSyntaxError as e:
+            issues.append(f"Invalid XML in {sitemap_url}: {e}")
+
+    return entries, found, issues
@@ -0,0 +1,279 @@
+"""
+Per-page Analysis
+=================
+
+The technical analyzers that only depend on one document and the ``seo``
+settings: meta tags, header hierarchy, structured data, mobile indicators
+and the duplicate-content fingerprint. They are plain functions so that
+``analyze_document`` can run in a worker process; everything that needs
+crawl-wide state (URL IDs, link maps, the near-duplicate index) stays with
+``TechnicalSEOAuditor``.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import validators
+
+from audit_core import issues
+from audit_core.issues import ISSUES, IssueList
+from audit_core.near_duplicates import content_digest, simhash
+from audit_core.page_facts import PageFacts, extract_page_facts
+from audit_core.records import HeaderAnalysis
+from audit_core.structured_data import validate_json_ld, validate_microdata, validate_rdfa
+from audit_core.timings import StageSamples
+
+
+def analyze_meta_tags(facts: PageFacts, seo_config: Dict) -> Dict:
+    """Analyze meta tags for SEO"""
+    meta_analysis = {
+        'title': None,
+        'meta_description': None,
+        'meta_keywords': None,
+        'robots': None,
+        'canonical': None,
+        'og_tags': {},
+        'twitter_tags': {},
+        'issues': IssueList()
+    }
+
+    # Title tag
+    if facts.title is not None:
+        title = facts.title
+        meta_analysis['title'] = title
+
+        # Check title length
+        title_config = seo_config.get('title_length', {})
+        min_length = title_config.get('min', 30)
+        max_length = title_config.get('max', 60)
+
+        if len(title) < min_length:
+            meta_analysis['issues'].add(issues.TITLE_TOO_SHORT, length=len(title), minimum=min_length)
+        elif len(title) > max_length:
+            meta_analysis['issues'].add(issues.TITLE_TOO_LONG, length=len(title), maximum=max_length)
+    else:
+        meta_analysis['issues'].add(issues.TITLE_MISSING)
+
+    # Meta description
+    description = facts.meta_names.get('description')
+    if description is not None:
+        meta_analysis['meta_description'] = description
+
+        # Check description length
+        desc_config = seo_config.get('meta_description_length', {})
+        min_length = desc_config.get('min', 150)
+        max_length = desc_config.get('max', 160)
+
+        if len(description) < min_length:
+            meta_analysis['issues'].add(issues.DESCRIPTION_TOO_SHORT, length=len(description))
+        elif len(description) > max_length:
+            meta_analysis['issues'].add(issues.DESCRIPTION_TOO_LONG, length=len(description))
+    else:
+        meta_analysis['issues'].add(issues.DESCRIPTION_MISSING)
+
+    # Meta keywords (not recommended, but check anyway)
+    if 'keywords' in facts.meta_names:
+        meta_analysis['meta_keywords'] = facts.meta_names['keywords']
+        meta_analysis['issues'].add(issues.META_KEYWORDS_PRESENT)
+
+    # Robots meta tag
+    if 'robots' in facts.meta_names:
+        meta_analysis['robots'] = facts.meta_names['robots']
+
+    # Canonical URL
+    if facts.canonical is not None:
+        canonical_url = facts.canonical
+        meta_analysis['canonical'] = canonical_url
+
+        # Validate canonical URL
+        if not validators.url(canonical_url):
+            meta_analysis['issues'].add(issues.CANONICAL_INVALID, url=canonical_url)
+    else:
+        meta_analysis['issues'].add(issues.CANONICAL_MISSING)
+
+    # Open Graph and Twitter Card tags
+    meta_analysis['og_tags'] = dict(facts.og_tags)
+    meta_analysis['twitter_tags'] = dict(facts.twitter_tags)
+
+    return meta_analysis
+
+
+def analyze_header_structure(facts: PageFacts) -> HeaderAnalysis:
+    """Analyze header tag hierarchy (H1-H6)"""
+    header_analysis = HeaderAnalysis(facts.headers)
+
+    # Check H1 issues
+    if header_analysis.h1_count == 0:
+        header_analysis.issues.add(issues.H1_MISSING)
+    elif header_analysis.h1_count > 1:
+        header_analysis.issues.add(issues.H1_MULTIPLE, count=header_analysis.h1_count)
+
+    # Check header hierarchy
+    prev_level = 0
+    for tag_name, _ in header_analysis.headers:
+        level = int(tag_name[1])
+
+        if level > prev_level + 1:
+            header_analysis.issues.add(issues.HEADER_LEVEL_SKIPPED, tag=tag_name, previous=prev_level)
+
+        prev_level = level
+
+    return header_analysis
+
+
+def analyze_schema_markup(facts: PageFacts) -> List[Dict]:
+    """Analyze structured data (Schema.org markup) against the schema.org vocabulary"""
+    schema_data = []
+
+    # JSON-LD structured data
+    for script in facts.json_ld:
+        try:
+            schema_json = json.loads(script)
+        except (json.JSONDecodeError, TypeError) as e:
+            item_issues = IssueList()
+            item_issues.add(issues.SCHEMA_INVALID_JSON, error=e)
+            schema_data.append({
+                'type': 'json-ld',
+                'data': script,
+                'valid': False,
+                'error': str(e),
+                'issues': item_issues
+            })
+            continue
+        item_issues = validate_json_ld(schema_json)
+        schema_data.append({
+            'type': 'json-ld',
+            'data': schema_json,
+            'valid': not _has_critical(item_issues),
+            'issues': item_issues
+        })
+
+    # Microdata
+    for item_type, item_props in facts.microdata:
+        item_issues = validate_microdata(item_type, item_props)
+        schema_data.append({
+            'type': 'microdata',
+            'itemtype': item_type,
+            'properties': item_props,
+            'valid': not _has_critical(item_issues),
+            'issues': item_issues
+        })
+
+    # RDFa (type names only)
+    for type_of in facts.rdfa:
+        item_issues = validate_rdfa(type_of)
+        schema_data.append({
+            'type': 'rdfa',
+            'typeof': type_of,
+            'valid': not _has_critical(item_issues),
+            'issues': item_issues
+        })
+
+    return schema_data
+
+
+def _has_critical(item_issues: IssueList) -> bool:
+    return any(ISSUES[code].severity == issues.CRITICAL for code in item_issues.codes)
+
+
+def analyze_mobile_friendliness(facts: PageFacts) -> Dict:
+    """Analyze mobile-friendly indicators"""
+    mobile_analysis = {
+        'viewport_meta': None,
+        'responsive_images': 0,
+        'total_images': 0,
+        'touch_friendly_links': 0,
+        'total_links': 0,
+        'issues': IssueList()
+    }
+
+    # Check viewport meta tag
+    if 'viewport' in facts.meta_names:
+        mobile_analysis['viewport_meta'] = facts.meta_names['viewport']
+
+        # Check for mobile-friendly viewport settings
+        content = mobile_analysis['viewport_meta'].lower()
+        if 'width=device-width' not in content:
+            mobile_analysis['issues'].add(issues.VIEWPORT_NOT_DEVICE_WIDTH)
+        if 'initial-scale=1' not in content:
+            mobile_analysis['issues'].add(issues.VIEWPORT_NO_INITIAL_SCALE)
+    else:
+        mobile_analysis['issues'].add(issues.VIEWPORT_MISSING)
+
+    # Responsive images carry srcset or sizes attributes
+    mobile_analysis['total_images'] = facts.image_count
+    mobile_analysis['responsive_images'] = facts.responsive_image_count
+
+    # Basic touch-friendly link analysis (this would need more sophisticated checking in production)
+    mobile_analysis['total_links'] = facts.anchor_count
+
+    return mobile_analysis
+
+
+class DocumentAnalysis:
+    """Picklable result of analyze_document, merged into a PageRecord by the auditor"""
+
+    __slots__ = ('meta_tags', 'header_structure', 'schema_markup', 'mobile_friendliness',
+                 'links', 'content_hash', 'simhash', 'word_count', 'character_count',
+                 'content_length', 'timings')
+
+    def __init__(self):
+        self.meta_tags: Dict = {}
+        self.header_structure: HeaderAnalysis = None
+        self.schema_markup: List[Dict] = []
+        self.mobile_friendliness: Dict = {}
+        # (href, anchor_text, title, rel, target) as in PageFacts.links
+        self.links: List[Tuple] = []
+        self.content_hash = ''
+        self.simhash = 0
+        self.word_count = 0
+        self.character_count = 0
+        self.content_length = 0
+        self.timings = StageSamples()
+
+
+def analyze_document(content: bytes, seo_config: Dict) -> DocumentAnalysis:
+    """Parse one HTML document and run every single-page analyzer on it"""
+    analysis = DocumentAnalysis()
+    timings = analysis.timings
+    # The whole document under one stage too, timed where the work runs so
+    # a pool's queueing isn't counted
+    with timings.measure('analyze_document'):
+        with timings.measure('parse'):
+            facts = extract_page_facts(content)
+        with timings.measure('analyze_meta_tags'):
+            analysis.meta_tags = analyze_meta_tags(facts, seo_config)
+        with timings.measure('analyze_header_structure'):
+            analysis.header_structure = analyze_header_structure(facts)
+        with timings.measure('analyze_schema_markup'):
+            analysis.schema_markup = analyze_schema_markup(facts)
+        with timings.measure('analyze_mobile_friendliness'):
+            analysis.mobile_friendliness = analyze_mobile_friendliness(facts)
+        with timings.measure('fingerprint'):
+            analysis.content_hash = content_digest(facts.text)
+            analysis.simhash = simhash(facts.text)
+        analysis.links = facts.links
+        analysis.word_count = len(facts.text.split())
+        analysis.character_count = len(facts.text)
+        analysis.content_length = len(content)
+    return analysis
+
+
+def _exit_with_parent(parent_pid: int) -> None:
+    """Pool worker initializer: exit if the auditor dies without shutting the pool down"""
+    def watch() -> None:
+        while os.getppid() == parent_pid:
+            time.sleep(1)
+        os._exit(0)
+
+    threading.Thread(target=watch, daemon=True).start()
+
+
+def analysis_pool(workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Process pool for analyze_document and other per-page work"""
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                               initializer=_exit_with_parent, initargs=(os.getpid(),))
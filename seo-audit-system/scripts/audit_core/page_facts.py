@@ -0,0 +1,129 @@
+"""
+Page Facts Extraction
+=====================
+
+One lxml pass over a page that collects everything the technical analyzers
+look at (title, meta tags, canonical, headers, structured data, links,
+images) into a ``PageFacts`` record. The analyzers read that record instead
+of re-walking a BeautifulSoup tree with a dozen ``find_all`` calls.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree, html
+
+HEADER_TAGS = frozenset(('h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
+
+
+class PageFacts:
+    """Everything the per-page analyzers need, extracted in one pass"""
+
+    __slots__ = (
+        'title', 'meta_names', 'og_tags', 'twitter_tags', 'canonical',
+        'headers', 'json_ld', 'microdata', 'rdfa', 'links', 'anchor_count',
+        'image_count', 'responsive_image_count', 'text'
+    )
+
+    def __init__(self):
+        self.title: Optional[str] = None
+        # name -> content for <meta name=...>, first occurrence wins like soup.find()
+        self.meta_names: Dict[str, str] = {}
+        self.og_tags: Dict[str, str] = {}
+        self.twitter_tags: Dict[str, str] = {}
+        self.canonical: Optional[str] = None
+        # (tag, text) in document order
+        self.headers: List[Tuple[str, str]] = []
+        # raw JSON-LD script bodies
+        self.json_ld: List[Optional[str]] = []
+        # (itemtype, {itemprop: value})
+        self.microdata: List[Tuple[str, Dict[str, str]]] = []
+        self.rdfa: List[str] = []
+        # (href, anchor_text, title, rel, target) for <a href>
+        self.links: List[Tuple[str, str, str, List[str], str]] = []
+        self.anchor_count = 0
+        self.image_count = 0
+        self.responsive_image_count = 0
+        self.text = ''
+
+
+def _text(element) -> str:
+    return element.text_content().strip()
+
+
+def extract_page_facts(content: bytes) -> PageFacts:
+    """Parse HTML bytes once and collect the facts used by the analyzers"""
+    facts = PageFacts()
+    if not content or not content.strip():
+        return facts
+
+    try:
+        root = html.document_fromstring(content)
+    except (etree.ParserError, ValueError):
+        return facts
+
+    # Open microdata items, innermost last; itemprops belong to every open item
+    # just as a descendant find_all() on each itemtype element would report them
+    open_items: List[Tuple[object, Dict[str, str]]] = []
+
+    for event, element in etree.iterwalk(root, events=('start', 'end')):
+        tag = element.tag
+        if not isinstance(tag, str):
+            continue
+
+        if event == 'end':
+            if open_items and open_items[-1][0] is element:
+                open_items.pop()
+            continue
+
+        attrib = element.attrib
+
+        if 'itemprop' in attrib and open_items:
+            value = attrib.get('content') or _text(element)
+            for _, props in open_items:
+                props[attrib['itemprop']] = value
+        if 'itemtype' in attrib:
+            props: Dict[str, str] = {}
+            facts.microdata.append((attrib['itemtype'], props))
+            open_items.append((element, props))
+        if 'typeof' in attrib:
+            facts.rdfa.append(attrib['typeof'])
+
+        if tag == 'a':
+            facts.anchor_count += 1
+            href = attrib.get('href')
+            if href is not None:
+                facts.links.append((
+                    href.strip(),
+                    _text(element),
+                    attrib.get('title', ''),
+                    attrib.get('rel', '').split(),
+                    attrib.get('target', '')
+                ))
+        elif tag == 'meta':
+            name = attrib.get('name')
+            meta_content = attrib.get('content', '').strip()
+            if name:
+                facts.meta_names.setdefault(name.lower(), meta_content)
+                if name.startswith('twitter:'):
+                    facts.twitter_tags[name] = meta_content
+            prop = attrib.get('property')
+            if prop and prop.startswith('og:'):
+                facts.og_tags[prop] = meta_content
+        elif tag in HEADER_TAGS:
+            facts.headers.append((tag, _text(element)))
+        elif tag == 'img':
+            facts.image_count += 1
+            if attrib.get('srcset') or attrib.get('sizes'):
+                facts.responsive_image_count += 1
+        elif tag == 'link':
+            if facts.canonical is None and 'canonical' in attrib.get('rel', '').lower().split():
+                facts.canonical = attrib.get('href', '').strip()
+        elif tag == 'title':
+            if facts.title is None:
+                facts.title = _text(element)
+        elif tag == 'script':
+            if attrib.get('type', '').lower() == 'application/ld+json':
+                facts.json_ld.append(element.text)
+
+    facts.text = root.text_content()
+    return facts
@@ -0,0 +1,127 @@
+"""
+Per-host Politeness Scheduler
+=============================
+
+Rate limits requests per host with a token bucket so that fetches to
+different hosts never wait on each other. The bucket interval defaults to
+``general.delay_between_requests`` and is raised to a host's robots.txt
+``Crawl-delay`` once that is known.
+
+Buckets hand out reservations rather than blocking: a caller takes a token
+(possibly driving the balance negative) and then sleeps for however long its
+reservation says, so concurrent callers for one host are spaced out evenly
+while callers for other hosts proceed immediately. Both asyncio and thread
+based callers are supported.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Token bucket that returns how long the caller must wait for its token"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return the delay in seconds before using it"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+
+class HostScheduler:
+    """Token bucket and concurrency cap per host"""
+
+    def __init__(self, delay: float = 1.0, burst: float = 1.0, max_per_host: int = 2):
+        self.delay = delay
+        self.burst = burst
+        self.max_per_host = max(1, max_per_host)
+        self.crawl_delays: Dict[str, float] = {}
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.async_limits: Dict[str, asyncio.Semaphore] = {}
+        self.thread_limits: Dict[str, threading.BoundedSemaphore] = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'HostScheduler':
+        general = config.get('general', {})
+        return cls(
+            delay=general.get('delay_between_requests', 1000) / 1000,
+            burst=general.get('burst_per_host', 1),
+            max_per_host=general.get('max_requests_per_host', 2)
+        )
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlparse(url).netloc.lower() or url.lower()
+
+    def interval_for(self, host: str) -> float:
+        return max(self.delay, self.crawl_delays.get(host, 0.0))
+
+    def set_crawl_delay(self, host: str, crawl_delay: Optional[float]) -> None:
+        """Apply a robots.txt Crawl-delay; it only ever slows a host down"""
+        if not crawl_delay:
+            return
+        host = host.lower()
+        with self.lock:
+            self.crawl_delays[host] = float(crawl_delay)
+            self.buckets.pop(host, None)
+
+    def bucket(self, host: str) -> Optional[TokenBucket]:
+        interval = self.interval_for(host)
+        if interval <= 0:
+            return None
+        with self.lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(1.0 / interval, self.burst)
+            return self.buckets[host]
+
+    def reserve(self, url: str) -> float:
+        bucket = self.bucket(self.host_of(url))
+        return bucket.reserve() if bucket else 0.0
+
+    async def wait(self, url: str) -> None:
+        """Wait (without blocking the event loop) until a request to url may go out"""
+        delay = self.reserve(url)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def wait_sync(self, url: str) -> None:
+        """Blocking variant of wait() for requests/selenium code paths"""
+        delay = self.reserve(url)
+        if delay:
+            time.sleep(delay)
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold one of the host's concurrent slots and a rate-limit token"""
+        host = self.host_of(url)
+        semaphore = self.async_limits.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        async with semaphore:
+            await self.wait(url)
+            yield
+
+    @contextmanager
+    def slot_sync(self, url: str):
+        host = self.host_of(url)
+        with self.lock:
+            semaphore = self.thread_limits.setdefault(
+                host, threading.BoundedSemaphore(self.max_per_host))
+        with semaphore:
+            self.wait_sync(url)
+            yield
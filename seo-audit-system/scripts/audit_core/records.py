@@ -0,0 +1,331 @@
+"""
+Compact Page Records
+====================
+
+Typed, ``__slots__``-based records for what ``audit_url`` produces. Links
+are kept as parallel columns (an ``array`` of integer URL IDs plus lists of
+interned strings) instead of one dict per anchor, and headers as
+``(tag, text)`` tuples, so a large crawl's memory scales with unique URLs
+rather than with total links. Records are expanded into the familiar
+nested dicts only when results are serialized.
+"""
+
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from audit_core.issues import ISSUES, IssueList, IssueType
+from audit_core.url_index import URLIndex
+
+_EMPTY_REL: Tuple[str, ...] = ()
+_REL_CACHE: Dict[Tuple[str, ...], Tuple[str, ...]] = {_EMPTY_REL: _EMPTY_REL}
+
+
+def _intern(value: str) -> str:
+    return sys.intern(value) if value else ''
+
+
+def _intern_rel(rel: List[str]) -> Tuple[str, ...]:
+    key = tuple(rel)
+    return _REL_CACHE.setdefault(key, key)
+
+
+class LinkTable:
+    """Column store of a page's <a href> links"""
+
+    __slots__ = ('target_ids', 'internal', 'anchors', 'titles', 'rels', 'targets')
+
+    def __init__(self):
+        self.target_ids = array('i')
+        self.internal = bytearray()
+        self.anchors: List[str] = []
+        self.titles: List[str] = []
+        self.rels: List[Tuple[str, ...]] = []
+        self.targets: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.target_ids)
+
+    def add(self, target_id: int, is_internal: bool, anchor: str, title: str,
+            rel: List[str], target: str) -> None:
+        self.target_ids.append(target_id)
+        self.internal.append(1 if is_internal else 0)
+        self.anchors.append(_intern(anchor))
+        self.titles.append(_intern(title))
+        self.rels.append(_intern_rel(rel))
+        self.targets.append(_intern(target))
+
+    def ids(self, internal_only: bool = False) -> Iterator[int]:
+        if not internal_only:
+            return iter(self.target_ids)
+        return (target_id for target_id, flag in zip(self.target_ids, self.internal) if flag)
+
+    def to_dicts(self, url_index: URLIndex) -> List[Dict]:
+        return [
+            {
+                'url': url_index.url(self.target_ids[i]),
+                'anchor_text': self.anchors[i],
+                'is_internal': bool(self.internal[i]),
+                'title': self.titles[i],
+                'rel': list(self.rels[i]),
+                'target': self.targets[i]
+            }
+            for i in range(len(self.target_ids))
+        ]
+
+
+class LinkAnalysis:
+    """Result of analyze_internal_links for one page"""
+
+    __slots__ = ('total_links', 'internal_links', 'external_links', 'broken_link_ids',
+                 'links', 'anchor_text_analysis', 'issues')
+
+    def __init__(self):
+        self.total_links = 0
+        self.internal_links = 0
+        self.external_links = 0
+        self.broken_link_ids: Optional[List[int]] = None
+        self.links = LinkTable()
+        self.anchor_text_analysis: Dict[str, int] = {}
+        self.issues = IssueList()
+
+    @classmethod
+    def from_dict(cls, data: Dict, url_index: URLIndex) -> 'LinkAnalysis':
+        analysis = cls()
+        analysis.total_links = data.get('total_links', 0)
+        analysis.internal_links = data.get('internal_links', 0)
+        analysis.external_links = data.get('external_links', 0)
+        for link in data.get('links', []):
+            analysis.links.add(url_index.id_for(link['url']), link.get('is_internal', False),
+                               link.get('anchor_text', ''), link.get('title', ''),
+                               link.get('rel', []), link.get('target', ''))
+        analysis.anchor_text_analysis = dict(data.get('anchor_text_analysis', {}))
+        analysis.issues = IssueList(data.get('issues', []))
+        if 'broken_link_urls' in data:
+            analysis.broken_link_ids = [url_index.id_for(url) for url in data['broken_link_urls']]
+        return analysis
+
+    @property
+    def broken_links(self) -> int:
+        return len(self.broken_link_ids) if self.broken_link_ids else 0
+
+    def to_dict(self, url_index: URLIndex) -> Dict:
+        result = {
+            'total_links': self.total_links,
+            'internal_links': self.internal_links,
+            'external_links': self.external_links,
+            'broken_links': self.broken_links,
+            'links': self.links.to_dicts(url_index),
+            'anchor_text_analysis': dict(self.anchor_text_analysis),
+            'issues': list(self.issues)
+        }
+        if self.broken_link_ids is not None:
+            result['broken_link_urls'] = url_index.urls_for(self.broken_link_ids)
+        return result
+
+
+class HeaderAnalysis:
+    """Result of analyze_header_structure for one page"""
+
+    __slots__ = ('h1_count', 'h1_text', 'headers', 'issues')
+
+    def __init__(self, headers: List[Tuple[str, str]]):
+        self.headers = headers
+        self.h1_text = [text for tag, text in headers if tag == 'h1']
+        self.h1_count = len(self.h1_text)
+        self.issues = IssueList()
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'HeaderAnalysis':
+        analysis = cls([(header['tag'], header['text']) for header in data.get('header_hierarchy', [])])
+        analysis.issues = IssueList(data.get('issues', []))
+        return analysis
+
+    def to_dict(self) -> Dict:
+        return {
+            'h1_count': self.h1_count,
+            'h1_text': list(self.h1_text),
+            'header_hierarchy': [{'tag': tag, 'text': text, 'length': len(text)}
+                                 for tag, text in self.headers],
+            'issues': list(self.issues)
+        }
+
+
+class PageRecord:
+    """Everything audit_url learned about one URL"""
+
+    __slots__ = (
+        'url_id', 'url', 'status_code', 'response_time', 'content_type', 'content_length',
+        'timestamp', 'redirect_history', 'final_url', 'meta_tags', 'header_structure', 'schema_markup',
+        'internal_links', 'duplicate_content', 'mobile_friendliness', 'crawl_depth',
+        'link_graph', 'canonical', 'body_hash', 'reused', 'truncated', 'issue_codes', 'error'
+    )
+
+    def __init__(self, url_id: int, url: str):
+        self.url_id = url_id
+        self.url = url
+        self.status_code: Optional[int] = None
+        self.response_time: Optional[float] = None
+        self.content_type = ''
+        self.content_length = 0
+        self.timestamp: Optional[str] = None
+        self.redirect_history: Tuple[str, ...] = ()
+        # Where the redirects in redirect_history ended, None without redirects
+        self.final_url: Optional[str] = None
+        self.meta_tags: Optional[Dict] = None
+        self.header_structure: Optional[HeaderAnalysis] = None
+        self.schema_markup: Optional[List[Dict]] = None
+        self.internal_links: Optional[LinkAnalysis] = None
+        self.duplicate_content: Optional[Dict] = None
+        self.mobile_friendliness: Optional[Dict] = None
+        self.crawl_depth: Optional[int] = None
+        self.link_graph: Optional[Dict] = None
+        # Crawl-wide canonical resolution, see audit_core.canonicals
+        self.canonical: Optional[Dict] = None
+        self.body_hash: Optional[str] = None
+        # Why an incremental run kept the previous analysis, None when re-audited
+        self.reused: Optional[str] = None
+        # Body was cut off at general.max_body_bytes, so only its start was analyzed
+        self.truncated = False
+        # Registry codes of every issue in the sections below, see audit_core.issues
+        self.issue_codes = array('H')
+        self.error: Optional[str] = None
+
+    @classmethod
+    def failed(cls, url_index: URLIndex, url: str, error: str) -> 'PageRecord':
+        url_id = url_index.id_for(url)
+        record = cls(url_id, url_index.url(url_id))
+        record.error = error
+        return record
+
+    @classmethod
+    def from_dict(cls, data: Dict, url_index: URLIndex) -> 'PageRecord':
+        """Rebuild a record from its to_dict() form, e.g. from a checkpoint"""
+        url_id = url_index.id_for(data['url'])
+        record = cls(url_id, url_index.url(url_id))
+        record.crawl_depth = data.get('crawl_depth')
+        if 'error' in data:
+            record.error = data['error']
+            return record
+
+        record.status_code = data.get('status_code')
+        record.response_time = data.get('response_time')
+        record.content_type = _intern(data.get('content_type') or '')
+        record.content_length = data.get('content_length', 0)
+        record.timestamp = data.get('timestamp')
+        record.redirect_history = tuple(data.get('redirect_history', ()))
+        record.final_url = data.get('final_url')
+        record.meta_tags = data.get('meta_tags')
+        record.schema_markup = data.get('schema_markup')
+        record.duplicate_content = data.get('duplicate_content')
+        record.mobile_friendliness = data.get('mobile_friendliness')
+        record.link_graph = data.get('link_graph')
+        record.body_hash = data.get('body_hash')
+        record.truncated = data.get('truncated', False)
+        if data.get('header_structure') is not None:
+            record.header_structure = HeaderAnalysis.from_dict(data['header_structure'])
+        if data.get('internal_links') is not None:
+            record.internal_links = LinkAnalysis.from_dict(data['internal_links'], url_index)
+        if 'issue_codes' in data:
+            record.issue_codes = array('H', data['issue_codes'])
+            # Canonical resolution is redone every run, so drop the stored one's issues
+            for issue in (data.get('canonical') or {}).get('issues', ()):
+                code = ISSUES.code_for_message(issue, 'meta_tags')
+                if code in record.issue_codes:
+                    record.issue_codes.remove(code)
+        else:
+            # Written before issues had codes
+            for category, issues in record.issue_lists():
+                record.issue_codes.extend(ISSUES.code_for_message(issue, category) for issue in issues)
+        return record
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status_code == 200
+
+    def issue_lists(self) -> Iterator[Tuple[str, List[str]]]:
+        """(category, issues) for every analyzer that reports issues"""
+        if self.meta_tags is not None:
+            yield 'meta_tags', self.meta_tags['issues']
+        if self.header_structure is not None:
+            yield 'header_structure', self.header_structure.issues
+        if self.internal_links is not None:
+            yield 'internal_links', self.internal_links.issues
+        if self.mobile_friendliness is not None:
+            yield 'mobile_friendliness', self.mobile_friendliness['issues']
+        for item in self.schema_markup or ():
+            if 'issues' in item:
+                yield 'schema_markup', item['issues']
+        if self.canonical is not None:
+            yield 'meta_tags', self.canonical['issues']
+
+    def collect_issue_codes(self) -> None:
+        """Gather the codes recorded by the analyzers' IssueLists"""
+        self.issue_codes = array('H')
+        for _, issues in self.issue_lists():
+            self.issue_codes.extend(getattr(issues, 'codes', ()))
+
+    def add_issue(self, issues: List[str], issue_type: IssueType, **params) -> None:
+        """Report an issue found after the page was analyzed (e.g. by the link check)"""
+        message = issue_type.message(**params)
+        issues.append(message)
+        if isinstance(issues, IssueList):
+            issues.codes.append(issue_type.code)
+        self.issue_codes.append(issue_type.code)
+
+    def post_crawl_fields(self, url_index: URLIndex) -> Dict:
+        """Fields filled in by crawl-wide analyses after the page was audited"""
+        fields = {}
+        if self.link_graph is not None:
+            fields['link_graph'] = self.link_graph
+        if self.canonical is not None:
+            fields['canonical'] = self.canonical
+            fields['issue_codes'] = self.issue_codes.tolist()
+        links = self.internal_links
+        if links is not None and links.broken_link_ids is not None:
+            fields['internal_links'] = {
+                'broken_links': links.broken_links,
+                'broken_link_urls': url_index.urls_for(links.broken_link_ids),
+                'issues': list(links.issues)
+            }
+            fields['issue_codes'] = self.issue_codes.tolist()
+        return fields
+
+    def to_dict(self, url_index: URLIndex) -> Dict:
+        """Expand into the plain nested dict written to the results file"""
+        if self.error is not None:
+            result = {'url': self.url, 'error': self.error}
+            if self.crawl_depth is not None:
+                result['crawl_depth'] = self.crawl_depth
+            return result
+
+        result = {
+            'url': self.url,
+            'status_code': self.status_code,
+            'response_time': self.response_time,
+            'content_type': self.content_type,
+            'content_length': self.content_length,
+            'redirect_history': list(self.redirect_history),
+            'timestamp': self.timestamp,
+            'meta_tags': self.meta_tags,
+            'header_structure': self.header_structure.to_dict() if self.header_structure else None,
+            'schema_markup': self.schema_markup,
+            'internal_links': self.internal_links.to_dict(url_index) if self.internal_links else None,
+            'duplicate_content': self.duplicate_content,
+            'mobile_friendliness': self.mobile_friendliness,
+            'body_hash': self.body_hash,
+            'issue_codes': self.issue_codes.tolist()
+        }
+        if self.final_url is not None:
+            result['final_url'] = self.final_url
+        if self.reused is not None:
+            result['reused'] = self.reused
+        if self.truncated:
+            result['truncated'] = True
+        if self.crawl_depth is not None:
+            result['crawl_depth'] = self.crawl_depth
+        if self.link_graph is not None:
+            result['link_graph'] = self.link_graph
+        if self.canonical is not None:
+            result['canonical'] = self.canonical
+        return result
@@ -0,0 +1,158 @@
+"""
+Redirect Chain Analyzer
+=======================
+
+Probes the http/https x apex/www variants and the trailing-slash variant of
+crawled URLs concurrently, following each redirect hop manually so that
+every hop's status and latency is recorded. Chains with more than one hop
+cost a full round trip each, which is what mobile visitors feel.
+"""
+
+import asyncio
+import ipaddress
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlparse, urlunparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+REDIRECT_STATUSES = frozenset((301, 302, 303, 307, 308))
+
+
+def _is_ip_or_local(host: str) -> bool:
+    if '.' not in host:
+        return True
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+def url_variants(url: str, host_variants: bool = True) -> List[str]:
+    """Scheme/host variants of url plus its trailing-slash twin, excluding url itself"""
+    parsed = urlparse(url)
+    host = parsed.hostname or ''
+    port = f":{parsed.port}" if parsed.port else ''
+
+    hosts = [parsed.netloc]
+    if host_variants and not _is_ip_or_local(host):
+        twin = host[4:] if host.startswith('www.') else f"www.{host}"
+        hosts.append(f"{twin}{port}")
+    schemes = ['http', 'https'] if host_variants else [parsed.scheme]
+
+    variants = [urlunparse(parsed._replace(scheme=scheme, netloc=netloc))
+                for scheme in schemes for netloc in hosts]
+
+    path = parsed.path or '/'
+    if path != '/':
+        twin_path = path[:-1] if path.endswith('/') else f"{path}/"
+        variants.append(urlunparse(parsed._replace(path=twin_path)))
+
+    return [variant for variant in dict.fromkeys(variants) if variant != url]
+
+
+class RedirectAnalyzer:
+    """Follow redirect chains hop by hop and time each hop"""
+
+    def __init__(self, session: aiohttp.ClientSession, scheduler=None, max_hops: int = 10,
+                 concurrency: int = 10, timeout: float = 15):
+        self.session = session
+        self.scheduler = scheduler
+        self.max_hops = max_hops
+        self.concurrency = max(1, concurrency)
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async def _hop(self, url: str) -> Dict:
+        if self.scheduler is not None:
+            await self.scheduler.wait(url)
+        start = time.perf_counter()
+        async with self.session.head(url, allow_redirects=False, timeout=self.timeout) as response:
+            status = response.status
+            location = response.headers.get('location')
+        if status in (405, 501):
+            async with self.session.get(url, allow_redirects=False, timeout=self.timeout) as response:
+                status = response.status
+                location = response.headers.get('location')
+        return {
+            'url': url,
+            'status': status,
+            'latency_ms': round((time.perf_counter() - start) * 1000, 1),
+            'location': urljoin(url, location) if location else None
+        }
+
+    async def follow(self, start_url: str) -> Dict:
+        """Record the full redirect chain starting at start_url"""
+        hops: List[Dict] = []
+        seen = set()
+        url: Optional[str] = start_url
+        error = None
+        loop = False
+
+        while url is not None and len(hops) <= self.max_hops:
+            if url in seen:
+                loop = True
+                break
+            seen.add(url)
+            try:
+                hop = await self._hop(url)
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                error = str(e) or type(e).__name__
+                break
+            hops.append(hop)
+            url = hop['location'] if hop['status'] in REDIRECT_STATUSES else None
+
+        redirects = [hop for hop in hops if hop['status'] in REDIRECT_STATUSES]
+        final = hops[-1] if hops else None
+        return {
+            'start_url': start_url,
+            'hops': hops,
+            'redirect_count': len(redirects),
+            'final_url': final['url'] if final else None,
+            'final_status': final['status'] if final else None,
+            'redirect_latency_ms': round(sum(hop['latency_ms'] for hop in redirects), 1),
+            'loop': loop,
+            'too_many_hops': url is not None and not loop and error is None,
+            'error': error
+        }
+
+    async def analyze(self, urls: Iterable[str], host_variants: bool = True,
+                      sample_size: int = 100) -> Dict:
+        """Probe every variant of the given URLs and summarize multi-hop chains"""
+        starts = list(dict.fromkeys(
+            variant for url in urls for variant in url_variants(url, host_variants)))
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(start: str) -> Dict:
+            async with limit:
+                return await self.follow(start)
+
+        chains = await asyncio.gather(*(bounded(start) for start in starts))
+
+        redirected = [chain for chain in chains if chain['redirect_count']]
+        multi_hop = [chain for chain in redirected if chain['redirect_count'] > 1]
+        broken = [chain for chain in redirected
+                  if chain['loop'] or chain['too_many_hops'] or chain['error']
+                  or (chain['final_status'] or 0) >= 400]
+
+        issues = []
+        for chain in multi_hop[:sample_size]:
+            issues.append(f"Redirect chain with {chain['redirect_count']} hops from "
+                          f"{chain['start_url']} ({chain['redirect_latency_ms']} ms)")
+        for chain in broken[:sample_size]:
+            issues.append(f"Redirect from {chain['start_url']} does not resolve "
+                          f"(final status {chain['final_status']}, loop={chain['loop']})")
+
+        multi_hop.sort(key=lambda c: c['redirect_latency_ms'], reverse=True)
+        return {
+            'variants_probed': len(starts),
+            'redirected': len(redirected),
+            'multi_hop_chains': len(multi_hop),
+            'broken_chains': len(broken),
+            'total_redirect_latency_ms': round(sum(c['redirect_latency_ms'] for c in redirected), 1),
+            'worst_chains': multi_hop[:sample_size],
+            'issues': issues
+        }
@@ -0,0 +1,214 @@
+"""
+Streaming Result Files
+======================
+
+Technical audits write one JSON line per page to ``<stem>.pages.ndjson``
+(optionally ``.gz`` or ``.zst``) as soon as the page is audited, and a small
+``<stem>.json`` summary with everything else when the run finishes. A crash
+mid-crawl therefore keeps every page audited so far, and neither the writer
+nor the readers ever hold the whole result tree in memory.
+
+Data that is only known after the crawl (link graph metrics, broken links)
+is appended as annotation lines ``{"annotation": <url>, ...}`` that readers
+merge into the matching page record.
+
+Pages are written in the order they finish, which for a concurrent,
+priority-ordered crawl is not crawl order: use ``home_page`` rather than
+the first record to find the site's root page.
+"""
+
+import gzip
+import io
+import json
+import logging
+import zlib
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from audit_core.crawler import normalize_url
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SUFFIXES = {None: '', 'gzip': '.gz', 'zstd': '.zst'}
+READ_ERRORS = (EOFError, zlib.error, ValueError) + ((zstandard.ZstdError,) if zstandard else ())
+
+
+def _open_write(path: Path, compression: Optional[str]):
+    if compression == 'gzip':
+        return gzip.open(path, 'wt', encoding='utf-8')
+    if compression == 'zstd':
+        raw = open(path, 'wb')
+        return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(raw), encoding='utf-8')
+    return open(path, 'w', encoding='utf-8')
+
+
+def open_ndjson(path: Path):
+    """Open an NDJSON file for text reading, decompressing by suffix"""
+    path = Path(path)
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if path.suffix == '.zst':
+        if zstandard is None:
+            raise ImportError("Reading .zst results requires the zstandard package")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb')),
+                                encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def iter_ndjson(path: Path) -> Iterator[Dict]:
+    """Yield each complete line; a truncated tail (from a crashed run) ends the stream"""
+    try:
+        with open_ndjson(path) as f:
+            for line in f:
+                if not line.endswith('\n'):
+                    break
+                yield json.loads(line)
+    except READ_ERRORS as e:
+        logger.warning(f"{path} ends early ({e}); reading the pages written before that")
+
+
+class ResultStreamWriter:
+    """Append page records to NDJSON while the crawl runs, then write the summary"""
+
+    def __init__(self, stem: str, compression: Optional[str] = None, flush_every: int = 20):
+        if compression == 'zstd' and zstandard is None:
+            logger.warning("zstandard is not installed, compressing results with gzip instead")
+            compression = 'gzip'
+        if compression not in SUFFIXES:
+            raise ValueError(f"Unknown results compression: {compression}")
+        self.summary_path = Path(f"{stem}.json")
+        self.pages_path = Path(f"{stem}.pages.ndjson{SUFFIXES[compression]}")
+        self.pages_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = max(1, flush_every)
+        self.pages_written = 0
+        self.annotations_written = 0
+        self.file = _open_write(self.pages_path, compression)
+
+    @classmethod
+    def from_config(cls, config: Dict, stem: str) -> Optional['ResultStreamWriter']:
+        output_config = config.get('output', {})
+        if not output_config.get('stream_pages', True):
+            return None
+        compression = output_config.get('compression')
+        return cls(stem, None if compression in (None, 'none') else compression,
+                   flush_every=output_config.get('flush_every', 20))
+
+    def _write_line(self, record: Dict) -> None:
+        self.file.write(json.dumps(record, default=str, separators=(',', ':')))
+        self.file.write('\n')
+
+    def write(self, record: Dict) -> None:
+        self._write_line(record)
+        self.pages_written += 1
+        if self.pages_written % self.flush_every == 0:
+            self.file.flush()
+
+    def annotate(self, url: str, fields: Dict) -> None:
+        """Attach post-crawl fields to an already written page"""
+        self._write_line({'annotation': url, **fields})
+        self.annotations_written += 1
+
+    def close(self, summary: Dict) -> Path:
+        """Finish the pages file and write the summary next to it"""
+        self.file.close()
+        summary = dict(summary,
+                       pages_file=self.pages_path.name,
+                       pages_written=self.pages_written)
+        summary.pop('pages', None)
+        with open(self.summary_path, 'w') as f:
+            json.dump(summary, f, indent=2, default=str)
+        return self.summary_path
+
+
+class LazyPages:
+    """Re-iterable, read-on-demand view of a streamed pages file"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._annotations: Optional[Dict[str, Dict]] = None
+        self._count = 0
+        # URL -> merged record, for pages looked up by URL
+        self._by_url: Dict[str, Optional[Dict]] = {}
+
+    def annotations(self) -> Dict[str, Dict]:
+        """Post-crawl fields by URL; the same pass counts the page records"""
+        if self._annotations is None:
+            self._annotations = {}
+            count = 0
+            for record in iter_ndjson(self.path):
+                url = record.pop('annotation', None)
+                if url is not None:
+                    self._annotations.setdefault(url, {}).update(record)
+                else:
+                    count += 1
+            self._count = count
+        return self._annotations
+
+    def __iter__(self) -> Iterator[Dict]:
+        annotations = self.annotations()
+        for record in iter_ndjson(self.path):
+            if 'annotation' in record:
+                continue
+            for key, value in annotations.get(record.get('url'), {}).items():
+                if isinstance(value, dict) and isinstance(record.get(key), dict):
+                    record[key].update(value)
+                else:
+                    record[key] = value
+            yield record
+
+    def page(self, url: str) -> Optional[Dict]:
+        """The record for url (None if it wasn't audited), remembered for repeat lookups"""
+        url = normalize_url(url)
+        if url not in self._by_url:
+            self._by_url[url] = next((record for record in self
+                                      if normalize_url(record.get('url', '')) == url), None)
+        return self._by_url[url]
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, index: int) -> Dict:
+        if index < 0:
+            raise IndexError("LazyPages does not support negative indexes")
+        for record in islice(self, index, index + 1):
+            return record
+        raise IndexError(index)
+
+    def __len__(self) -> int:
+        self.annotations()
+        return self._count
+
+
+def home_page(results: Dict) -> Optional[Dict]:
+    """The page record for the audited site's base URL, None if it has none"""
+    base_url = results.get('base_url')
+    pages = results.get('pages') or []
+    if not base_url:
+        return None
+    if isinstance(pages, LazyPages):
+        return pages.page(base_url)
+    base_url = normalize_url(base_url)
+    return next((page for page in pages if normalize_url(page.get('url', '')) == base_url), None)
+
+
+def load_results(path: str) -> Dict:
+    """
+    Load a technical audit result.
+
+    Accepts a streamed summary (pages are attached as a LazyPages view), a bare
+    pages file from an interrupted run, or an old single-file JSON result.
+    """
+    path = Path(path)
+    if '.ndjson' in path.suffixes:
+        return {'pages': LazyPages(path)}
+    with open(path, 'r') as f:
+        results = json.load(f)
+    if 'pages_file' in results:
+        results['pages'] = LazyPages(path.parent / results['pages_file'])
+    return results
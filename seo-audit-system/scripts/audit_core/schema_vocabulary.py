@@ -0,0 +1,153 @@
+"""
+Schema.org Vocabulary
+=====================
+
+A compact, pre-indexed copy of the schema.org vocabulary for validating
+structured data without network access. The bundled file
+(``data/schemaorg-vocabulary.json.gz``) is generated from a schema.org
+release by ``build-schema-vocabulary.py`` and holds:
+
+- ``types``: every class name; a type's ID is its index
+- ``ancestors``: for each type, the IDs of itself and all its supertypes
+- ``properties``: property name -> IDs of the types in its domain
+- ``superseded``: retired term -> its replacement
+
+It is loaded lazily, once per process, by ``vocabulary()``. Type and
+property checks are dict/set lookups; the properties a type accepts are
+computed on first use and memoized.
+"""
+
+import csv
+import gzip
+import json
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+VOCABULARY_PATH = Path(__file__).parent / 'data' / 'schemaorg-vocabulary.json.gz'
+SCHEMA_PREFIXES = ('https://schema.org/', 'http://schema.org/', 'schema:')
+
+
+def schema_term(value: str) -> Optional[str]:
+    """Bare schema.org term for a type or property reference, None for other vocabularies"""
+    value = value.strip()
+    for prefix in SCHEMA_PREFIXES:
+        if value.startswith(prefix):
+            return value[len(prefix):]
+    if ':' in value or '/' in value:
+        return None
+    return value
+
+
+class SchemaVocabulary:
+    """Indexed schema.org types and properties"""
+
+    __slots__ = ('version', 'types', 'type_ids', 'ancestors', 'property_domains',
+                 'superseded', '_allowed')
+
+    def __init__(self, data: Dict):
+        self.version = data.get('version')
+        self.types: List[str] = data['types']
+        self.type_ids: Dict[str, int] = {name: type_id for type_id, name in enumerate(self.types)}
+        self.ancestors: List[FrozenSet[int]] = [frozenset(ids) for ids in data['ancestors']]
+        self.property_domains: Dict[str, FrozenSet[int]] = {
+            name: frozenset(ids) for name, ids in data['properties'].items()
+        }
+        self.superseded: Dict[str, str] = data.get('superseded', {})
+        self._allowed: Dict[int, FrozenSet[str]] = {}
+
+    @classmethod
+    def load(cls, path: Path = VOCABULARY_PATH) -> 'SchemaVocabulary':
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def has_type(self, name: str) -> bool:
+        return name in self.type_ids
+
+    def has_property(self, name: str) -> bool:
+        return name in self.property_domains
+
+    def is_subtype(self, name: str, parent: str) -> bool:
+        """True when name is parent or one of its descendants"""
+        type_id = self.type_ids.get(name)
+        parent_id = self.type_ids.get(parent)
+        return type_id is not None and parent_id is not None and parent_id in self.ancestors[type_id]
+
+    def allowed_properties(self, name: str) -> FrozenSet[str]:
+        """Every property whose domain includes the type or one of its supertypes"""
+        type_id = self.type_ids.get(name)
+        if type_id is None:
+            return frozenset()
+        allowed = self._allowed.get(type_id)
+        if allowed is None:
+            ancestors = self.ancestors[type_id]
+            allowed = frozenset(prop for prop, domains in self.property_domains.items()
+                                if not domains.isdisjoint(ancestors))
+            self._allowed[type_id] = allowed
+        return allowed
+
+    def expects(self, types: Iterable[str], prop: str) -> bool:
+        """True when prop is valid on at least one of the node's types"""
+        return any(prop in self.allowed_properties(name) for name in types)
+
+
+@lru_cache(maxsize=None)
+def vocabulary() -> Optional[SchemaVocabulary]:
+    """The bundled vocabulary, loaded on first use in each process"""
+    try:
+        return SchemaVocabulary.load()
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Schema.org vocabulary unavailable ({e}), skipping vocabulary checks")
+        return None
+
+
+def build_index(types_csv: Path, properties_csv: Path, version: str = None) -> Dict:
+    """Index a schema.org release's types and properties CSVs into the bundled format"""
+    def terms(column: str) -> List[str]:
+        return [term for term in (schema_term(value) for value in column.split(',') if value.strip())
+                if term]
+
+    with open(types_csv, newline='', encoding='utf-8') as f:
+        # Enumeration members (Monday, InStock, ...) are values, not types
+        type_rows = [row for row in csv.DictReader(f) if not row['enumerationtype']]
+    with open(properties_csv, newline='', encoding='utf-8') as f:
+        property_rows = list(csv.DictReader(f))
+
+    types = sorted(row['label'] for row in type_rows)
+    type_ids = {name: type_id for type_id, name in enumerate(types)}
+    parents = {row['label']: [type_ids[parent] for parent in terms(row['subTypeOf'])
+                              if parent in type_ids]
+               for row in type_rows}
+
+    ancestors = []
+    for name in types:
+        seen = {type_ids[name]}
+        pending = list(parents[name])
+        while pending:
+            type_id = pending.pop()
+            if type_id not in seen:
+                seen.add(type_id)
+                pending.extend(parents[types[type_id]])
+        ancestors.append(sorted(seen))
+
+    properties = {
+        row['label']: sorted(type_ids[domain] for domain in terms(row['domainIncludes'])
+                             if domain in type_ids)
+        for row in property_rows
+    }
+    superseded = {}
+    for row in type_rows + property_rows:
+        replacements = terms(row['supersededBy'])
+        if replacements:
+            superseded[row['label']] = replacements[0]
+
+    return {
+        'version': version,
+        'types': types,
+        'ancestors': ancestors,
+        'properties': dict(sorted(properties.items())),
+        'superseded': dict(sorted(superseded.items()))
+    }
@@ -0,0 +1,216 @@
+"""
+Streaming Sitemap Engine
+========================
+
+Reads XML sitemaps and sitemap indexes without ever holding a whole document
+in memory:
+
+- bodies are spooled to a temporary file in chunks (RAM up to 1 MB, disk beyond)
+- ``.xml.gz`` sitemaps are detected by their gzip magic and decompressed on the fly
+- documents are parsed with ``iterparse`` and every element is cleared once read
+- elements are matched by local name, so namespaced and plain sitemaps both work
+- index children are fetched concurrently and their URLs are yielded as soon as
+  they are parsed, so a consumer can start crawling before parsing finishes
+"""
+
+import asyncio
+import gzip
+import logging
+import tempfile
+from datetime import datetime
+from typing import AsyncIterator, BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import aiohttp
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+SPOOL_BYTES = 1024 * 1024
+CHUNK_BYTES = 64 * 1024
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def parse_timestamp(value: str) -> Optional[datetime]:
+    """W3C datetime (sitemap lastmod) or ISO timestamp as a naive local datetime"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+class SitemapURL:
+    """One <url> entry from a sitemap"""
+
+    __slots__ = ('loc', 'lastmod', 'priority', 'changefreq', 'source')
+
+    def __init__(self, loc: str, lastmod: Optional[str] = None, priority: Optional[float] = None,
+                 changefreq: Optional[str] = None, source: Optional[str] = None):
+        self.loc = loc
+        self.lastmod = lastmod
+        self.priority = priority
+        self.changefreq = changefreq
+        self.source = source
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _local(tag) -> str:
+    return etree.QName(tag).localname if isinstance(tag, str) else ''
+
+
+def _child_text(element, name: str) -> Optional[str]:
+    for child in element:
+        if _local(child.tag) == name:
+            return child.text.strip() if child.text else None
+    return None
+
+
+def _parse_priority(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def open_sitemap_stream(fileobj: BinaryIO) -> BinaryIO:
+    """Wrap fileobj in a gzip reader if it holds a gzip-compressed sitemap"""
+    magic = fileobj.read(2)
+    fileobj.seek(0)
+    return gzip.GzipFile(fileobj=fileobj, mode='rb') if magic == GZIP_MAGIC else fileobj
+
+
+def iter_sitemap(fileobj: BinaryIO, source: str = None) -> Iterator[Tuple[str, object]]:
+    """
+    Incrementally parse a sitemap or sitemap index.
+
+    Yields ``('url', SitemapURL)`` for urlset entries and ``('sitemap', loc)``
+    for index entries. Raises ``etree.XMLSyntaxError`` on malformed XML.
+    """
+    context = etree.iterparse(open_sitemap_stream(fileobj), events=('end',),
+                              resolve_entities=False, no_network=True, huge_tree=True)
+    for _, element in context:
+        name = _local(element.tag)
+        if name == 'url':
+            loc = _child_text(element, 'loc')
+            if loc:
+                yield 'url', SitemapURL(
+                    loc,
+                    lastmod=_child_text(element, 'lastmod'),
+                    priority=_parse_priority(_child_text(element, 'priority')),
+                    changefreq=_child_text(element, 'changefreq'),
+                    source=source
+                )
+        elif name == 'sitemap':
+            loc = _child_text(element, 'loc')
+            if loc:
+                yield 'sitemap', loc
+        else:
+            continue
+
+        # Free the finished entry and everything parsed before it
+        element.clear()
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+    del context
+
+
+_DONE = object()
+
+
+class SitemapEngine:
+    """Fetch sitemap trees concurrently and stream their URL entries"""
+
+    def __init__(self, session: aiohttp.ClientSession, scheduler=None,
+                 concurrency: int = 4, queue_size: int = 1000):
+        self.session = session
+        self.scheduler = scheduler
+        self.concurrency = max(1, concurrency)
+        self.queue_size = queue_size
+        self.seen: Set[str] = set()
+        self.found_sitemaps: List[str] = []
+        self.issues: List[str] = []
+
+    async def _download(self, url: str) -> Optional[BinaryIO]:
+        """Spool a sitemap body to a temporary file; None if it is not available"""
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+        try:
+            if self.scheduler is not None:
+                await self.scheduler.wait(url)
+            async with self.session.get(url, allow_redirects=True) as response:
+                if response.status != 200:
+                    spool.close()
+                    return None
+                async for chunk in response.content.iter_chunked(CHUNK_BYTES):
+                    spool.write(chunk)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Error fetching sitemap {url}: {e}")
+            spool.close()
+            return None
+        spool.seek(0)
+        return spool
+
+    async def _process(self, url: str, queue: asyncio.Queue, limit: asyncio.Semaphore,
+                       schedule) -> None:
+        try:
+            async with limit:
+                spool = await self._download(url)
+            if spool is None:
+                return
+            self.found_sitemaps.append(url)
+
+            with spool:
+                parsed = 0
+                for kind, item in iter_sitemap(spool, source=url):
+                    if kind == 'sitemap':
+                        schedule(item)
+                    else:
+                        await queue.put(item)
+                    parsed += 1
+                    if parsed % 500 == 0:
+                        # Let fetches and the consumer run between batches
+                        await asyncio.sleep(0)
+        except etree.XMLSyntaxError as e:
+            self.issues.append(f"Invalid XML in sitemap {url}: {e}")
+        except Exception as e:
+            self.issues.append(f"Error parsing sitemap content {url}: {e}")
+        finally:
+            await queue.put(_DONE)
+
+    async def stream(self, sitemap_urls: Iterable[str]) -> AsyncIterator[SitemapURL]:
+        """Yield every URL entry reachable from the given sitemaps, as parsed"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        limit = asyncio.Semaphore(self.concurrency)
+        tasks: List[asyncio.Task] = []
+        active = 0
+
+        def schedule(url: str) -> None:
+            nonlocal active
+            url = url.strip()
+            if not url or url in self.seen:
+                return
+            self.seen.add(url)
+            active += 1
+            tasks.append(asyncio.create_task(self._process(url, queue, limit, schedule)))
+
+        for url in sitemap_urls:
+            schedule(url)
+
+        try:
+            while active:
+                item = await queue.get()
+                if item is _DONE:
+                    active -= 1
+                    continue
+                yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
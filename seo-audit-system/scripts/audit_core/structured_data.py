@@ -0,0 +1,187 @@
+"""
+Structured Data Validation
+==========================
+
+Checks JSON-LD, microdata and RDFa against the bundled schema.org
+vocabulary (``audit_core.schema_vocabulary``): unknown or superseded types
+and properties, properties used on types that don't expect them, and the
+required/recommended properties of the types rich results depend on.
+
+Without the vocabulary file only the profile checks run, matching types
+by name.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from audit_core import issues
+from audit_core.issues import IssueList
+from audit_core.schema_vocabulary import SchemaVocabulary, schema_term, vocabulary
+
+# Properties Google's rich results need (required) or use when present
+# (recommended); they apply to subtypes too, so Dentist is checked as LocalBusiness.
+# Profiles apply to top-level and @graph entities only, where a nested node
+# is usually a reference (a Service's provider, an Offer's itemOffered);
+# 'nested' profiles are for types that only ever appear inside another entity.
+PROFILES = {
+    'LocalBusiness': {
+        'required': ('name', 'address'),
+        'recommended': ('telephone', 'url', 'image', 'openingHoursSpecification', 'geo', 'priceRange')
+    },
+    'Service': {
+        'required': ('name', 'provider'),
+        'recommended': ('serviceType', 'areaServed', 'description', 'offers')
+    },
+    'FAQPage': {
+        'required': ('mainEntity',),
+        'recommended': ()
+    },
+    'Question': {
+        'required': ('name', 'acceptedAnswer'),
+        'recommended': (),
+        'nested': True
+    },
+    'Answer': {
+        'required': ('text',),
+        'recommended': (),
+        'nested': True
+    }
+}
+
+
+def _as_list(value) -> List:
+    return value if isinstance(value, list) else [value]
+
+
+def _is_schema_context(context) -> bool:
+    """True when a JSON-LD @context maps terms to schema.org"""
+    if context is None:
+        return True
+    if isinstance(context, str):
+        return 'schema.org' in context
+    if isinstance(context, dict):
+        return 'schema.org' in str(context.get('@vocab', ''))
+    if isinstance(context, list):
+        return any(_is_schema_context(item) for item in context)
+    return False
+
+
+def _type_names(value) -> List[str]:
+    """schema.org type names from an @type, itemtype or typeof value"""
+    names = []
+    for item in _as_list(value):
+        if not isinstance(item, str):
+            continue
+        for token in item.split():
+            term = schema_term(token)
+            if term:
+                names.append(term)
+    return names
+
+
+def _profiles_for(types: Iterable[str], vocab: Optional[SchemaVocabulary]) -> Iterator[str]:
+    for profile in PROFILES:
+        for name in types:
+            if name == profile or (vocab is not None and vocab.is_subtype(name, profile)):
+                yield profile
+                break
+
+
+def _check_types(types: List[str], vocab: Optional[SchemaVocabulary], found: IssueList) -> List[str]:
+    """Report unknown and superseded types; returns the known ones"""
+    if vocab is None:
+        return types
+    known = []
+    for name in types:
+        if not vocab.has_type(name):
+            found.add(issues.SCHEMA_TYPE_UNKNOWN, type=name)
+            continue
+        known.append(name)
+        if name in vocab.superseded:
+            found.add(issues.SCHEMA_TERM_SUPERSEDED, term=name, replacement=vocab.superseded[name])
+    return known
+
+
+def _check_profiles(types: List[str], present: Iterable[str], vocab: Optional[SchemaVocabulary],
+                    found: IssueList, top_level: bool = True) -> None:
+    present = set(present)
+    for profile in _profiles_for(types, vocab):
+        if not top_level and not PROFILES[profile].get('nested', False):
+            continue
+        for prop in PROFILES[profile]['required']:
+            if prop not in present:
+                found.add(issues.SCHEMA_REQUIRED_MISSING, type=profile, property=prop)
+        for prop in PROFILES[profile]['recommended']:
+            if prop not in present:
+                found.add(issues.SCHEMA_RECOMMENDED_MISSING, type=profile, property=prop)
+
+
+def _validate_node(node: Dict, vocab: Optional[SchemaVocabulary], found: IssueList,
+                   top_level: bool = True) -> None:
+    types = _check_types(_type_names(node.get('@type')), vocab, found)
+    present = []
+
+    for key, value in node.items():
+        if key.startswith('@'):
+            continue
+        prop = schema_term(key)
+        if prop is None:
+            continue
+        present.append(prop)
+        if vocab is not None:
+            if not vocab.has_property(prop):
+                found.add(issues.SCHEMA_PROPERTY_UNKNOWN, property=prop)
+            elif types and not vocab.expects(types, prop):
+                found.add(issues.SCHEMA_PROPERTY_UNEXPECTED, property=prop, type='/'.join(types))
+            elif prop in vocab.superseded:
+                found.add(issues.SCHEMA_TERM_SUPERSEDED, term=prop, replacement=vocab.superseded[prop])
+
+        for item in _as_list(value):
+            if isinstance(item, dict):
+                _validate_node(item, vocab, found, top_level=False)
+
+    _check_profiles(types, present, vocab, found, top_level)
+
+
+def validate_json_ld(data) -> IssueList:
+    """Issues in one parsed JSON-LD block"""
+    found = IssueList()
+    vocab = vocabulary()
+    for document in _as_list(data):
+        if not isinstance(document, dict) or not _is_schema_context(document.get('@context')):
+            continue
+        if '@graph' in document:
+            nodes = [node for node in _as_list(document['@graph']) if isinstance(node, dict)]
+        else:
+            nodes = [document]
+        for node in nodes:
+            _validate_node(node, vocab, found)
+    return found
+
+
+def validate_microdata(item_type: str, item_props: Dict[str, str]) -> IssueList:
+    """
+    Issues in one microdata item. Nested items' itemprops are reported on
+    their ancestors too, so properties are only checked for existence,
+    not against the item's type.
+    """
+    found = IssueList()
+    types = _type_names(item_type)
+    if not types:
+        return found
+    vocab = vocabulary()
+    types = _check_types(types, vocab, found)
+    present = [prop for prop in (schema_term(token) for key in item_props for token in key.split())
+               if prop]
+    if vocab is not None:
+        for prop in present:
+            if not vocab.has_property(prop):
+                found.add(issues.SCHEMA_PROPERTY_UNKNOWN, property=prop)
+    _check_profiles(types, present, vocab, found)
+    return found
+
+
+def validate_rdfa(type_of: str) -> IssueList:
+    """Issues in one RDFa typeof (type names only)"""
+    found = IssueList()
+    _check_types(_type_names(type_of), vocabulary(), found)
+    return found
@@ -0,0 +1,186 @@
+"""
+Synthetic Test Site
+===================
+
+A generated site served from a local aiohttp server, so the auditors can be
+benchmarked end to end without touching the network. Pages are built on
+request from the page number and a seed, so a 50,000-page site costs no
+memory up front and every run sees exactly the same content.
+
+The site has a home page, ``pages`` content pages at ``/p<n>/`` and a
+``robots.txt`` that declares the sitemap. Knobs:
+
+- ``links_per_page``: random internal links on each page (every page also
+  links home and to the next page, so the site is crawlable without a
+  sitemap)
+- ``page_kb``: approximate HTML size of each page
+- ``sitemap``: ``flat`` (one urlset), ``index`` (a sitemap index over
+  ``urls_per_sitemap``-sized children) or ``none``
+"""
+
+import asyncio
+import multiprocessing
+import random
+from typing import Dict, Optional, Tuple
+
+from aiohttp import web
+
+SITEMAP_SHAPES = ('flat', 'index', 'none')
+
+WORDS = (
+    'phone screen repair battery replacement laptop tablet service same day '
+    'local technician warranty certified parts water damage diagnostics data '
+    'recovery charging port camera speaker microphone glass display cracked '
+    'appointment walk-in quote affordable fast reliable downtown store hours '
+    'customer reviews guarantee professional trusted neighborhood experts'
+).split()
+
+
+class SyntheticSite:
+    """Deterministic generated site: page content depends only on (seed, page number)"""
+
+    def __init__(self, pages: int = 500, links_per_page: int = 10, page_kb: int = 20,
+                 sitemap: str = 'flat', urls_per_sitemap: int = 1000, seed: int = 1):
+        if sitemap not in SITEMAP_SHAPES:
+            raise ValueError(f"Unknown sitemap shape: {sitemap}")
+        self.pages = max(1, pages)
+        self.links_per_page = max(0, links_per_page)
+        self.page_kb = max(1, page_kb)
+        self.sitemap = sitemap
+        self.urls_per_sitemap = max(1, urls_per_sitemap)
+        self.seed = seed
+        self.base_url = ''
+
+    def describe(self) -> Dict:
+        return {
+            'pages': self.pages,
+            'links_per_page': self.links_per_page,
+            'page_kb': self.page_kb,
+            'sitemap': self.sitemap,
+            'urls_per_sitemap': self.urls_per_sitemap,
+            'seed': self.seed
+        }
+
+    def page_path(self, number: int) -> str:
+        return f"/p{number}/"
+
+    def page_html(self, number: Optional[int]) -> str:
+        """HTML for content page number, or the home page when number is None"""
+        rng = random.Random(self.seed * 1_000_003 + (number if number is not None else -1))
+        path = '/' if number is None else self.page_path(number)
+        topic = ' '.join(rng.choice(WORDS) for _ in range(3))
+        title = 'Home' if number is None else f"Page {number}"
+
+        targets = [rng.randrange(self.pages) for _ in range(self.links_per_page)]
+        if number is not None:
+            targets.append((number + 1) % self.pages)
+        links = ''.join(f'<li><a href="{self.page_path(target)}">{rng.choice(WORDS)} {target}</a></li>'
+                        for target in targets)
+
+        head = (f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8">'
+                f'<title>{title}: {topic} | Synthetic Site</title>'
+                f'<meta name="description" content="{topic} '
+                f'{" ".join(rng.choice(WORDS) for _ in range(20))}">'
+                f'<meta name="viewport" content="width=device-width, initial-scale=1">'
+                f'<link rel="canonical" href="{self.base_url}{path}"></head>')
+        body = [f'<body><header><a href="/">Home</a></header><main><h1>{title}: {topic}</h1>']
+        size = len(head) + len(links) + 200
+        section = 0
+        while size < self.page_kb * 1024:
+            if section % 4 == 0:
+                heading = f'<h2>{" ".join(rng.choice(WORDS) for _ in range(4))}</h2>'
+                body.append(heading)
+                size += len(heading)
+            paragraph = '<p>' + ' '.join(rng.choice(WORDS) for _ in range(80)) + '.</p>'
+            body.append(paragraph)
+            size += len(paragraph)
+            section += 1
+        body.append(f'</main><nav><ul>{links}</ul></nav></body></html>')
+        return head + ''.join(body)
+
+    def lastmod(self, number: int) -> str:
+        rng = random.Random(self.seed * 7_919 + number)
+        return f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+    def urlset(self, start: int, stop: int) -> str:
+        entries = []
+        for number in range(start, stop):
+            entries.append(f'<url><loc>{self.base_url}{self.page_path(number)}</loc>'
+                           f'<lastmod>{self.lastmod(number)}</lastmod>'
+                           f'<priority>{0.9 if number % 10 == 0 else 0.5}</priority></url>')
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                + ''.join(entries) + '</urlset>')
+
+    def sitemap_index(self) -> str:
+        children = (self.pages + self.urls_per_sitemap - 1) // self.urls_per_sitemap
+        entries = ''.join(f'<sitemap><loc>{self.base_url}/sitemap-{child}.xml</loc></sitemap>'
+                          for child in range(children))
+        return ('<?xml version="1.0" encoding="UTF-8"?>'
+                '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                + entries + '</sitemapindex>')
+
+    def robots_txt(self) -> str:
+        lines = ['User-agent: *', 'Disallow:']
+        if self.sitemap != 'none':
+            lines.append(f"Sitemap: {self.base_url}/sitemap.xml")
+        return '\n'.join(lines) + '\n'
+
+    async def handle(self, request: web.Request) -> web.Response:
+        path = request.path
+        if path == '/':
+            return web.Response(text=self.page_html(None), content_type='text/html')
+        if path == '/robots.txt':
+            return web.Response(text=self.robots_txt())
+        if self.sitemap == 'flat' and path == '/sitemap.xml':
+            return web.Response(text=self.urlset(0, self.pages), content_type='application/xml')
+        if self.sitemap == 'index':
+            if path == '/sitemap.xml':
+                return web.Response(text=self.sitemap_index(), content_type='application/xml')
+            if path.startswith('/sitemap-') and path.endswith('.xml') and path[9:-4].isdigit():
+                start = int(path[9:-4]) * self.urls_per_sitemap
+                if start < self.pages:
+                    stop = min(start + self.urls_per_sitemap, self.pages)
+                    return web.Response(text=self.urlset(start, stop), content_type='application/xml')
+        if path.startswith('/p') and path.endswith('/') and path[2:-1].isdigit():
+            number = int(path[2:-1])
+            if number < self.pages:
+                return web.Response(text=self.page_html(number), content_type='text/html')
+        return web.Response(status=404, text='Not found')
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> web.AppRunner:
+        """Serve the site on the running event loop; sets base_url to the bound address"""
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', self.handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, host, port)
+        await site.start()
+        bound_port = runner.addresses[0][1]
+        self.base_url = f"http://{host}:{bound_port}"
+        return runner
+
+
+def _serve(site: SyntheticSite, connection) -> None:
+    """Server process body: report the base URL, then serve until terminated"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(site.start())
+    connection.send(site.base_url)
+    connection.close()
+    loop.run_forever()
+
+
+def serve_in_process(site: SyntheticSite) -> Tuple[multiprocessing.Process, str]:
+    """
+    Run the site's server in a child process, so serving pages doesn't compete
+    with the auditor for the GIL; returns the process and the site's base URL.
+    """
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=_serve, args=(site, sender), daemon=True)
+    process.start()
+    sender.close()
+    base_url = receiver.recv()
+    receiver.close()
+    site.base_url = base_url
+    return process, base_url
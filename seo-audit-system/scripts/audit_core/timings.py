@@ -0,0 +1,212 @@
+"""
+Stage Timings
+=============
+
+Per-stage latency histograms: where an audit's time goes, not just how
+long it took. Stages are named after what they measure (``fetch_ttfb``,
+``parse``, ``analyze_meta_tags``, ...); each gets a wall-clock histogram
+and, for synchronous work, a CPU-time histogram (``time.thread_time``, so
+other threads don't inflate it).
+
+Work done in process pool workers is recorded into ``StageSamples``,
+which pickles as a short list, and merged into the parent's
+``StageTimings`` when the result comes back.
+
+``write_textfile`` exports the histograms in the Prometheus text format for
+node_exporter's textfile collector.
+"""
+
+import asyncio
+import functools
+import os
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Upper bounds (seconds) shared by every histogram, Prometheus ``le`` style
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+           1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations in seconds"""
+
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        # One count per bucket plus the +Inf overflow
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None when empty)"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float('inf')
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, cumulative count) pairs, ending with +Inf"""
+        pairs = []
+        seen = 0
+        for bound, count in zip(BUCKETS, self.counts):
+            seen += count
+            pairs.append((repr(bound), seen))
+        pairs.append(('+Inf', self.count))
+        return pairs
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'p50_le': self.quantile(0.5),
+            'p95_le': self.quantile(0.95),
+            'buckets': {le: count for le, count in self.cumulative()}
+        }
+
+
+class _Recorder(ABC):
+    """measure() for anything with observe(stage, wall, cpu)"""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def observe(self, stage: str, wall: float, cpu: Optional[float] = None) -> None:
+        """Record one duration for stage"""
+
+    @contextmanager
+    def measure(self, stage: str):
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+
+
+class StageSamples(_Recorder, list):
+    """(stage, wall_seconds, cpu_seconds) tuples, recorded in a worker process"""
+
+    def observe(self, stage: str, wall: float, cpu: Optional[float] = None) -> None:
+        self.append((stage, wall, cpu))
+
+
+class StageTimings(_Recorder):
+    """Wall and CPU histograms per stage for one audit run"""
+
+    def __init__(self):
+        self.wall: Dict[str, Histogram] = {}
+        self.cpu: Dict[str, Histogram] = {}
+
+    def observe(self, stage: str, wall: float, cpu: Optional[float] = None) -> None:
+        histogram = self.wall.get(stage)
+        if histogram is None:
+            histogram = self.wall[stage] = Histogram()
+        histogram.observe(wall)
+        if cpu is not None:
+            histogram = self.cpu.get(stage)
+            if histogram is None:
+                histogram = self.cpu[stage] = Histogram()
+            histogram.observe(cpu)
+
+    def merge(self, samples: Iterable[Tuple[str, float, Optional[float]]]) -> None:
+        """Add samples recorded elsewhere (e.g. StageSamples from a pool worker)"""
+        for stage, wall, cpu in samples:
+            self.observe(stage, wall, cpu)
+
+    def to_dict(self) -> Dict:
+        """Results-file form: {stage: {'wall': histogram, 'cpu': histogram}}"""
+        stages = {}
+        for stage in sorted(self.wall):
+            stages[stage] = {'wall': self.wall[stage].to_dict()}
+            if stage in self.cpu:
+                stages[stage]['cpu'] = self.cpu[stage].to_dict()
+        return stages
+
+    def prometheus(self, labels: Dict[str, str]) -> List[str]:
+        """Histogram lines in the Prometheus text exposition format"""
+        lines = []
+        for metric, histograms, help_text in (
+                ('seo_audit_stage_seconds', self.wall, 'Wall-clock time per audit stage.'),
+                ('seo_audit_stage_cpu_seconds', self.cpu, 'CPU time per synchronous audit stage.')):
+            if not histograms:
+                continue
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for stage in sorted(histograms):
+                histogram = histograms[stage]
+                stage_labels = dict(labels, stage=stage)
+                for le, count in histogram.cumulative():
+                    lines.append(f"{metric}_bucket{_labels(dict(stage_labels, le=le))} {count}")
+                lines.append(f"{metric}_sum{_labels(stage_labels)} {histogram.sum:.6f}")
+                lines.append(f"{metric}_count{_labels(stage_labels)} {histogram.count}")
+        return lines
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    def escape(value) -> str:
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def timed(method):
+    """
+    Record every call of an auditor method under its own name in
+    ``self.timings``. Coroutines get wall time only: their thread's CPU
+    time includes whatever else ran on the event loop meanwhile.
+    """
+    stage = method.__name__
+
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def timed_coroutine(self, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await method(self, *args, **kwargs)
+            finally:
+                self.timings.observe(stage, time.perf_counter() - start)
+        return timed_coroutine
+
+    @functools.wraps(method)
+    def timed_method(self, *args, **kwargs):
+        with self.timings.measure(stage):
+            return method(self, *args, **kwargs)
+    return timed_method
+
+
+def write_textfile(directory: str, audit: str, timings: StageTimings, labels: Dict[str, str],
+                   gauges: Dict[str, float] = None) -> Path:
+    """
+    Write ``seo_audit_<audit>.prom`` into a node_exporter textfile collector
+    directory. The file is renamed into place so the collector never reads
+    a partial write.
+    """
+    labels = dict(labels, audit=audit)
+    lines = timings.prometheus(labels)
+    for name, value in (gauges or {}).items():
+        metric = f"seo_audit_{name}"
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f"{metric}{_labels(labels)} {value}")
+
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"seo_audit_{audit}.prom"
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    os.replace(temporary, path)
+    return path
@@ -0,0 +1,148 @@
+"""
+TLS Certificate Prober
+======================
+
+Concurrent asyncio TLS handshakes with timeouts for every host a run cares
+about (apex, www and the site hosts seen in the crawl). Certificate facts
+are cached per host in a small JSON file until shortly before the
+certificate's ``notAfter``, so repeat audits skip the handshakes entirely
+until a renewal is due.
+"""
+
+import asyncio
+import json
+import logging
+import ssl
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DAY = 86400
+
+
+def certificate_facts(cert: Dict, tls_version: Optional[str], cipher) -> Dict:
+    """Flatten ``SSLSocket.getpeercert()`` output into JSON-friendly facts"""
+    not_after = ssl.cert_time_to_seconds(cert['notAfter'])
+    return {
+        'certificate_valid': True,
+        'subject': dict(x[0] for x in cert.get('subject', ())),
+        'issuer': dict(x[0] for x in cert.get('issuer', ())),
+        'version': cert.get('version'),
+        'serial_number': cert.get('serialNumber'),
+        'not_before': cert.get('notBefore'),
+        'not_after': cert['notAfter'],
+        'not_after_epoch': not_after,
+        'days_remaining': round((not_after - time.time()) / DAY, 1),
+        'subject_alt_names': [x[1] for x in cert.get('subjectAltName', [])],
+        'tls_version': tls_version,
+        'cipher': cipher[0] if cipher else None
+    }
+
+
+class TLSProber:
+    """Probe TLS certificates for many hosts at once, with a per-host cache"""
+
+    def __init__(self, cache_path: Optional[str] = 'data/tls-cache.json', timeout: float = 10,
+                 refresh_days: float = 14, concurrency: int = 10):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.timeout = timeout
+        self.refresh_margin = refresh_days * DAY
+        self.concurrency = max(1, concurrency)
+        self.context = ssl.create_default_context()
+        self.cache: Dict[str, Dict] = self._load()
+        self.stats = {'hosts': 0, 'cached': 0, 'probed': 0, 'failed': 0}
+
+    @classmethod
+    def from_config(cls, config: Dict) -> 'TLSProber':
+        tls_config = config.get('tls', {})
+        return cls(
+            cache_path=tls_config.get('cache_path', 'data/tls-cache.json'),
+            timeout=tls_config.get('timeout_seconds', 10),
+            refresh_days=tls_config.get('refresh_days_before_expiry', 14),
+            concurrency=config.get('general', {}).get('concurrent_requests', 5)
+        )
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.cache_path or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read TLS cache {self.cache_path}: {e}")
+            return {}
+
+    def save(self) -> None:
+        if not self.cache_path:
+            return
+        now = time.time()
+        live = {host: entry for host, entry in self.cache.items() if entry['expires_at'] > now}
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.cache_path, 'w') as f:
+            json.dump(live, f, indent=2)
+
+    def cached(self, host: str) -> Optional[Dict]:
+        entry = self.cache.get(host)
+        if entry and entry['expires_at'] > time.time():
+            facts = dict(entry['facts'])
+            facts['days_remaining'] = round((facts['not_after_epoch'] - time.time()) / DAY, 1)
+            facts['from_cache'] = True
+            return facts
+        return None
+
+    async def probe(self, host: str, port: int = 443) -> Dict:
+        """Handshake with host and return its certificate facts (or the failure)"""
+        writer = None
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port, ssl=self.context, server_hostname=host),
+                timeout=self.timeout
+            )
+            ssl_object = writer.get_extra_info('ssl_object')
+            facts = certificate_facts(ssl_object.getpeercert(), ssl_object.version(),
+                                      ssl_object.cipher())
+            self.cache[host] = {
+                'facts': facts,
+                'expires_at': facts['not_after_epoch'] - self.refresh_margin
+            }
+            self.stats['probed'] += 1
+            return facts
+        except ssl.SSLCertVerificationError as e:
+            self.stats['failed'] += 1
+            return {'certificate_valid': False, 'error': f"Certificate verification failed: {e.verify_message}"}
+        except (OSError, asyncio.TimeoutError, ssl.SSLError) as e:
+            self.stats['failed'] += 1
+            return {'certificate_valid': False, 'error': str(e) or type(e).__name__}
+        finally:
+            if writer is not None:
+                writer.close()
+                try:
+                    await asyncio.wait_for(writer.wait_closed(), timeout=self.timeout)
+                except (OSError, asyncio.TimeoutError, ssl.SSLError):
+                    pass
+
+    async def probe_all(self, hosts: Iterable[str]) -> Dict[str, Dict]:
+        """Certificate facts for every host, from cache where still valid"""
+        hosts = sorted({host.lower() for host in hosts if host})
+        self.stats['hosts'] = len(hosts)
+        results: Dict[str, Dict] = {}
+        pending = []
+        for host in hosts:
+            facts = self.cached(host)
+            if facts is not None:
+                results[host] = facts
+                self.stats['cached'] += 1
+            else:
+                pending.append(host)
+
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(host: str):
+            async with limit:
+                return host, await self.probe(host)
+
+        results.update(await asyncio.gather(*(bounded(host) for host in pending)))
+        self.save()
+        return results
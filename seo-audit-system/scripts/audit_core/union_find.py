@@ -0,0 +1,49 @@
+"""
+Union-Find
+==========
+
+Disjoint-set forest over dense integer IDs with path halving and union by
+size, used to group pages into clusters (near-duplicates, canonical sets).
+"""
+
+from collections import defaultdict
+from typing import Dict, List
+
+
+class UnionFind:
+    """Disjoint sets over the integers 0..n-1, growing on demand"""
+
+    def __init__(self, size: int = 0):
+        self.parent: List[int] = list(range(size))
+        self.size: List[int] = [1] * size
+
+    def _grow(self, item: int) -> None:
+        while len(self.parent) <= item:
+            self.parent.append(len(self.parent))
+            self.size.append(1)
+
+    def find(self, item: int) -> int:
+        self._grow(item)
+        parent = self.parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, a: int, b: int) -> int:
+        """Merge the sets containing a and b and return the new root"""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return root_a
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+        return root_a
+
+    def groups(self, min_size: int = 2) -> Dict[int, List[int]]:
+        """Map each root to its members, keeping sets of at least min_size"""
+        members: Dict[int, List[int]] = defaultdict(list)
+        for item in range(len(self.parent)):
+            members[self.find(item)].append(item)
+        return {root: items for root, items in members.items() if len(items) >= min_size}
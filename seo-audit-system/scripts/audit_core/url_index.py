@@ -0,0 +1,48 @@
+"""
+URL Index
+=========
+
+Maps normalized URLs to dense integer IDs for the length of a run, so that
+crawl-wide bookkeeping (coverage diffs, link graphs, duplicate clusters) can
+work on small integers instead of repeated strings.
+"""
+
+import sys
+from typing import Dict, Iterable, List, Optional
+
+from audit_core.crawler import normalize_url
+
+
+class URLIndex:
+    """Bidirectional normalized-URL <-> integer ID table"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.urls: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def __contains__(self, url: str) -> bool:
+        return normalize_url(url) in self.ids
+
+    def id_for(self, url: str) -> int:
+        """Return the ID for url, assigning the next free one if it is new"""
+        url = normalize_url(url)
+        url_id = self.ids.get(url)
+        if url_id is None:
+            url_id = len(self.urls)
+            url = sys.intern(url)
+            self.ids[url] = url_id
+            self.urls.append(url)
+        return url_id
+
+    def get(self, url: str) -> Optional[int]:
+        """Return the ID for url without assigning one"""
+        return self.ids.get(normalize_url(url))
+
+    def url(self, url_id: int) -> str:
+        return self.urls[url_id]
+
+    def urls_for(self, url_ids: Iterable[int]) -> List[str]:
+        return sorted(self.urls[url_id] for url_id in url_ids)
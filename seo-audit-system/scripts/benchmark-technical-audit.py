@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Technical Audit Benchmark
+=========================
+
+Runs TechnicalSEOAuditor end to end against a generated site served from a
+local process (audit_core/synthetic_site.py) and reports:
+
+- pages audited per second over the whole run
+- p50/p95 per-page latency, from the start of a page's fetch to its record
+  being complete
+- peak RSS of the auditor and of its largest analysis worker
+- the per-stage timing histograms the audit records
+
+Results are written as JSON so runs can be compared between versions;
+``--compare`` prints the change against an earlier result file. State that
+would make runs differ (HTTP cache, checkpoints, incremental mode, link and
+TLS caches) is kept in a throwaway directory, and host-variant redirect
+probes are off, so nothing leaves the machine.
+"""
+
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from audit_core.synthetic_site import SITEMAP_SHAPES, SyntheticSite, serve_in_process
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPTS_DIR.parent
+
+# option -> (parameter, type, default)
+OPTIONS = {
+    '--pages': ('pages', int, 500),
+    '--links': ('links_per_page', int, 10),
+    '--page-kb': ('page_kb', int, 20),
+    '--sitemap': ('sitemap', str, 'flat'),
+    '--urls-per-sitemap': ('urls_per_sitemap', int, 1000),
+    '--concurrency': ('concurrency', int, 10),
+    '--workers': ('analysis_workers', int, None),
+    '--output': ('output', str, None),
+    '--compare': ('compare', str, None)
+}
+
+
+def load_auditor_module():
+    """technical-audit.py, imported by path (its file name is not a module name)"""
+    spec = importlib.util.spec_from_file_location('technical_audit', SCRIPTS_DIR / 'technical-audit.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def benchmark_config(work_dir: Path, params: Dict) -> Dict:
+    """The project's audit settings, with every cross-run cache pointed at work_dir"""
+    with open(PROJECT_ROOT / 'config' / 'audit-settings.json', 'r') as f:
+        config = json.load(f)
+    data = work_dir / 'data'
+    config['general'].update({
+        'delay_between_requests': 0,
+        'concurrent_requests': params['concurrency'],
+        'max_requests_per_host': params['concurrency']
+    })
+    config['crawl'].update({
+        'max_pages': params['pages'] + 1,
+        'max_depth': params['pages'] + 1,
+        'analysis_workers': params['analysis_workers']
+    })
+    config['cache'] = dict(config.get('cache', {}), enabled=False)
+    config['checkpoint'] = dict(config.get('checkpoint', {}), enabled=False)
+    config['incremental'] = dict(config.get('incremental', {}), enabled=False)
+    config['redirects'] = dict(config.get('redirects', {}), probe_host_variants=False)
+    config['duplicates'] = dict(config.get('duplicates', {}), fingerprint_path=str(data / 'fingerprints.json'))
+    config['link_check'] = dict(config.get('link_check', {}), cache_path=str(data / 'link-status.sqlite'))
+    config['tls'] = dict(config.get('tls', {}), cache_path=str(data / 'tls-cache.json'))
+    config['metrics'] = {'textfile_dir': None}
+    return config
+
+
+def peak_rss_mb(who: int) -> float:
+    peak = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SCRIPTS_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(params: Dict) -> Dict:
+    """Serve the synthetic site, audit it once and collect the measurements"""
+    site = SyntheticSite(params['pages'], params['links_per_page'], params['page_kb'],
+                         params['sitemap'], params['urls_per_sitemap'])
+    server, base_url = serve_in_process(site)
+
+    original_dir = Path.cwd()
+    work_dir = Path(tempfile.mkdtemp(prefix='seo-audit-benchmark-'))
+    try:
+        for name in ('logs', 'reports', 'data'):
+            (work_dir / name).mkdir()
+        # technical-audit.py logs and saves results relative to the working directory
+        os.chdir(work_dir)
+        technical_audit = load_auditor_module()
+        logging.getLogger().setLevel(logging.WARNING)
+
+        auditor = technical_audit.TechnicalSEOAuditor(base_url, benchmark_config(work_dir, params))
+
+        # Per-page latency: first fetch call to the finished record
+        started: Dict[str, float] = {}
+        latencies: List[float] = []
+        fetch_for_audit, complete_page = auditor.fetch_for_audit, auditor.complete_page
+
+        async def timed_fetch(url):
+            started[url] = time.perf_counter()
+            fetched = await fetch_for_audit(url)
+            if not isinstance(fetched, technical_audit.FetchResult):
+                latencies.append(time.perf_counter() - started.pop(url))
+            return fetched
+
+        def timed_complete(url, response, analysis):
+            page = complete_page(url, response, analysis)
+            latencies.append(time.perf_counter() - started.pop(url))
+            return page
+
+        auditor.fetch_for_audit = timed_fetch
+        auditor.complete_page = timed_complete
+
+        start = time.perf_counter()
+        results = asyncio.run(auditor.run_full_audit())
+        wall_seconds = time.perf_counter() - start
+        # The analysis pool has exited by now; the server is still running, so
+        # RUSAGE_CHILDREN only covers the workers
+        auditor_rss = peak_rss_mb(resource.RUSAGE_SELF)
+        worker_rss = peak_rss_mb(resource.RUSAGE_CHILDREN)
+    finally:
+        os.chdir(original_dir)
+        server.terminate()
+        server.join()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    pages_audited = len(results['pages'])
+    latency_ms = np.array(latencies) * 1000
+    return {
+        'benchmark': 'technical-audit',
+        'timestamp': datetime.now().isoformat(),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'site': site.describe(),
+        'concurrency': params['concurrency'],
+        'analysis_workers': params['analysis_workers'],
+        'pages_audited': pages_audited,
+        'wall_seconds': round(wall_seconds, 3),
+        'pages_per_second': round(pages_audited / wall_seconds, 2) if wall_seconds else None,
+        'latency_ms': {
+            'p50': round(float(np.percentile(latency_ms, 50)), 2) if latency_ms.size else None,
+            'p95': round(float(np.percentile(latency_ms, 95)), 2) if latency_ms.size else None,
+            'max': round(float(latency_ms.max()), 2) if latency_ms.size else None
+        },
+        'peak_rss_mb': auditor_rss,
+        'peak_worker_rss_mb': worker_rss,
+        'summary': {key: results['summary'][key]
+                    for key in ('total_pages_audited', 'total_issues', 'critical_issues', 'warnings')},
+        'stage_timings': {
+            stage: {
+                'count': histograms['wall']['count'],
+                'mean_ms': round(histograms['wall']['mean'] * 1000, 3),
+                # None when the 95th percentile fell past the largest bucket
+                'p95_le_ms': (histograms['wall']['p95_le'] * 1000
+                              if histograms['wall']['p95_le'] != float('inf') else None)
+            }
+            for stage, histograms in results.get('stage_timings', {}).items()
+        }
+    }
+
+
+def compare(result: Dict, baseline: Dict) -> List[str]:
+    """Lines describing how result differs from an earlier benchmark result"""
+    lines = [f"Compared with {baseline.get('revision') or 'baseline'} ({baseline.get('timestamp')}):"]
+    if baseline.get('site') != result['site']:
+        lines.append("  warning: the baseline used a different site shape")
+    for label, path, higher_is_better in (
+            ('pages/sec', ('pages_per_second',), True),
+            ('p50 latency ms', ('latency_ms', 'p50'), False),
+            ('p95 latency ms', ('latency_ms', 'p95'), False),
+            ('peak RSS MB', ('peak_rss_mb',), False)):
+        old, new = baseline, result
+        for key in path:
+            old, new = (old or {}).get(key), (new or {}).get(key)
+        if not old or new is None:
+            continue
+        change = (new - old) / old * 100
+        better = change > 0 if higher_is_better else change < 0
+        verdict = 'better' if better else 'worse' if change else 'same'
+        lines.append(f"  {label}: {old} -> {new} ({change:+.1f}%, {verdict})")
+    return lines
+
+
+def main():
+    """Main function for running the technical audit benchmark"""
+    args = sys.argv[1:]
+    params = {parameter: default for parameter, _, default in OPTIONS.values()}
+    while args:
+        option = args.pop(0)
+        if option not in OPTIONS or not args:
+            print("Usage: python benchmark-technical-audit.py [--pages N] [--links N] [--page-kb N]")
+            print("       [--sitemap flat|index|none] [--urls-per-sitemap N] [--concurrency N]")
+            print("       [--workers N] [--output FILE] [--compare BASELINE.json]")
+            sys.exit(1)
+        parameter, kind, _ = OPTIONS[option]
+        try:
+            params[parameter] = kind(args.pop(0))
+        except ValueError:
+            print(f"Error: {option} expects {kind.__name__}")
+            sys.exit(1)
+    if params['sitemap'] not in SITEMAP_SHAPES:
+        print(f"Error: --sitemap must be one of {', '.join(SITEMAP_SHAPES)}")
+        sys.exit(1)
+
+    result = run_benchmark(params)
+
+    output = Path(params['output'] or
+                  f"reports/benchmarks/technical_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+
+    print("\n" + "="*50)
+    print("TECHNICAL AUDIT BENCHMARK")
+    print("="*50)
+    print(f"Site: {result['site']['pages']} pages, {result['site']['links_per_page']} links/page, "
+          f"~{result['site']['page_kb']} KB/page, {result['site']['sitemap']} sitemap")
+    print(f"Pages Audited: {result['pages_audited']} in {result['wall_seconds']:.2f}s "
+          f"({result['pages_per_second']} pages/sec)")
+    print(f"Per-page Latency: p50 {result['latency_ms']['p50']} ms, p95 {result['latency_ms']['p95']} ms")
+    print(f"Peak RSS: {result['peak_rss_mb']} MB (largest worker {result['peak_worker_rss_mb']} MB)")
+
+    if params['compare']:
+        with open(params['compare'], 'r') as f:
+            baseline = json.load(f)
+        print()
+        print('\n'.join(compare(result, baseline)))
+
+    print(f"\nResults saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Schema.org Vocabulary Builder
+=============================
+
+Regenerates the vocabulary file bundled with the audit scripts
+(audit_core/data/schemaorg-vocabulary.json.gz) from a schema.org release.
+
+Download the release's CSV files from
+https://schema.org/docs/developers.html
+(schemaorg-current-https-types.csv and schemaorg-current-https-properties.csv)
+and point this script at the directory holding them.
+"""
+
+import gzip
+import json
+from pathlib import Path
+
+from audit_core.schema_vocabulary import VOCABULARY_PATH, build_index
+
+TYPES_CSV = 'schemaorg-current-https-types.csv'
+PROPERTIES_CSV = 'schemaorg-current-https-properties.csv'
+
+
+def main():
+    """Main function for building the schema.org vocabulary file"""
+    import sys
+
+    args = sys.argv[1:]
+    if len(args) not in (1, 2):
+        print("Usage: python build-schema-vocabulary.py <RELEASE_DIR> [<VERSION>]")
+        sys.exit(1)
+
+    release_dir = Path(args[0])
+    version = args[1] if len(args) > 1 else release_dir.name
+    types_csv = release_dir / TYPES_CSV
+    properties_csv = release_dir / PROPERTIES_CSV
+    for path in (types_csv, properties_csv):
+        if not path.is_file():
+            print(f"Error: '{path}' not found")
+            sys.exit(1)
+
+    index = build_index(types_csv, properties_csv, version)
+
+    VOCABULARY_PATH.parent.mkdir(parents=True, exist_ok=True)
+    # mtime=0 keeps the file byte-identical across rebuilds of the same release
+    with open(VOCABULARY_PATH, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as f:
+        f.write(json.dumps(index, separators=(',', ':')).encode('utf-8'))
+
+    print(f"Schema.org {version}: {len(index['types'])} types, {len(index['properties'])} properties")
+    print(f"Written to {VOCABULARY_PATH} ({VOCABULARY_PATH.stat().st_size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,7 @@ import logging
 import re
 import time
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
@@ -39,6 +40,8 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 
+from audit_core.politeness import HostScheduler
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -63,6 +66,7 @@ class CompetitiveAnalyzer:
         })
         self.target_keywords = self.load_target_keywords()
         self.serp_results = {}
+        self.scheduler = HostScheduler.from_config(self.config)
         
     @staticmethod
     def load_config() -> Dict:
@@ -188,8 +192,8 @@ class CompetitiveAnalyzer:
         }
         
         for keyword in keywords:
-            # Add delay to avoid being blocked
-            time.sleep(2)
+            # Rate limit SERP requests to avoid being blocked
+            self.scheduler.wait_sync("https://www.google.com/search")
             
             serp_results = self.scrape_google_serp(keyword)
             if not serp_results:
@@ -285,7 +289,8 @@ class CompetitiveAnalyzer:
     def fetch_competitor_content(self, competitor_url: str) -> Optional[Dict]:
         """Fetch and analyze competitor content"""
         try:
-            response = self.session.get(competitor_url, timeout=30)
+            with self.scheduler.slot_sync(competitor_url):
+                response = self.session.get(competitor_url, timeout=30)
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'html.parser')
@@ -479,7 +484,8 @@ class CompetitiveAnalyzer:
             domain = urlparse(site_url).netloc
             
             try:
-                response = self.session.get(site_url, timeout=30)
+                with self.scheduler.slot_sync(site_url):
+                    response = self.session.get(site_url, timeout=30)
                 soup = BeautifulSoup(response.content, 'html.parser')
                 
                 # Technical factors to check
@@ -656,11 +662,12 @@ class CompetitiveAnalyzer:
         # Content gap analysis
         if competitors:
             logger.info("Fetching competitor content for gap analysis")
-            competitor_contents = []
-            for comp_url in competitors:
-                content = self.fetch_competitor_content(comp_url)
-                if content:
-                    competitor_contents.append(content)
+            # Different hosts are fetched in parallel; the scheduler spaces out
+            # requests to the same host
+            workers = self.config.get('general', {}).get('concurrent_requests', 5)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                fetched = list(executor.map(self.fetch_competitor_content, competitors))
+            competitor_contents = [content for content in fetched if content]
                     
             if competitor_contents:
                 audit_results['content_gaps'] = self.analyze_content_gaps(competitor_contents)
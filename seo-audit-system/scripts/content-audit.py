@@ -17,9 +17,11 @@ Comprehensive content analysis including:
 
 import json
 import logging
+import os
 import re
 import time
 from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
@@ -33,6 +35,11 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from textblob import TextBlob
 import yake
 
+from audit_core.fetching import (CHARSET_RE, DEFAULT_MAX_BODY_BYTES, HTML_CONTENT_TYPES,
+                                 READ_CHUNK_BYTES, accepts_content_type, read_limited)
+from audit_core.offline import astro_site_url, iter_build_files, path_to_url, read_mapped
+from audit_core.timings import StageSamples, StageTimings, timed, write_textfile
+
 # Download required NLTK data
 try:
     nltk.data.find('tokenizers/punkt')
@@ -68,8 +75,12 @@ class ContentSEOAnalyzer:
             'User-Agent': self.config.get('general', {}).get('user_agent', 
                 'SEO-Audit-Bot/1.0 (Ultimate SEO Audit System)')
         })
+        general = self.config.get('general', {})
+        self.max_body_bytes = general.get('max_body_bytes', DEFAULT_MAX_BODY_BYTES)
+        self.page_content_types = tuple(general.get('html_content_types', HTML_CONTENT_TYPES))
         self.stop_words = set(stopwords.words('english'))
         self.target_keywords = self.load_target_keywords()
+        self.timings = StageTimings()
         
     @staticmethod
     def load_config() -> Dict:
@@ -111,16 +122,38 @@ class ContentSEOAnalyzer:
     def fetch_page_content(self, url: str) -> Tuple[Optional[BeautifulSoup], Optional[str]]:
         """Fetch and parse page content"""
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
+            with self.timings.measure('fetch'), self.session.get(url, timeout=30, stream=True) as response:
+                response.raise_for_status()
+                if not accepts_content_type(response.headers, self.page_content_types):
+                    logger.warning(f"Skipping {url}: not HTML ({response.headers.get('content-type')})")
+                    return None, None
+                content, truncated = read_limited(response.iter_content(READ_CHUNK_BYTES),
+                                                  self.max_body_bytes)
+            if truncated:
+                logger.warning(f"{url} is larger than {self.max_body_bytes} bytes; analyzing the first "
+                               f"{self.max_body_bytes}")
+            
+            # Without a charset in the header, detect it from the body like
+            # requests' apparent_encoding (which needs the unstreamed content)
+            if CHARSET_RE.search(response.headers.get('content-type', '')):
+                encoding = response.encoding
+            else:
+                detector = requests.compat.chardet
+                encoding = detector.detect(content)['encoding'] if detector is not None else None
+            try:
+                text = content.decode(encoding or 'utf-8', errors='replace')
+            except LookupError:
+                text = content.decode('utf-8', errors='replace')
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            return soup, response.text
+            with self.timings.measure('parse'):
+                soup = BeautifulSoup(content, 'html.parser')
+            return soup, text
             
         except requests.RequestException as e:
             logger.error(f"Error fetching {url}: {e}")
             return None, None
 
+    @timed
     def extract_text_content(self, soup: BeautifulSoup) -> Dict:
         """Extract and clean text content from HTML"""
         # Remove script and style elements
@@ -186,6 +219,7 @@ class ContentSEOAnalyzer:
         
         return content_areas
 
+    @timed
     def analyze_keyword_density(self, text: str, target_keywords: List[str] = None) -> Dict:
         """Analyze keyword density and distribution"""
         if not text:
@@ -294,6 +328,7 @@ class ContentSEOAnalyzer:
                 
         return placement
 
+    @timed
     def analyze_readability(self, text: str) -> Dict:
         """Analyze content readability using multiple metrics"""
         if not text or len(text.split()) < 10:
@@ -349,6 +384,7 @@ class ContentSEOAnalyzer:
             
         return readability
 
+    @timed
     def analyze_content_structure(self, content_areas: Dict) -> Dict:
         """Analyze content structure and organization"""
         structure = {
@@ -604,6 +640,7 @@ class ContentSEOAnalyzer:
             logger.error(f"Error extracting key phrases: {e}")
             return []
 
+    @timed
     def analyze_semantic_content(self, text: str) -> Dict:
         """Analyze semantic content and topic modeling"""
         if not text or len(text.split()) < 50:
@@ -704,6 +741,23 @@ class ContentSEOAnalyzer:
         if not soup:
             return {'error': 'Failed to fetch page content'}
             
+        audit_results = self.audit_soup(url, soup)
+        
+        # Calculate audit duration
+        audit_duration = time.time() - start_time
+        audit_results['audit_duration_seconds'] = audit_duration
+        audit_results['stage_timings'] = self.timings.to_dict()
+        
+        logger.info(f"Content audit completed in {audit_duration:.2f} seconds")
+        self.export_metrics(audit_results)
+        
+        # Save results
+        self.save_results(audit_results)
+        
+        return audit_results
+
+    def audit_soup(self, url: str, soup: BeautifulSoup) -> Dict:
+        """Run every content analysis on one parsed page"""
         # Extract content areas
         content_areas = self.extract_text_content(soup)
         
@@ -728,17 +782,93 @@ class ContentSEOAnalyzer:
         # Generate summary
         self._generate_content_summary(audit_results)
         
-        # Calculate audit duration
+        return audit_results
+
+    def run_offline_content_audit(self, build_dir: str) -> Dict:
+        """
+        Content audit of every page in a local build directory (e.g. Astro's
+        dist/), with pages analyzed in a process pool.
+        """
+        build_dir = Path(build_dir)
+        logger.info(f"Starting offline content audit of {build_dir} as {self.base_url}")
+        
+        start_time = time.time()
+        paths = iter_build_files(build_dir)
+        workers = self.config.get('offline', {}).get('workers') or os.cpu_count() or 1
+        logger.info(f"Analyzing {len(paths)} HTML files with {workers} worker processes")
+        
+        pages = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.base_url, self.config)) as pool:
+            urls = [path_to_url(build_dir, path, self.base_url) for path in paths]
+            for page, samples in pool.map(_audit_build_file, paths, urls):
+                pages.append(page)
+                self.timings.merge(samples)
+                
+        audit_results = {
+            'url': self.base_url,
+            'domain': self.domain,
+            'build_dir': str(build_dir),
+            'audit_timestamp': datetime.now().isoformat(),
+            'pages': pages,
+            'summary': self._summarize_pages(pages)
+        }
+        
         audit_duration = time.time() - start_time
         audit_results['audit_duration_seconds'] = audit_duration
+        audit_results['stage_timings'] = self.timings.to_dict()
         
-        logger.info(f"Content audit completed in {audit_duration:.2f} seconds")
+        logger.info(f"Offline content audit of {len(pages)} pages completed in {audit_duration:.2f} seconds")
+        self.export_metrics(audit_results)
         
-        # Save results
         self.save_results(audit_results)
         
         return audit_results
 
+    def export_metrics(self, audit_results: Dict) -> None:
+        """Write the run's stage timings as a Prometheus textfile, when configured"""
+        textfile_dir = self.config.get('metrics', {}).get('textfile_dir')
+        if not textfile_dir:
+            return
+        summary = audit_results['summary']
+        try:
+            path = write_textfile(textfile_dir, 'content', self.timings, {'site': self.domain}, {
+                'duration_seconds': round(audit_results['audit_duration_seconds'], 3),
+                'pages_audited': summary.get('total_pages_audited', 1),
+                'seo_optimization_score': summary['seo_optimization_score'],
+                'last_run_timestamp_seconds': int(time.time())
+            })
+            logger.info(f"Stage timing metrics written to {path}")
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {textfile_dir}: {e}")
+
+    def _summarize_pages(self, pages: List[Dict]) -> Dict:
+        """Site-wide summary of per-page content audits"""
+        audited = [page for page in pages if 'error' not in page]
+        summaries = [page['summary'] for page in audited]
+        count = len(summaries) or 1
+        
+        # The same issue on many pages is usually one template fix
+        issue_counts = Counter(issue for summary in summaries for issue in summary['priority_issues'])
+        win_counts = Counter(win for summary in summaries for win in summary['quick_wins'])
+        
+        return {
+            'total_pages_audited': len(audited),
+            'failed_pages': len(pages) - len(audited),
+            'total_words': sum(summary['total_words'] for summary in summaries),
+            'readability_score': sum(summary['readability_score'] for summary in summaries) / count,
+            'seo_optimization_score': round(
+                sum(summary['seo_optimization_score'] for summary in summaries) / count),
+            'priority_issues': [f"{issue} ({pages_with} pages)"
+                                for issue, pages_with in issue_counts.most_common(10)],
+            'quick_wins': [f"{win} ({pages_with} pages)"
+                           for win, pages_with in win_counts.most_common(10)],
+            'lowest_scoring_pages': [
+                {'url': page['url'], 'seo_optimization_score': page['summary']['seo_optimization_score']}
+                for page in sorted(audited, key=lambda page: page['summary']['seo_optimization_score'])[:10]
+            ]
+        }
+
     def _generate_content_summary(self, results: Dict) -> None:
         """Generate content audit summary"""
         summary = results['summary']
@@ -799,25 +929,75 @@ class ContentSEOAnalyzer:
             
         summary['seo_optimization_score'] = sum(score_factors)
 
+# One analyzer per worker process, so NLTK data and keywords load once per worker
+_worker_analyzer: Optional[ContentSEOAnalyzer] = None
+
+
+def _init_worker(base_url: str, config: Dict) -> None:
+    global _worker_analyzer
+    _worker_analyzer = ContentSEOAnalyzer(base_url, config)
+
+
+def _audit_build_file(path: Path, url: str) -> Tuple[Dict, StageSamples]:
+    """Process pool entry point: content audit of one built HTML file, with its stage timings"""
+    timings = _worker_analyzer.timings = StageSamples()
+    try:
+        with timings.measure('parse'):
+            soup = BeautifulSoup(read_mapped(path), 'html.parser')
+        return _worker_analyzer.audit_soup(url, soup), timings
+    except Exception as e:
+        logger.error(f"Error auditing {path}: {e}")
+        return {'url': url, 'error': str(e)}, timings
+
+
 def main():
     """Main function for running content SEO audit"""
     import sys
     
-    if len(sys.argv) != 2:
-        print("Usage: python content-audit.py <URL>")
+    args = sys.argv[1:]
+    metrics_dir = None
+    if '--metrics-dir' in args and args.index('--metrics-dir') + 1 < len(args):
+        position = args.index('--metrics-dir')
+        metrics_dir = args[position + 1]
+        del args[position:position + 2]
+    
+    build_dir = None
+    if '--build-dir' in args and args.index('--build-dir') + 1 < len(args):
+        position = args.index('--build-dir')
+        build_dir = args[position + 1]
+        del args[position:position + 2]
+        if not Path(build_dir).is_dir():
+            print(f"Error: Build directory '{build_dir}' not found")
+            sys.exit(1)
+        # The Astro project is normally the build directory's parent
+        if not args:
+            site_url = astro_site_url(Path(build_dir).resolve().parent)
+            if site_url:
+                args = [site_url]
+    
+    if len(args) != 1:
+        print("Usage: python content-audit.py [--metrics-dir <DIR>] <URL>")
+        print("       python content-audit.py --build-dir <DIR> [--metrics-dir <DIR>] [<URL>]")
         sys.exit(1)
         
-    url = sys.argv[1]
+    url = args[0]
     
     # Create analyzer and run audit
     analyzer = ContentSEOAnalyzer(url)
-    results = analyzer.run_full_content_audit(url)
+    if metrics_dir is not None:
+        analyzer.config.setdefault('metrics', {})['textfile_dir'] = metrics_dir
+    if build_dir is not None:
+        results = analyzer.run_offline_content_audit(build_dir)
+    else:
+        results = analyzer.run_full_content_audit(url)
     
     # Print summary
     print("\n" + "="*50)
     print("CONTENT SEO AUDIT SUMMARY")
     print("="*50)
     print(f"URL: {results['url']}")
+    if 'total_pages_audited' in results['summary']:
+        print(f"Pages Audited: {results['summary']['total_pages_audited']}")
     print(f"Total Words: {results['summary']['total_words']}")
     print(f"SEO Optimization Score: {results['summary']['seo_optimization_score']}/100")
     print(f"Readability Score: {results['summary']['readability_score']:.1f} (Flesch Reading Ease)")
@@ -28,6 +28,8 @@ from jinja2 import Environment, FileSystemLoader
 import seaborn as sns
 from weasyprint import HTML, CSS
 
+from audit_core.result_stream import home_page, load_results
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -72,10 +74,10 @@ class SEOReportGenerator:
         # Load technical audit data
         if technical_file and Path(technical_file).exists():
             try:
-                with open(technical_file, 'r') as f:
-                    audit_data['technical'] = json.load(f)
-                    audit_data['available_audits'].append('technical')
-                    logger.info(f"Loaded technical audit data from {technical_file}")
+                # Page records stay on disk and are read lazily when iterated
+                audit_data['technical'] = load_results(technical_file)
+                audit_data['available_audits'].append('technical')
+                logger.info(f"Loaded technical audit data from {technical_file}")
             except Exception as e:
                 logger.error(f"Error loading technical data: {e}")
                 
@@ -158,38 +160,34 @@ class SEOReportGenerator:
             if tech_data.get('ssl_certificate', {}).get('https_supported'):
                 tech_score += 15
                 
-            # Meta tags (30 points total)
-            for page in tech_data.get('pages', []):
-                meta_issues = len(page.get('meta_tags', {}).get('issues', []))
+            # Page checks score the homepage only for now; pages are stored
+            # in completion order, so look it up by URL
+            page = home_page(tech_data)
+            if page is not None:
+                # Meta tags (30 points total)
+                meta_issues = len((page.get('meta_tags') or {}).get('issues', []))
                 if meta_issues == 0:
                     tech_score += 15
                 elif meta_issues <= 2:
                     tech_score += 10
-                break  # Only check first page for now
-                
-            # Header structure (15 points)
-            for page in tech_data.get('pages', []):
-                header_issues = len(page.get('header_structure', {}).get('issues', []))
+                    
+                # Header structure (15 points)
+                header_issues = len((page.get('header_structure') or {}).get('issues', []))
                 if header_issues == 0:
                     tech_score += 15
                 elif header_issues <= 1:
                     tech_score += 10
-                break
-                
-            # Schema markup (10 points)
-            for page in tech_data.get('pages', []):
+                    
+                # Schema markup (10 points)
                 if page.get('schema_markup'):
                     tech_score += 10
-                break
-                
-            # Mobile friendliness (10 points)
-            for page in tech_data.get('pages', []):
-                mobile_issues = len(page.get('mobile_friendliness', {}).get('issues', []))
+                    
+                # Mobile friendliness (10 points)
+                mobile_issues = len((page.get('mobile_friendliness') or {}).get('issues', []))
                 if mobile_issues == 0:
                     tech_score += 10
                 elif mobile_issues <= 1:
                     tech_score += 5
-                break
                 
             scores['technical'] = min(tech_score, 100)
             
@@ -525,10 +523,10 @@ class SEOReportGenerator:
                         </div>
                     </div>
                     
-                    {% if technical.pages %}
+                    {% if technical_home %}
                     <div class="card">
                         <h3>Page Optimization</h3>
-                        {% set page = technical.pages[0] %}
+                        {% set page = technical_home %}
                         <div class="metric">
                             <span class="metric-label">Title Tag</span>
                             <span class="metric-value {{ 'status-good' if not page.meta_tags.issues or 'title' not in page.meta_tags.issues|join else 'status-error' }}">
@@ -826,6 +824,7 @@ class SEOReportGenerator:
             score_color=score_color,
             available_audits=audit_data['available_audits'],
             technical=audit_data.get('technical', {}),
+            technical_home=home_page(audit_data.get('technical', {})),
             performance=audit_data.get('performance', {}),
             content=audit_data.get('content', {}),
             competitive=audit_data.get('competitive', {}),
@@ -17,28 +17,59 @@ Comprehensive technical SEO analysis including:
 """
 
 import asyncio
+import hashlib
 import json
 import logging
-import re
-import ssl
+import os
+import sys
 import time
 import urllib.parse
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple, Union
 from urllib.robotparser import RobotFileParser
 
 import aiohttp
+import numpy as np
 import requests
-from bs4 import BeautifulSoup
-from lxml import etree, html
 from urllib.parse import urljoin, urlparse
 import validators
 import tldextract
-import socket
 from certificate_transparency_monitor import monitor
 
+from audit_core.canonicals import resolve_canonicals
+from audit_core.checkpoint import CrawlCheckpoint
+from audit_core.coverage import diff_sitemap_coverage, linked_url_ids
+from audit_core.crawler import SiteCrawler
+from audit_core.fetch_memo import FetchMemo
+from audit_core.fetching import (DEFAULT_MAX_BODY_BYTES, FETCH_ERRORS, HTML_CONTENT_TYPES,
+                                 READ_CHUNK_BYTES, FetchResult, accepts_content_type,
+                                 build_client_session, fetch_async, read_limited,
+                                 result_from_cache)
+from audit_core.frontier import CrawlPriority
+from audit_core.http_cache import HTTPValidatorCache
+from audit_core import issues
+from audit_core.incremental import PreviousRun
+from audit_core.issues import CRITICAL, summarize_issues
+from audit_core.link_checker import LinkChecker, LinkStatusCache, is_broken
+from audit_core.link_graph import LinkGraph, analyze_link_graph
+from audit_core.near_duplicates import NearDuplicateIndex
+from audit_core.offline import (analyze_file, astro_site_url, iter_build_files, path_to_url,
+                                read_local_sitemaps, url_to_path)
+from audit_core import page_analysis
+from audit_core.page_analysis import DocumentAnalysis
+from audit_core.politeness import HostScheduler
+from audit_core.records import LinkAnalysis, PageRecord
+from audit_core.redirects import RedirectAnalyzer
+from audit_core.result_stream import ResultStreamWriter
+from audit_core.sitemaps import SitemapEngine, SitemapURL
+from audit_core.timings import StageTimings, timed, write_textfile
+from audit_core.tls_probe import TLSProber
+from audit_core.url_index import URLIndex
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -50,6 +81,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def body_hash(content: bytes) -> str:
+    """Fingerprint of a response body, compared across incremental runs"""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
 class TechnicalSEOAuditor:
     def __init__(self, base_url: str, config: Dict = None):
         self.base_url = base_url.rstrip('/')
@@ -61,11 +96,29 @@ class TechnicalSEOAuditor:
                 'SEO-Audit-Bot/1.0 (Ultimate SEO Audit System)')
         })
         self.crawled_urls = set()
-        self.internal_links = defaultdict(set)
-        self.external_links = defaultdict(set)
+        # Page URL ID -> linked URL IDs, both in self.url_index
+        self.internal_links: Dict[int, Set[int]] = defaultdict(set)
+        self.external_links: Dict[int, Set[int]] = defaultdict(set)
         self.meta_data = {}
         self.schema_markup = []
         self.issues = []
+        self.async_session = None
+        self.scheduler = HostScheduler.from_config(self.config)
+        self.http_cache = HTTPValidatorCache.from_config(self.config)
+        general = self.config.get('general', {})
+        # Bodies are streamed up to max_body_bytes; pages of other types keep only their headers
+        self.max_body_bytes: Optional[int] = general.get('max_body_bytes', DEFAULT_MAX_BODY_BYTES)
+        self.page_content_types = tuple(general.get('html_content_types', HTML_CONTENT_TYPES))
+        self.fetch_memo = FetchMemo()
+        self.url_index = URLIndex()
+        self.sitemap_entries: Dict[int, SitemapURL] = {}
+        self.crawler = None
+        self.duplicate_index = NearDuplicateIndex.from_config(self.config)
+        self.result_writer: Optional[ResultStreamWriter] = None
+        self.checkpoint: Optional[CrawlCheckpoint] = None
+        self.previous_run: Optional[PreviousRun] = None
+        self.analysis_pool: Optional[ProcessPoolExecutor] = None
+        self.timings = StageTimings()
         
     @staticmethod
     def load_config() -> Dict:
@@ -76,7 +129,8 @@ class TechnicalSEOAuditor:
         except FileNotFoundError:
             logger.warning("Config file not found, using default settings")
             return {
-                "general": {"timeout": 60000, "retries": 3},
+                "general": {"timeout": 60000, "retries": 3, "concurrent_requests": 5},
+                "crawl": {"enabled": True, "max_depth": 3, "max_pages": 500},
                 "seo": {
                     "title_length": {"min": 30, "max": 60},
                     "meta_description_length": {"min": 150, "max": 160}
@@ -85,6 +139,21 @@ class TechnicalSEOAuditor:
 
     def save_results(self, results: Dict) -> None:
         """Save audit results to file"""
+        writer = self.result_writer
+        if writer is not None:
+            # Pages were streamed as they were audited; add what the
+            # crawl-wide analyses learned about them, then the summary
+            for page in results['pages']:
+                fields = page.post_crawl_fields(self.url_index)
+                if fields:
+                    writer.annotate(page.url, fields)
+            filename = writer.close(results)
+            self.result_writer = None
+            logger.info(f"Technical audit results saved to {filename} "
+                        f"({writer.pages_written} pages in {writer.pages_path})")
+            return
+            
+        results = dict(results, pages=[page.to_dict(self.url_index) for page in results['pages']])
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"reports/technical_audit_{timestamp}.json"
         
@@ -94,11 +163,103 @@ class TechnicalSEOAuditor:
         
         logger.info(f"Technical audit results saved to {filename}")
 
-    def fetch_url(self, url: str, timeout: int = 30) -> Optional[requests.Response]:
-        """Fetch URL with error handling"""
+    def record_page(self, page: PageRecord, checkpoint: bool = True) -> None:
+        """Stream a finished page record to the results file and the crawl checkpoint"""
+        checkpoint = checkpoint and self.checkpoint is not None
+        if self.result_writer is None and not checkpoint:
+            return
+        record = page.to_dict(self.url_index)
+        if self.result_writer is not None:
+            self.result_writer.write(record)
+        if checkpoint:
+            self.checkpoint.completed(page.url, record)
+
+    def adopt_page(self, record: Dict) -> PageRecord:
+        """Rebuild a stored page record and the crawl state derived from it"""
+        page = PageRecord.from_dict(record, self.url_index)
+        if page.internal_links is not None:
+            links = page.internal_links.links
+            for target_id, is_internal in zip(links.target_ids, links.internal):
+                targets = self.internal_links if is_internal else self.external_links
+                targets[page.url_id].add(target_id)
+        duplicate = page.duplicate_content
+        if duplicate and duplicate.get('simhash'):
+            self.duplicate_index.add_fingerprint(page.url, duplicate['content_hash'],
+                                                 int(duplicate['simhash'], 16))
+        self.crawled_urls.add(page.url)
+        return page
+
+    def restore_pages(self, records: List[Dict]) -> List[PageRecord]:
+        """Rebuild checkpointed page records and the crawl state derived from them"""
+        pages = []
+        for record in records:
+            page = self.adopt_page(record)
+            self.record_page(page, checkpoint=False)
+            pages.append(page)
+        return pages
+
+    def reuse_previous(self, record: Dict, reason: str,
+                       response: Optional[FetchResult] = None) -> PageRecord:
+        """Carry an unchanged page's previous analysis forward"""
+        page = self.adopt_page(record)
+        page.reused = reason
+        if page.duplicate_content is not None:
+            page.duplicate_content['changed_since_last_run'] = False
+        if response is not None:
+            page.response_time = response.elapsed.total_seconds()
+            page.redirect_history = tuple(str(getattr(hop, 'url', hop)) for hop in response.history)
+            page.final_url = str(response.url) if response.history else None
+            self.fetch_memo.release_body(page.url)
+        self.previous_run.stats[reason] += 1
+        return page
+
+    def fetch_url(self, url: str, timeout: int = 30,
+                  content_types: Tuple[str, ...] = None) -> Optional[FetchResult]:
+        """Fetch URL once per run; repeat calls reuse the memoized response"""
+        return self.fetch_memo.fetch_sync(url, lambda u: self._fetch_url(u, timeout, content_types),
+                                          content_types, self.max_body_bytes)
+
+    def _fetch_url(self, url: str, timeout: int = 30,
+                   content_types: Tuple[str, ...] = None,
+                   revalidate: bool = True) -> Optional[FetchResult]:
+        """Fetch URL with error handling, revalidating against the HTTP cache"""
+        cache = self.http_cache
+        headers = cache.conditional_headers(url) if cache and revalidate else {}
         try:
-            response = self.session.get(url, timeout=timeout, allow_redirects=True)
-            return response
+            with self.scheduler.slot_sync(url):
+                start = time.perf_counter()
+                response = self.session.get(url, timeout=timeout, allow_redirects=True,
+                                            headers=headers, stream=True)
+                with response:
+                    body_skipped = not accepts_content_type(response.headers, content_types)
+                    if body_skipped or response.status_code == 304:
+                        content, truncated = b'', False
+                    else:
+                        # iter_content decompresses as it reads
+                        content, truncated = read_limited(response.iter_content(READ_CHUNK_BYTES),
+                                                          self.max_body_bytes)
+                total = time.perf_counter() - start
+            # requests' elapsed runs until the headers were parsed
+            ttfb = response.elapsed.total_seconds()
+            self.timings.observe('fetch_ttfb', ttfb)
+            self.timings.observe('fetch_download', max(total - ttfb, 0.0))
+            self.timings.observe('fetch', total)
+            if cache:
+                if response.status_code == 304:
+                    cached = cache.get(url)
+                    if cached:
+                        return result_from_cache(url, cached, ttfb)
+                    if headers:
+                        # Evicted since its validators were read: nothing to
+                        # replay, so ask again unconditionally
+                        return self._fetch_url(url, timeout, content_types, revalidate=False)
+                # A partial body must not be replayed on a later 304
+                elif not (truncated or body_skipped):
+                    cache.store(url, response.status_code, response.headers, content)
+            return FetchResult(url, response.status_code, response.headers, content, total,
+                               final_url=response.url,
+                               history=[hop.url for hop in response.history],
+                               truncated=truncated, body_skipped=body_skipped)
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching {url}: {e}")
             self.issues.append({
@@ -109,11 +270,47 @@ class TechnicalSEOAuditor:
             })
             return None
 
-    def analyze_robots_txt(self) -> Dict:
+    async def fetch_url_async(self, url: str, timeout: int = 30,
+                              content_types: Tuple[str, ...] = None) -> Optional[FetchResult]:
+        """Fetch URL over the crawl's aiohttp session, falling back to requests"""
+        if self.async_session is None:
+            return self.fetch_url(url, timeout, content_types)
+            
+        return await self.fetch_memo.fetch(url, lambda u: self._fetch_url_async(u, timeout, content_types),
+                                           content_types, self.max_body_bytes)
+
+    async def _fetch_url_async(self, url: str, timeout: int = 30,
+                               content_types: Tuple[str, ...] = None) -> Optional[FetchResult]:
+        try:
+            async with self.scheduler.slot(url):
+                return await fetch_async(self.async_session, url, timeout, self.http_cache,
+                                         self.timings, self.max_body_bytes, content_types)
+        except FETCH_ERRORS as e:
+            logger.error(f"Error fetching {url}: {e}")
+            self.issues.append({
+                'type': 'fetch_error',
+                'url': url,
+                'error': str(e),
+                'severity': 'high'
+            })
+            return None
+
+    @timed
+    async def analyze_robots_txt(self) -> Dict:
         """Analyze robots.txt file"""
         logger.info("Analyzing robots.txt...")
         
         robots_url = f"{self.base_url}/robots.txt"
+        # Through the host scheduler like every other request, without
+        # blocking the event loop
+        async with self.client_session():
+            response = await self.fetch_url_async(robots_url)
+        if not response or response.status_code != 200:
+            return self.parse_robots_txt(robots_url, None)
+        return self.parse_robots_txt(robots_url, response.text)
+
+    def parse_robots_txt(self, robots_url: str, content: Optional[str]) -> Dict:
+        """Analyze robots.txt content; None when the file does not exist"""
         results = {
             'url': robots_url,
             'exists': False,
@@ -121,11 +318,11 @@ class TechnicalSEOAuditor:
             'user_agents': [],
             'sitemaps': [],
             'disallowed_paths': [],
+            'crawl_delay': None,
             'issues': []
         }
         
-        response = self.fetch_url(robots_url)
-        if not response or response.status_code != 200:
+        if content is None:
             results['issues'].append("robots.txt not found or inaccessible")
             return results
             
@@ -135,12 +332,18 @@ class TechnicalSEOAuditor:
             # Parse robots.txt
             rp = RobotFileParser()
             rp.set_url(robots_url)
-            rp.read()
+            rp.parse(content.splitlines())
             
-            content = response.text
             results['content'] = content
             results['valid'] = True
             
+            # Honour Crawl-delay for our own user agent (or the wildcard group)
+            user_agent = self.session.headers.get('User-Agent', '*')
+            crawl_delay = rp.crawl_delay(user_agent) or rp.crawl_delay('*')
+            if crawl_delay:
+                results['crawl_delay'] = float(crawl_delay)
+                self.scheduler.set_crawl_delay(urlparse(robots_url).netloc, crawl_delay)
+            
             # Extract user agents and rules
             lines = content.split('\n')
             current_ua = None
@@ -176,8 +379,20 @@ class TechnicalSEOAuditor:
             
         return results
 
-    def analyze_sitemap(self) -> Dict:
-        """Analyze XML sitemap"""
+    def sitemap_locations(self, robots_results: Dict) -> List[str]:
+        """Common sitemap locations plus those declared in robots.txt"""
+        sitemap_urls = [
+            f"{self.base_url}/sitemap.xml",
+            f"{self.base_url}/sitemap_index.xml",
+            f"{self.base_url}/sitemaps.xml"
+        ]
+        sitemap_urls.extend(robots_results.get('sitemaps', []))
+        return list(dict.fromkeys(sitemap_urls))
+
+    @timed
+    async def analyze_sitemap(self, robots_results: Dict = None,
+                              on_entry: Callable[[SitemapURL], None] = None) -> Dict:
+        """Analyze XML sitemaps, streaming entries from index children in parallel"""
         logger.info("Analyzing sitemap...")
         
         results = {
@@ -188,72 +403,63 @@ class TechnicalSEOAuditor:
             'last_modified': None
         }
         
-        # Common sitemap locations
-        sitemap_urls = [
-            f"{self.base_url}/sitemap.xml",
-            f"{self.base_url}/sitemap_index.xml",
-            f"{self.base_url}/sitemaps.xml"
-        ]
-        
-        # Also check robots.txt for sitemap declarations
-        robots_results = self.analyze_robots_txt()
-        sitemap_urls.extend(robots_results.get('sitemaps', []))
-        
-        for sitemap_url in sitemap_urls:
-            response = self.fetch_url(sitemap_url)
-            if response and response.status_code == 200:
-                results['found_sitemaps'].append(sitemap_url)
+        concurrency = self.config.get('general', {}).get('concurrent_requests', 5)
+        async with self.client_session() as session:
+            # Also check robots.txt for sitemap declarations
+            if robots_results is None:
+                robots_results = await self.analyze_robots_txt()
                 
-                try:
-                    # Parse XML
-                    root = etree.fromstring(response.content)
-                    
-                    # Handle sitemap index
-                    if 'sitemapindex' in root.tag:
-                        sitemap_locations = root.xpath('//sitemap/loc/text()')
-                        for loc in sitemap_locations:
-                            # Recursively analyze sub-sitemaps
-                            sub_response = self.fetch_url(loc)
-                            if sub_response:
-                                self._parse_sitemap_urls(sub_response.content, results)
-                    else:
-                        # Regular sitemap
-                        self._parse_sitemap_urls(response.content, results)
-                        
-                except etree.XMLSyntaxError as e:
-                    results['issues'].append(f"Invalid XML in sitemap {sitemap_url}: {e}")
-                    
+            engine = SitemapEngine(session, self.scheduler, concurrency=concurrency)
+            async for entry in engine.stream(self.sitemap_locations(robots_results)):
+                self._record_sitemap_url(entry, results)
+                if on_entry:
+                    on_entry(entry)
+                
+        results['found_sitemaps'] = engine.found_sitemaps
+        results['issues'] = engine.issues + results['issues']
+        
         if not results['found_sitemaps']:
             results['issues'].append("No accessible sitemap found")
             
         return results
 
-    def _parse_sitemap_urls(self, xml_content: bytes, results: Dict) -> None:
-        """Parse URLs from sitemap XML content"""
-        try:
-            root = etree.fromstring(xml_content)
-            urls = root.xpath('//url/loc/text()')
-            lastmods = root.xpath('//url/lastmod/text()')
-            
-            results['total_urls'] += len(urls)
+    def _record_sitemap_url(self, entry: SitemapURL, results: Dict) -> None:
+        """Validate one sitemap entry and fold it into the sitemap results"""
+        results['total_urls'] += 1
+        self.sitemap_entries[self.url_index.id_for(entry.loc)] = entry
+        
+        if validators.url(entry.loc):
+            results['valid_urls'] += 1
+        else:
+            results['issues'].append(f"Invalid URL in sitemap: {entry.loc}")
             
-            for i, url in enumerate(urls):
-                # Validate URL
-                if validators.url(url):
-                    results['valid_urls'] += 1
-                else:
-                    results['issues'].append(f"Invalid URL in sitemap: {url}")
-                
-                # Check last modified dates
-                if i < len(lastmods) and lastmods[i]:
-                    if not results['last_modified'] or lastmods[i] > results['last_modified']:
-                        results['last_modified'] = lastmods[i]
-                        
-        except Exception as e:
-            results['issues'].append(f"Error parsing sitemap content: {e}")
+        # Track the most recent last modified date
+        if entry.lastmod:
+            if not results['last_modified'] or entry.lastmod > results['last_modified']:
+                results['last_modified'] = entry.lastmod
+
+    def tls_hosts(self, pages: List[PageRecord] = ()) -> Set[str]:
+        """Apex, www and every crawled host on the site's registered domain"""
+        base_host = urlparse(self.base_url).hostname or self.domain
+        apex = tldextract.extract(base_host).registered_domain
+        if not apex:
+            # IP addresses and localhost have no registered domain or www variant
+            return {base_host}
+        hosts = {base_host, apex, f"www.{apex}"}
+        
+        seen_ids = {page.url_id for page in pages}
+        for page in pages:
+            if page.internal_links is not None:
+                seen_ids.update(page.internal_links.links.ids(internal_only=True))
+        for url_id in seen_ids:
+            host = urlparse(self.url_index.url(url_id)).hostname
+            if host and host not in hosts and (host == apex or host.endswith(f".{apex}")):
+                hosts.add(host)
+        return hosts
 
-    def analyze_ssl_certificate(self) -> Dict:
-        """Analyze SSL certificate and HTTPS implementation"""
+    @timed
+    async def analyze_ssl_certificate(self, pages: List[PageRecord] = ()) -> Dict:
+        """Analyze SSL certificates and HTTPS implementation across the site's hosts"""
         logger.info("Analyzing SSL certificate...")
         
         results = {
@@ -261,273 +467,69 @@ class TechnicalSEOAuditor:
             'certificate_valid': False,
             'certificate_info': {},
             'security_headers': {},
+            'hosts': {},
             'issues': []
         }
         
-        try:
-            # Check HTTPS support
-            https_url = self.base_url.replace('http://', 'https://')
-            response = self.fetch_url(https_url)
-            
-            if response and response.status_code == 200:
-                results['https_supported'] = True
-                
-                # Analyze security headers
-                security_headers = {
-                    'strict-transport-security': response.headers.get('strict-transport-security'),
-                    'content-security-policy': response.headers.get('content-security-policy'),
-                    'x-frame-options': response.headers.get('x-frame-options'),
-                    'x-content-type-options': response.headers.get('x-content-type-options'),
-                    'referrer-policy': response.headers.get('referrer-policy')
-                }
-                results['security_headers'] = security_headers
-                
-                # Check for missing security headers
-                if not security_headers.get('strict-transport-security'):
-                    results['issues'].append("Missing HSTS header")
-                    
-                if not security_headers.get('content-security-policy'):
-                    results['issues'].append("Missing Content Security Policy")
-                    
-                if not security_headers.get('x-frame-options'):
-                    results['issues'].append("Missing X-Frame-Options header")
-                    
-            # Get certificate information
-            hostname = urlparse(https_url).netloc
-            context = ssl.create_default_context()
-            
-            with socket.create_connection((hostname, 443)) as sock:
-                with context.wrap_socket(sock, server_hostname=hostname) as ssock:
-                    cert = ssock.getpeercert()
-                    
-                    results['certificate_valid'] = True
-                    results['certificate_info'] = {
-                        'subject': dict(x[0] for x in cert['subject']),
-                        'issuer': dict(x[0] for x in cert['issuer']),
-                        'version': cert['version'],
-                        'serial_number': cert['serialNumber'],
-                        'not_before': cert['notBefore'],
-                        'not_after': cert['notAfter'],
-                        'subject_alt_names': [x[1] for x in cert.get('subjectAltName', [])]
-                    }
-                    
-        except Exception as e:
-            results['issues'].append(f"SSL analysis error: {e}")
-            
-        return results
-
-    def analyze_meta_tags(self, url: str, soup: BeautifulSoup) -> Dict:
-        """Analyze meta tags for SEO"""
-        meta_analysis = {
-            'title': None,
-            'meta_description': None,
-            'meta_keywords': None,
-            'robots': None,
-            'canonical': None,
-            'og_tags': {},
-            'twitter_tags': {},
-            'issues': []
-        }
-        
-        # Title tag
-        title_tag = soup.find('title')
-        if title_tag:
-            title = title_tag.get_text().strip()
-            meta_analysis['title'] = title
-            
-            # Check title length
-            title_config = self.config.get('seo', {}).get('title_length', {})
-            min_length = title_config.get('min', 30)
-            max_length = title_config.get('max', 60)
-            
-            if len(title) < min_length:
-                meta_analysis['issues'].append(f"Title too short ({len(title)} chars, min: {min_length})")
-            elif len(title) > max_length:
-                meta_analysis['issues'].append(f"Title too long ({len(title)} chars, max: {max_length})")
-        else:
-            meta_analysis['issues'].append("Missing title tag")
-            
-        # Meta description
-        desc_tag = soup.find('meta', attrs={'name': 'description'})
-        if desc_tag:
-            description = desc_tag.get('content', '').strip()
-            meta_analysis['meta_description'] = description
-            
-            # Check description length
-            desc_config = self.config.get('seo', {}).get('meta_description_length', {})
-            min_length = desc_config.get('min', 150)
-            max_length = desc_config.get('max', 160)
-            
-            if len(description) < min_length:
-                meta_analysis['issues'].append(f"Meta description too short ({len(description)} chars)")
-            elif len(description) > max_length:
-                meta_analysis['issues'].append(f"Meta description too long ({len(description)} chars)")
-        else:
-            meta_analysis['issues'].append("Missing meta description")
-            
-        # Meta keywords (not recommended, but check anyway)
-        keywords_tag = soup.find('meta', attrs={'name': 'keywords'})
-        if keywords_tag:
-            meta_analysis['meta_keywords'] = keywords_tag.get('content', '').strip()
-            meta_analysis['issues'].append("Meta keywords tag found (not recommended)")
-            
-        # Robots meta tag
-        robots_tag = soup.find('meta', attrs={'name': 'robots'})
-        if robots_tag:
-            meta_analysis['robots'] = robots_tag.get('content', '').strip()
-            
-        # Canonical URL
-        canonical_tag = soup.find('link', attrs={'rel': 'canonical'})
-        if canonical_tag:
-            canonical_url = canonical_tag.get('href', '').strip()
-            meta_analysis['canonical'] = canonical_url
-            
-            # Validate canonical URL
-            if not validators.url(canonical_url):
-                meta_analysis['issues'].append(f"Invalid canonical URL: {canonical_url}")
-        else:
-            meta_analysis['issues'].append("Missing canonical tag")
-            
-        # Open Graph tags
-        og_tags = soup.find_all('meta', attrs={'property': re.compile(r'^og:')})
-        for tag in og_tags:
-            property_name = tag.get('property')
-            content = tag.get('content', '').strip()
-            meta_analysis['og_tags'][property_name] = content
-            
-        # Twitter Card tags
-        twitter_tags = soup.find_all('meta', attrs={'name': re.compile(r'^twitter:')})
-        for tag in twitter_tags:
-            name = tag.get('name')
-            content = tag.get('content', '').strip()
-            meta_analysis['twitter_tags'][name] = content
-            
-        return meta_analysis
-
-    def analyze_header_structure(self, soup: BeautifulSoup) -> Dict:
-        """Analyze header tag hierarchy (H1-H6)"""
-        header_analysis = {
-            'h1_count': 0,
-            'h1_text': [],
-            'header_hierarchy': [],
-            'issues': []
-        }
-        
-        # Find all header tags
-        headers = soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
+        # Check HTTPS support
+        https_url = self.base_url.replace('http://', 'https://')
+        # Same options as the crawl's page fetches, so the memo serves the
+        # homepage the crawl already downloaded; only the headers are needed
+        response = await self.fetch_url_async(https_url, content_types=self.page_content_types)
         
-        for header in headers:
-            tag_name = header.name
-            text = header.get_text().strip()
+        if response and response.status_code == 200:
+            results['https_supported'] = True
             
-            header_info = {
-                'tag': tag_name,
-                'text': text,
-                'length': len(text)
+            # Analyze security headers
+            security_headers = {
+                'strict-transport-security': response.headers.get('strict-transport-security'),
+                'content-security-policy': response.headers.get('content-security-policy'),
+                'x-frame-options': response.headers.get('x-frame-options'),
+                'x-content-type-options': response.headers.get('x-content-type-options'),
+                'referrer-policy': response.headers.get('referrer-policy')
             }
+            results['security_headers'] = security_headers
             
-            header_analysis['header_hierarchy'].append(header_info)
-            
-            if tag_name == 'h1':
-                header_analysis['h1_count'] += 1
-                header_analysis['h1_text'].append(text)
+            # Check for missing security headers
+            if not security_headers.get('strict-transport-security'):
+                results['issues'].append("Missing HSTS header")
                 
-        # Check H1 issues
-        if header_analysis['h1_count'] == 0:
-            header_analysis['issues'].append("No H1 tag found")
-        elif header_analysis['h1_count'] > 1:
-            header_analysis['issues'].append(f"Multiple H1 tags found ({header_analysis['h1_count']})")
-            
-        # Check header hierarchy
-        if header_analysis['header_hierarchy']:
-            prev_level = 0
-            for header in header_analysis['header_hierarchy']:
-                level = int(header['tag'][1])
+            if not security_headers.get('content-security-policy'):
+                results['issues'].append("Missing Content Security Policy")
                 
-                if level > prev_level + 1:
-                    header_analysis['issues'].append(
-                        f"Header hierarchy skip: {header['tag']} after H{prev_level}"
-                    )
-                    
-                prev_level = level
+            if not security_headers.get('x-frame-options'):
+                results['issues'].append("Missing X-Frame-Options header")
                 
-        return header_analysis
-
-    def analyze_schema_markup(self, soup: BeautifulSoup) -> List[Dict]:
-        """Analyze structured data (Schema.org markup)"""
-        schema_data = []
+        # Get certificate information for every host concurrently
+        prober = TLSProber.from_config(self.config)
+        host_results = await prober.probe_all(self.tls_hosts(pages))
+        results['hosts'] = host_results
+        results['probe_stats'] = prober.stats
         
-        # JSON-LD structured data
-        json_ld_scripts = soup.find_all('script', attrs={'type': 'application/ld+json'})
-        for script in json_ld_scripts:
-            try:
-                schema_json = json.loads(script.string)
-                schema_data.append({
-                    'type': 'json-ld',
-                    'data': schema_json,
-                    'valid': True
-                })
-            except json.JSONDecodeError as e:
-                schema_data.append({
-                    'type': 'json-ld',
-                    'data': script.string,
-                    'valid': False,
-                    'error': str(e)
-                })
-                
-        # Microdata
-        microdata_elements = soup.find_all(attrs={'itemtype': True})
-        for element in microdata_elements:
-            item_type = element.get('itemtype')
-            item_props = {}
-            
-            # Find item properties
-            props = element.find_all(attrs={'itemprop': True})
-            for prop in props:
-                prop_name = prop.get('itemprop')
-                prop_value = prop.get('content') or prop.get_text().strip()
-                item_props[prop_name] = prop_value
+        base_facts = host_results.get(urlparse(https_url).hostname, {})
+        results['certificate_valid'] = base_facts.get('certificate_valid', False)
+        if results['certificate_valid']:
+            results['certificate_info'] = {k: v for k, v in base_facts.items() if k != 'certificate_valid'}
+        
+        for host, facts in sorted(host_results.items()):
+            if not facts.get('certificate_valid'):
+                results['issues'].append(f"SSL analysis error for {host}: {facts.get('error')}")
+            elif facts['days_remaining'] < 30:
+                results['issues'].append(
+                    f"Certificate for {host} expires in {facts['days_remaining']:.0f} days")
                 
-            schema_data.append({
-                'type': 'microdata',
-                'itemtype': item_type,
-                'properties': item_props,
-                'valid': True
-            })
-            
-        # RDFa (basic detection)
-        rdfa_elements = soup.find_all(attrs={'typeof': True})
-        for element in rdfa_elements:
-            type_of = element.get('typeof')
-            schema_data.append({
-                'type': 'rdfa',
-                'typeof': type_of,
-                'valid': True
-            })
-            
-        return schema_data
+        return results
 
-    def analyze_internal_links(self, url: str, soup: BeautifulSoup) -> Dict:
-        """Analyze internal linking structure"""
+    @timed
+    def analyze_internal_links(self, url: str, links: List[Tuple]) -> LinkAnalysis:
+        """Analyze internal linking structure from PageFacts.links-style tuples"""
         base_domain = urlparse(self.base_url).netloc
+        page_id = self.url_index.id_for(url)
         
-        link_analysis = {
-            'total_links': 0,
-            'internal_links': 0,
-            'external_links': 0,
-            'broken_links': 0,
-            'links': [],
-            'anchor_text_analysis': defaultdict(int),
-            'issues': []
-        }
-        
-        # Find all links
-        links = soup.find_all('a', href=True)
+        link_analysis = LinkAnalysis()
+        anchor_counts = defaultdict(int)
         
-        for link in links:
-            href = link.get('href', '').strip()
-            anchor_text = link.get_text().strip()
-            
+        for href, anchor_text, title, rel, target in links:
             # Skip empty hrefs, javascript links, and mailto links
             if not href or href.startswith(('#', 'javascript:', 'mailto:')):
                 continue
@@ -537,147 +539,445 @@ class TechnicalSEOAuditor:
             parsed_url = urlparse(absolute_url)
             
             is_internal = parsed_url.netloc == base_domain or parsed_url.netloc == ''
+            target_id = self.url_index.id_for(absolute_url)
             
-            link_info = {
-                'url': absolute_url,
-                'anchor_text': anchor_text,
-                'is_internal': is_internal,
-                'title': link.get('title', ''),
-                'rel': link.get('rel', []),
-                'target': link.get('target', '')
-            }
-            
-            link_analysis['links'].append(link_info)
-            link_analysis['total_links'] += 1
+            link_analysis.links.add(target_id, is_internal, anchor_text, title, rel, target)
+            link_analysis.total_links += 1
             
             if is_internal:
-                link_analysis['internal_links'] += 1
-                self.internal_links[url].add(absolute_url)
+                link_analysis.internal_links += 1
+                self.internal_links[page_id].add(target_id)
             else:
-                link_analysis['external_links'] += 1
-                self.external_links[url].add(absolute_url)
+                link_analysis.external_links += 1
+                self.external_links[page_id].add(target_id)
                 
             # Analyze anchor text
             if anchor_text:
-                link_analysis['anchor_text_analysis'][anchor_text.lower()] += 1
+                anchor_counts[anchor_text.lower()] += 1
                 
                 # Check for generic anchor text
                 generic_texts = ['click here', 'read more', 'learn more', 'here', 'link']
                 if anchor_text.lower() in generic_texts:
-                    link_analysis['issues'].append(f"Generic anchor text: '{anchor_text}'")
+                    link_analysis.issues.add(issues.GENERIC_ANCHOR_TEXT, text=anchor_text)
                     
+        link_analysis.anchor_text_analysis = dict(anchor_counts)
         return link_analysis
 
     def check_duplicate_content(self, url: str, content: str) -> Dict:
-        """Basic duplicate content detection"""
-        # This is a simplified version - in production, you'd want more sophisticated analysis
-        content_hash = hash(content)
-        
+        """Exact and near-duplicate detection against the pages crawled so far"""
         duplicate_analysis = {
-            'content_hash': content_hash,
             'word_count': len(content.split()),
-            'character_count': len(content),
-            'is_duplicate': False,
-            'duplicate_of': None
+            'character_count': len(content)
         }
+        duplicate_analysis.update(self.duplicate_index.add(url, content))
+        return duplicate_analysis
+
+    def failed_page(self, url: str, error: str) -> PageRecord:
+        """Record for a URL that could not be audited"""
+        return PageRecord.failed(self.url_index, url, error)
+
+    def headers_only_page(self, url: str, response: FetchResult) -> PageRecord:
+        """Record for a non-HTML response, whose body was never downloaded"""
+        url_id = self.url_index.id_for(url)
+        page = PageRecord(url_id, self.url_index.url(url_id))
+        page.status_code = response.status_code
+        page.response_time = response.elapsed.total_seconds()
+        page.content_type = sys.intern(response.headers.get('content-type', ''))
+        page.content_length = int(response.headers.get('content-length') or 0)
+        page.timestamp = datetime.now().isoformat()
+        page.redirect_history = tuple(str(getattr(hop, 'url', hop)) for hop in response.history)
+        page.final_url = str(response.url) if response.history else None
+        self.crawled_urls.add(page.url)
+        return page
+
+    async def audit_url(self, url: str) -> PageRecord:
+        """Comprehensive audit of a single URL"""
+        fetched = await self.fetch_for_audit(url)
+        if isinstance(fetched, PageRecord):
+            return fetched
+        analysis = await self.analyze_response(fetched)
+        return self.complete_page(url, fetched, analysis)
+
+    async def fetch_for_audit(self, url: str) -> Union[PageRecord, FetchResult]:
+        """
+        Fetch stage of audit_url: the response to analyze, or the finished
+        record when there is nothing to analyze (fetch failed, page reused).
+        """
+        logger.info(f"Auditing URL: {url}")
+        url_id = self.url_index.id_for(url)
         
-        # Store content hashes for comparison (in production, use a database)
-        if hasattr(self, 'content_hashes'):
-            if content_hash in self.content_hashes:
-                duplicate_analysis['is_duplicate'] = True
-                duplicate_analysis['duplicate_of'] = self.content_hashes[content_hash]
-            else:
-                self.content_hashes[content_hash] = url
-        else:
-            self.content_hashes = {content_hash: url}
+        previous = self.previous_run.get(url) if self.previous_run is not None else None
+        if previous is not None:
+            entry = self.sitemap_entries.get(url_id)
+            if entry is not None and PreviousRun.unchanged_since(previous, entry.lastmod):
+                return self.reuse_previous(previous, 'sitemap_lastmod')
+        
+        response = await self.fetch_url_async(url, content_types=self.page_content_types)
+        if not response:
+            return self.failed_page(url, 'Failed to fetch URL')
+        if response.body_skipped:
+            return self.headers_only_page(url, response)
             
-        return duplicate_analysis
+        if previous is not None and response.status_code == previous.get('status_code'):
+            if getattr(response, 'from_cache', False):
+                return self.reuse_previous(previous, 'not_modified', response)
+            if previous.get('body_hash') == body_hash(response.content):
+                return self.reuse_previous(previous, 'body_hash', response)
+            
+        return response
 
-    def analyze_mobile_friendliness(self, soup: BeautifulSoup) -> Dict:
-        """Analyze mobile-friendly indicators"""
-        mobile_analysis = {
-            'viewport_meta': None,
-            'responsive_images': 0,
-            'total_images': 0,
-            'touch_friendly_links': 0,
-            'total_links': 0,
-            'issues': []
+    async def analyze_response(self, response: FetchResult) -> DocumentAnalysis:
+        """Analysis stage of audit_url, in the analysis process pool when one is running"""
+        seo_config = self.config.get('seo', {})
+        if self.analysis_pool is None:
+            return page_analysis.analyze_document(response.content, seo_config)
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        analysis = await loop.run_in_executor(self.analysis_pool, page_analysis.analyze_document,
+                                              response.content, seo_config)
+        # The worker timed the analysis itself; the rest of the round trip is
+        # waiting for a free worker and pickling
+        work = sum(wall for stage, wall, _ in analysis.timings if stage == 'analyze_document')
+        self.timings.observe('analysis_queue_wait', max(time.perf_counter() - start - work, 0.0))
+        return analysis
+
+    def complete_page(self, url: str, response: FetchResult, analysis: DocumentAnalysis) -> PageRecord:
+        """Final stage of audit_url: merge the analysis into the crawl-wide state"""
+        audit_results = self.page_from_analysis(url, analysis)
+        audit_results.status_code = response.status_code
+        audit_results.response_time = response.elapsed.total_seconds()
+        audit_results.content_type = sys.intern(response.headers.get('content-type', ''))
+        audit_results.redirect_history = tuple(str(getattr(hop, 'url', hop)) for hop in response.history)
+        audit_results.final_url = str(response.url) if response.history else None
+        audit_results.body_hash = body_hash(response.content)
+        if response.truncated:
+            audit_results.truncated = True
+            logger.warning(f"{url} is larger than {self.max_body_bytes} bytes; analyzed the first "
+                           f"{self.max_body_bytes}")
+        
+        self.fetch_memo.release_body(url)
+        return audit_results
+
+    def page_from_analysis(self, url: str, analysis: DocumentAnalysis) -> PageRecord:
+        """Merge a document analysis into a page record, updating crawl-wide state"""
+        url_id = self.url_index.id_for(url)
+        page = PageRecord(url_id, self.url_index.url(url_id))
+        page.content_length = analysis.content_length
+        page.timestamp = datetime.now().isoformat()
+        
+        # Core analyses
+        page.meta_tags = analysis.meta_tags
+        page.header_structure = analysis.header_structure
+        page.schema_markup = analysis.schema_markup
+        page.internal_links = self.analyze_internal_links(url, analysis.links)
+        page.duplicate_content = {
+            'word_count': analysis.word_count,
+            'character_count': analysis.character_count
         }
+        page.duplicate_content.update(
+            self.duplicate_index.add_fingerprint(url, analysis.content_hash, analysis.simhash))
+        page.mobile_friendliness = analysis.mobile_friendliness
+        page.collect_issue_codes()
+        self.timings.merge(analysis.timings)
         
-        # Check viewport meta tag
-        viewport_tag = soup.find('meta', attrs={'name': 'viewport'})
-        if viewport_tag:
-            mobile_analysis['viewport_meta'] = viewport_tag.get('content', '')
-            
-            # Check for mobile-friendly viewport settings
-            content = mobile_analysis['viewport_meta'].lower()
-            if 'width=device-width' not in content:
-                mobile_analysis['issues'].append("Viewport tag doesn't include 'width=device-width'")
-            if 'initial-scale=1' not in content:
-                mobile_analysis['issues'].append("Viewport tag doesn't include 'initial-scale=1'")
-        else:
-            mobile_analysis['issues'].append("Missing viewport meta tag")
+        self.crawled_urls.add(url)
+        return page
+
+    @asynccontextmanager
+    async def client_session(self):
+        """Yield the run's aiohttp session, opening one if none is active"""
+        if self.async_session is not None:
+            yield self.async_session
+            return
+            
+        concurrency = self.config.get('general', {}).get('concurrent_requests', 5)
+        async with build_client_session(self.config, limit=concurrency) as session:
+            self.async_session = session
+            try:
+                yield session
+            finally:
+                self.async_session = None
+
+    async def crawl_site(self, seeds: List[str], seed_stream: AsyncIterator[str] = None,
+                         resume_state: Tuple[Dict[str, int], List[Dict]] = None) -> List[PageRecord]:
+        """Audit the seed pages and follow internal links up to the crawl limits"""
+        crawl_config = self.config.get('crawl', {})
+        if not crawl_config.get('enabled', True):
+            pages = []
+            for url in seeds:
+                page = await self.audit_url(url)
+                self.record_page(page)
+                pages.append(page)
+            return pages
             
-        # Check for responsive images
-        images = soup.find_all('img')
-        mobile_analysis['total_images'] = len(images)
+        concurrency = self.config.get('general', {}).get('concurrent_requests', 5)
+        # 0 analyzes in the event loop, None uses one process per CPU
+        analysis_workers = crawl_config.get('analysis_workers')
+        if analysis_workers is None:
+            analysis_workers = os.cpu_count() or 1
+        crawler = SiteCrawler(
+            self,
+            max_depth=crawl_config.get('max_depth', 3),
+            max_pages=crawl_config.get('max_pages', 500),
+            concurrency=concurrency,
+            on_page=self.record_page,
+            on_enqueue=self.checkpoint.queued if self.checkpoint is not None else None,
+            analyzers=analysis_workers,
+            queue_size=crawl_config.get('analysis_queue_size', 32),
+            priority=CrawlPriority.from_config(self.config),
+            max_seconds=crawl_config.get('max_seconds')
+        )
         
-        for img in images:
-            # Check for srcset or sizes attributes (responsive images)
-            if img.get('srcset') or img.get('sizes'):
-                mobile_analysis['responsive_images'] += 1
+        pending = ()
+        if resume_state is not None:
+            visited, records = resume_state
+            pending = crawler.restore(visited, self.restore_pages(records))
+            
+        self.crawler = crawler
+        if analysis_workers > 0:
+            self.analysis_pool = page_analysis.analysis_pool(analysis_workers)
+        try:
+            async with self.client_session():
+                pages = await crawler.crawl(seeds, seed_stream, pending)
+        finally:
+            if self.analysis_pool is not None:
+                self.analysis_pool.shutdown()
+                self.analysis_pool = None
+            
+        if self.checkpoint is not None:
+            self.checkpoint.flush()
+        return pages
+
+    async def crawl_with_sitemap(self, robots_results: Dict,
+                                 resume_state: Tuple[Dict[str, int], List[Dict]] = None
+                                 ) -> Tuple[Dict, List[PageRecord]]:
+        """Analyze sitemaps and crawl at the same time, seeding the crawl from the sitemap stream"""
+        seeds: asyncio.Queue = asyncio.Queue()
+        
+        async def sitemap_seeds() -> AsyncIterator[str]:
+            while True:
+                url = await seeds.get()
+                if url is None:
+                    return
+                yield url
                 
-        # Basic touch-friendly link analysis (this would need more sophisticated checking in production)
-        links = soup.find_all('a')
-        mobile_analysis['total_links'] = len(links)
+        sitemap_task = asyncio.create_task(
+            self.analyze_sitemap(robots_results, on_entry=lambda entry: seeds.put_nowait(entry.loc)))
+        sitemap_task.add_done_callback(lambda _: seeds.put_nowait(None))
         
-        return mobile_analysis
+        pages = await self.crawl_site([self.base_url], seed_stream=sitemap_seeds(),
+                                      resume_state=resume_state)
+        return await sitemap_task, pages
 
-    async def audit_url(self, url: str) -> Dict:
-        """Comprehensive audit of a single URL"""
-        logger.info(f"Auditing URL: {url}")
+    def sitemap_coverage(self, pages: List[PageRecord]) -> Dict:
+        """Diff sitemap URLs against linked URLs and crawl statuses"""
+        url_index = self.url_index
+        crawler = self.crawler
         
-        response = self.fetch_url(url)
-        if not response:
-            return {'url': url, 'error': 'Failed to fetch URL'}
-            
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Perform all analyses
-        audit_results = {
-            'url': url,
-            'status_code': response.status_code,
-            'response_time': response.elapsed.total_seconds(),
-            'content_type': response.headers.get('content-type', ''),
-            'content_length': len(response.content),
-            'timestamp': datetime.now().isoformat(),
-            
-            # Core analyses
-            'meta_tags': self.analyze_meta_tags(url, soup),
-            'header_structure': self.analyze_header_structure(soup),
-            'schema_markup': self.analyze_schema_markup(soup),
-            'internal_links': self.analyze_internal_links(url, soup),
-            'duplicate_content': self.check_duplicate_content(url, soup.get_text()),
-            'mobile_friendliness': self.analyze_mobile_friendliness(soup)
+        linked_ids = linked_url_ids(self.internal_links)
+        crawlable_ids = set()
+        for url_id in linked_ids:
+            if crawler is None or crawler.is_crawlable(url_index.url(url_id)):
+                crawlable_ids.add(url_id)
+                    
+        statuses = {page.url_id: page.status_code or 0 for page in pages}
+        
+        return diff_sitemap_coverage(url_index, set(self.sitemap_entries), linked_ids,
+                                     statuses, crawlable_ids)
+
+    async def check_links(self, pages: List[PageRecord]) -> Dict:
+        """Check every unique link target once and record broken links per page"""
+        link_config = self.config.get('link_check', {})
+        if not link_config.get('enabled', True):
+            return {}
+            
+        logger.info("Checking links...")
+        check_external = link_config.get('check_external', True)
+        
+        url_index = self.url_index
+        page_targets = []
+        for page in pages:
+            targets = set()
+            if page.internal_links is not None:
+                for target_id in page.internal_links.links.ids(internal_only=not check_external):
+                    if url_index.url(target_id).startswith(('http://', 'https://')):
+                        targets.add(target_id)
+            page_targets.append(targets)
+            
+        known = {page.url: page.status_code or 0 for page in pages}
+        cache = LinkStatusCache(
+            link_config.get('cache_path', 'data/link-status.sqlite'),
+            ttl=link_config.get('ttl_hours', 24) * 3600
+        )
+        try:
+            async with self.client_session() as session:
+                checker = LinkChecker(
+                    session,
+                    self.scheduler,
+                    cache,
+                    concurrency=self.config.get('general', {}).get('concurrent_requests', 5)
+                )
+                statuses = await checker.check_all(
+                    url_index.urls_for(set().union(*page_targets)), known)
+        finally:
+            cache.close()
+            
+        broken_statuses = {url: status for url, status in statuses.items() if is_broken(status)}
+        broken_ids = {url_index.id_for(url) for url in broken_statuses}
+        for page, targets in zip(pages, page_targets):
+            link_analysis = page.internal_links
+            if link_analysis is None:
+                continue
+            broken = sorted(targets & broken_ids)
+            link_analysis.broken_link_ids = broken
+            if broken:
+                page.add_issue(link_analysis.issues, issues.BROKEN_LINKS, count=len(broken))
+                
+        return {
+            **checker.stats,
+            'broken': len(broken_statuses),
+            'broken_links': dict(sorted(broken_statuses.items())[:100])
         }
+
+    @timed
+    async def analyze_redirects(self, pages: List[PageRecord]) -> Dict:
+        """Probe scheme/host/trailing-slash variants of crawled pages and time each redirect hop"""
+        redirect_config = self.config.get('redirects', {})
+        if not redirect_config.get('enabled', True):
+            return {}
+            
+        logger.info("Analyzing redirect chains...")
+        urls = [page.url for page in pages if page.ok]
+        async with self.client_session() as session:
+            analyzer = RedirectAnalyzer(
+                session,
+                self.scheduler,
+                max_hops=redirect_config.get('max_hops', 10),
+                concurrency=self.config.get('general', {}).get('concurrent_requests', 5)
+            )
+            results = await analyzer.analyze(urls, redirect_config.get('probe_host_variants', True))
+            
+        # Redirects the crawl itself went through
+        results['crawl_redirects'] = [
+            {'url': page.url, 'via': list(page.redirect_history)}
+            for page in pages if page.redirect_history
+        ]
+        return results
+
+    @timed
+    def analyze_link_graph(self, pages: List[PageRecord]) -> Dict:
+        """Build the internal link graph and attach PageRank / click depth to each page"""
+        url_index = self.url_index
+        crawler = self.crawler
         
-        self.crawled_urls.add(url)
-        return audit_results
+        edges = []
+        for source_id, targets in self.internal_links.items():
+            for target_id in targets:
+                if crawler is None or crawler.is_crawlable(url_index.url(target_id)):
+                    edges.append((source_id, target_id))
+                    
+        root = url_index.id_for(self.base_url)
+        crawled_ids = [page.url_id for page in pages if page.ok]
+        
+        # Nodes are only the crawlable internal URLs, so assets, external and
+        # sitemap-only URLs don't take a share of PageRank
+        graph, node_url_ids = LinkGraph.from_url_ids(edges, crawled_ids + [root])
+        crawled = np.zeros(graph.num_nodes, dtype=bool)
+        crawled[np.searchsorted(node_url_ids, crawled_ids)] = True
+        root_node = int(np.searchsorted(node_url_ids, root))
+        
+        summary, per_node = analyze_link_graph(graph, root_node, crawled,
+                                               [url_index.url(url_id) for url_id in node_url_ids])
+        per_page = {int(node_url_ids[node]): metrics for node, metrics in per_node.items()}
+        for page in pages:
+            page.link_graph = per_page.get(page.url_id)
+                
+        return summary
 
-    async def run_full_audit(self) -> Dict:
-        """Run complete technical SEO audit"""
+    @timed
+    def resolve_canonicals(self, pages: List[PageRecord]) -> Dict:
+        """Cluster pages by canonical and check every canonical target against this run's fetches"""
+        if not self.config.get('canonicals', {}).get('enabled', True):
+            return {}
+        return resolve_canonicals(pages, self.url_index, self.fetch_memo)
+
+    async def run_full_audit(self, resume: bool = False, incremental: bool = False) -> Dict:
+        """
+        Run complete technical SEO audit.
+        
+        resume continues an interrupted crawl from its checkpoint; incremental
+        reuses the previous run's analysis for pages that have not changed.
+        """
         logger.info(f"Starting technical SEO audit for {self.base_url}")
         
         start_time = time.time()
+        self.reset_run_state()
+        
+        incremental_config = self.config.get('incremental', {})
+        self.previous_run = None
+        if incremental or incremental_config.get('enabled', False):
+            previous_path = incremental_config.get('previous_results')
+            self.previous_run = (PreviousRun.load(previous_path) if previous_path
+                                 else PreviousRun.latest('reports'))
+            
+        seed_from_sitemap = self.config.get('crawl', {}).get('seed_from_sitemap', True)
+        
+        self.checkpoint = CrawlCheckpoint.from_config(self.config, self.base_url)
+        resume_state = None
+        if self.checkpoint is not None:
+            if resume:
+                resume_state = self.checkpoint.load()
+            if resume_state is None:
+                self.checkpoint.start()
+        elif resume:
+            logger.warning("Crawl checkpoints are disabled in the config, starting a fresh crawl")
         
-        # Initialize results
-        audit_results = {
+        async with self.client_session():
+            robots_results = await self.analyze_robots_txt()
+            
+            # Initialize results
+            audit_results = self.new_results(robots_results)
+            
+            # Crawl the site starting from the main page, plus every sitemap
+            # URL as it is parsed when sitemap seeding is on
+            if seed_from_sitemap:
+                audit_results['sitemap'], audit_results['pages'] = \
+                    await self.crawl_with_sitemap(robots_results, resume_state)
+            else:
+                audit_results['sitemap'] = await self.analyze_sitemap(robots_results)
+                audit_results['pages'] = await self.crawl_site([self.base_url],
+                                                               resume_state=resume_state)
+            if self.crawler is not None:
+                audit_results['crawl_budget'] = self.crawler.budget_stats()
+                
+            audit_results['link_check'] = await self.check_links(audit_results['pages'])
+            audit_results['ssl_certificate'] = await self.analyze_ssl_certificate(audit_results['pages'])
+            audit_results['redirects'] = await self.analyze_redirects(audit_results['pages'])
+                
+        return self.finalize_audit(audit_results, start_time)
+
+    def reset_run_state(self) -> None:
+        """Forget everything collected by a previous run on this auditor"""
+        self.fetch_memo = FetchMemo()
+        self.url_index = URLIndex()
+        self.internal_links = defaultdict(set)
+        self.external_links = defaultdict(set)
+        self.sitemap_entries = {}
+        self.crawler = None
+        self.duplicate_index = NearDuplicateIndex.from_config(self.config)
+        self.result_writer = ResultStreamWriter.from_config(
+            self.config, f"reports/technical_audit_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        self.timings = StageTimings()
+        if self.http_cache is None:
+            self.http_cache = HTTPValidatorCache.from_config(self.config)
+
+    def new_results(self, robots_results: Dict) -> Dict:
+        """Empty results skeleton for one audit run"""
+        return {
             'domain': self.domain,
             'base_url': self.base_url,
             'audit_timestamp': datetime.now().isoformat(),
-            'robots_txt': self.analyze_robots_txt(),
-            'sitemap': self.analyze_sitemap(),
-            'ssl_certificate': self.analyze_ssl_certificate(),
+            'robots_txt': robots_results,
             'pages': [],
             'summary': {
                 'total_pages_audited': 0,
@@ -687,33 +987,27 @@ class TechnicalSEOAuditor:
                 'recommendations': []
             }
         }
-        
-        # Audit main page first
-        main_page_results = await self.audit_url(self.base_url)
-        audit_results['pages'].append(main_page_results)
-        
-        # TODO: Implement crawling for additional pages
-        # This would typically involve following internal links up to a certain depth
+
+    def finalize_audit(self, audit_results: Dict, start_time: float) -> Dict:
+        """Run the crawl-wide analyses, summarize and save the results"""
+        audit_results['sitemap_coverage'] = self.sitemap_coverage(audit_results['pages'])
+        audit_results['duplicate_clusters'] = self.duplicate_index.clusters()
+        audit_results['link_graph'] = self.analyze_link_graph(audit_results['pages'])
+        audit_results['canonicals'] = self.resolve_canonicals(audit_results['pages'])
+        self.duplicate_index.save()
         
         # Calculate summary statistics
-        total_issues = 0
-        critical_issues = 0
-        
-        for page in audit_results['pages']:
-            for category in ['meta_tags', 'header_structure', 'internal_links', 'mobile_friendliness']:
-                if category in page and 'issues' in page[category]:
-                    issues_count = len(page[category]['issues'])
-                    total_issues += issues_count
-                    
-                    # Count critical issues (simplified logic)
-                    for issue in page[category]['issues']:
-                        if any(keyword in issue.lower() for keyword in ['missing', 'no ', 'invalid']):
-                            critical_issues += 1
+        issue_summary = summarize_issues(page.issue_codes for page in audit_results['pages'])
+        total_issues = issue_summary['total_issues']
+        critical_issues = issue_summary['by_severity'][CRITICAL]
+        issue_counts = {issue['code']: issue['count'] for issue in issue_summary['issues']}
                             
         audit_results['summary']['total_pages_audited'] = len(audit_results['pages'])
         audit_results['summary']['total_issues'] = total_issues
         audit_results['summary']['critical_issues'] = critical_issues
         audit_results['summary']['warnings'] = total_issues - critical_issues
+        audit_results['summary']['issues_by_category'] = issue_summary['by_category']
+        audit_results['summary']['top_issues'] = issue_summary['issues'][:20]
         
         # Generate recommendations
         recommendations = []
@@ -724,36 +1018,259 @@ class TechnicalSEOAuditor:
         if not audit_results['sitemap']['found_sitemaps']:
             recommendations.append("Create and submit an XML sitemap")
             
-        if not audit_results['ssl_certificate']['https_supported']:
+        if 'ssl_certificate' in audit_results and not audit_results['ssl_certificate']['https_supported']:
             recommendations.append("Implement HTTPS with valid SSL certificate")
             
-        for page in audit_results['pages']:
-            if 'missing title tag' in str(page.get('meta_tags', {}).get('issues', [])):
-                recommendations.append("Add title tags to all pages")
-                break
-                
+        if audit_results['duplicate_clusters']:
+            recommendations.append(
+                f"Differentiate content in {len(audit_results['duplicate_clusters'])} near-duplicate page clusters")
+            
+        if audit_results.get('redirects', {}).get('multi_hop_chains'):
+            recommendations.append(
+                f"Collapse {audit_results['redirects']['multi_hop_chains']} multi-hop redirect chains into single redirects")
+            
+        if audit_results.get('link_check', {}).get('broken'):
+            recommendations.append(f"Fix {audit_results['link_check']['broken']} broken link targets")
+            
+        if audit_results['link_graph']['unreachable_from_home']['count']:
+            recommendations.append(
+                f"Link {audit_results['link_graph']['unreachable_from_home']['count']} pages "
+                f"that cannot be reached by clicking from the homepage")
+            
+        coverage = audit_results['sitemap_coverage']
+        if coverage['orphans']['count']:
+            recommendations.append(
+                f"Add internal links to {coverage['orphans']['count']} sitemap pages that no page links to")
+        if coverage['sitemap_non_200']['count']:
+            recommendations.append(
+                f"Remove or fix {coverage['sitemap_non_200']['count']} sitemap URLs that do not return 200")
+            
+        canonicals = audit_results['canonicals']
+        canonical_problems = sum(canonicals.get(key, 0) for key in ('loops', 'non_200_targets', 'noindex_targets'))
+        if canonical_problems:
+            recommendations.append(
+                f"Point {canonical_problems} canonical tags at indexable 200 pages outside canonical loops")
+        if canonicals.get('chains'):
+            recommendations.append(
+                f"Point {canonicals['chains']} chained canonicals directly at the final canonical URL")
+            
+        if issue_counts.get(issues.TITLE_MISSING.code):
+            recommendations.append("Add title tags to all pages")
+            
         audit_results['summary']['recommendations'] = recommendations
         
         # Calculate audit duration
         audit_duration = time.time() - start_time
         audit_results['audit_duration_seconds'] = audit_duration
+        audit_results['fetch_memo'] = self.fetch_memo.stats()
+        if self.previous_run is not None:
+            reused = sum(page.reused is not None for page in audit_results['pages'])
+            audit_results['incremental'] = {
+                'previous_results': str(self.previous_run.path),
+                **self.previous_run.stats,
+                'reused': reused,
+                'reaudited': len(audit_results['pages']) - reused
+            }
+        
+        audit_results['stage_timings'] = self.timings.to_dict()
         
         logger.info(f"Technical audit completed in {audit_duration:.2f} seconds")
+        self.export_metrics(audit_results)
         
+        if self.http_cache:
+            self.http_cache.close()
+            # Reopened by the next run's reset_run_state
+            self.http_cache = None
+            
         # Save results
         self.save_results(audit_results)
         
+        if self.checkpoint is not None:
+            self.checkpoint.finish()
+            self.checkpoint.close()
+            self.checkpoint = None
+        
         return audit_results
 
+    def export_metrics(self, audit_results: Dict) -> None:
+        """Write the run's stage timings as a Prometheus textfile, when configured"""
+        textfile_dir = self.config.get('metrics', {}).get('textfile_dir')
+        if not textfile_dir:
+            return
+        summary = audit_results['summary']
+        try:
+            path = write_textfile(textfile_dir, 'technical', self.timings, {'site': self.domain}, {
+                'duration_seconds': round(audit_results['audit_duration_seconds'], 3),
+                'pages_audited': summary['total_pages_audited'],
+                'issues': summary['total_issues'],
+                'critical_issues': summary['critical_issues'],
+                'last_run_timestamp_seconds': int(time.time())
+            })
+            logger.info(f"Stage timing metrics written to {path}")
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {textfile_dir}: {e}")
+
+    @timed
+    def analyze_local_sitemap(self, build_dir: Path, robots_results: Dict) -> Dict:
+        """Analyze the XML sitemaps written into a build directory"""
+        results = {
+            'found_sitemaps': [],
+            'total_urls': 0,
+            'valid_urls': 0,
+            'issues': [],
+            'last_modified': None
+        }
+        
+        entries, found, sitemap_issues = read_local_sitemaps(build_dir, self.base_url,
+                                                             robots_results.get('sitemaps', []))
+        for entry in entries:
+            self._record_sitemap_url(entry, results)
+            
+        results['found_sitemaps'] = found
+        results['issues'] = sitemap_issues + results['issues']
+        
+        if not found:
+            results['issues'].append("No sitemap found in the build")
+            
+        return results
+
+    def audit_build_files(self, build_dir: Path) -> List[PageRecord]:
+        """Analyze every HTML file in the build in a process pool"""
+        paths = iter_build_files(build_dir)
+        workers = self.config.get('offline', {}).get('workers') or os.cpu_count() or 1
+        seo_config = self.config.get('seo', {})
+        logger.info(f"Analyzing {len(paths)} HTML files with {workers} worker processes")
+        
+        pages = []
+        with page_analysis.analysis_pool(workers) as pool:
+            futures = [pool.submit(analyze_file, path, seo_config) for path in paths]
+            # Merged in file order, so URL IDs and duplicate clusters are
+            # the same from run to run
+            for path, future in zip(paths, futures):
+                url = path_to_url(build_dir, path, self.base_url)
+                try:
+                    analysis = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to analyze {path}: {e}")
+                    page = self.failed_page(url, str(e))
+                else:
+                    page = self.page_from_analysis(url, analysis)
+                    page.status_code = 200
+                    page.content_type = 'text/html'
+                self.record_page(page)
+                pages.append(page)
+                
+        return pages
+
+    def check_links_offline(self, pages: List[PageRecord], build_dir: Path) -> Dict:
+        """Check internal link targets against the files in the build"""
+        link_config = self.config.get('link_check', {})
+        if not link_config.get('enabled', True):
+            return {}
+            
+        url_index = self.url_index
+        built = {page.url_id for page in pages if page.ok}
+        exists: Dict[int, bool] = {}
+        for page in pages:
+            link_analysis = page.internal_links
+            if link_analysis is None:
+                continue
+            broken = set()
+            for target_id in link_analysis.links.ids(internal_only=True):
+                url = url_index.url(target_id)
+                if not url.startswith(('http://', 'https://')):
+                    continue
+                if target_id not in exists:
+                    exists[target_id] = target_id in built or url_to_path(build_dir, url) is not None
+                if not exists[target_id]:
+                    broken.add(target_id)
+            link_analysis.broken_link_ids = sorted(broken)
+            if broken:
+                page.add_issue(link_analysis.issues, issues.BROKEN_LINKS, count=len(broken))
+                
+        missing = sorted(url_index.url(target_id) for target_id, found in exists.items() if not found)
+        return {
+            'unique': len(exists),
+            'checked': len(exists),
+            'broken': len(missing),
+            'broken_links': {url: 404 for url in missing[:100]}
+        }
+
+    def run_offline_audit(self, build_dir: str) -> Dict:
+        """
+        Audit a local build directory (e.g. Astro's dist/) as if it were
+        served at base_url, without any network access.
+        """
+        build_dir = Path(build_dir)
+        logger.info(f"Starting offline technical SEO audit of {build_dir} as {self.base_url}")
+        
+        start_time = time.time()
+        self.reset_run_state()
+        self.previous_run = None
+        self.checkpoint = None
+        # No crawl, but coverage and the link graph use its URL filter
+        self.crawler = SiteCrawler(self)
+        
+        robots_path = build_dir / 'robots.txt'
+        robots_results = self.parse_robots_txt(
+            f"{self.base_url}/robots.txt",
+            robots_path.read_text(encoding='utf-8', errors='replace') if robots_path.is_file() else None)
+        
+        audit_results = self.new_results(robots_results)
+        audit_results['build_dir'] = str(build_dir)
+        audit_results['sitemap'] = self.analyze_local_sitemap(build_dir, robots_results)
+        audit_results['pages'] = self.audit_build_files(build_dir)
+        audit_results['link_check'] = self.check_links_offline(audit_results['pages'], build_dir)
+        
+        return self.finalize_audit(audit_results, start_time)
+
 def main():
     """Main function for running technical SEO audit"""
     import sys
     
-    if len(sys.argv) != 2:
-        print("Usage: python technical-audit.py <URL>")
+    args = sys.argv[1:]
+    resume = '--resume' in args
+    incremental = '--incremental' in args
+    args = [arg for arg in args if arg not in ('--resume', '--incremental')]
+    
+    crawl_overrides = {}
+    for flag, key, kind in (('--max-pages', 'max_pages', int), ('--max-seconds', 'max_seconds', float)):
+        if flag in args and args.index(flag) + 1 < len(args):
+            position = args.index(flag)
+            try:
+                crawl_overrides[key] = kind(args[position + 1])
+            except ValueError:
+                print(f"Error: {flag} expects a number")
+                sys.exit(1)
+            del args[position:position + 2]
+    
+    metrics_dir = None
+    if '--metrics-dir' in args and args.index('--metrics-dir') + 1 < len(args):
+        position = args.index('--metrics-dir')
+        metrics_dir = args[position + 1]
+        del args[position:position + 2]
+    
+    build_dir = None
+    if '--build-dir' in args and args.index('--build-dir') + 1 < len(args):
+        position = args.index('--build-dir')
+        build_dir = args[position + 1]
+        del args[position:position + 2]
+        if not Path(build_dir).is_dir():
+            print(f"Error: Build directory '{build_dir}' not found")
+            sys.exit(1)
+        # The Astro project is normally the build directory's parent
+        if not args:
+            site_url = astro_site_url(Path(build_dir).resolve().parent)
+            if site_url:
+                args = [site_url]
+    
+    if len(args) != 1:
+        print("Usage: python technical-audit.py [--resume] [--incremental] [--max-pages <N>] [--max-seconds <S>]")
+        print("                                 [--metrics-dir <DIR>] <URL>")
+        print("       python technical-audit.py --build-dir <DIR> [--metrics-dir <DIR>] [<URL>]")
         sys.exit(1)
         
-    url = sys.argv[1]
+    url = args[0]
     
     if not validators.url(url):
         print(f"Error: Invalid URL '{url}'")
@@ -761,11 +1278,17 @@ def main():
         
     # Create auditor and run audit
     auditor = TechnicalSEOAuditor(url)
+    if metrics_dir is not None:
+        auditor.config.setdefault('metrics', {})['textfile_dir'] = metrics_dir
+    auditor.config.setdefault('crawl', {}).update(crawl_overrides)
     
     # Run audit
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    results = loop.run_until_complete(auditor.run_full_audit())
+    if build_dir is not None:
+        results = auditor.run_offline_audit(build_dir)
+    else:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        results = loop.run_until_complete(auditor.run_full_audit(resume=resume, incremental=incremental))
     
     # Print summary
     print("\n" + "="*50)
@@ -777,6 +1300,9 @@ def main():
     print(f"Critical Issues: {results['summary']['critical_issues']}")
     print(f"Warnings: {results['summary']['warnings']}")
     print(f"Audit Duration: {results['audit_duration_seconds']:.2f}s")
+    budget = results.get('crawl_budget', {})
+    if budget.get('stopped_by'):
+        print(f"Crawl Budget: stopped by {budget['stopped_by']}, {budget['skipped']} discovered URLs not audited")
     
     if results['summary']['recommendations']:
         print("\nTop Recommendations:")
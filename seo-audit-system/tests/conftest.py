@@ -0,0 +1,110 @@
+import asyncio
+import importlib.util
+import json
+import os
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# The audit scripts import audit_core as a top-level package
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+
+
+@pytest.fixture(scope='session')
+def technical_audit(tmp_path_factory):
+    """technical-audit.py, imported by path (its file name is not a module name)"""
+    pytest.importorskip('certificate_transparency_monitor')
+    # The module opens logs/technical-audit.log when it is imported
+    log_dir = tmp_path_factory.mktemp('import')
+    (log_dir / 'logs').mkdir()
+    cwd = os.getcwd()
+    os.chdir(log_dir)
+    try:
+        spec = importlib.util.spec_from_file_location(
+            'technical_audit', PROJECT_ROOT / 'scripts' / 'technical-audit.py')
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+    return module
+
+
+@pytest.fixture
+def audit_config(tmp_path, monkeypatch):
+    """The project's audit settings, run from an empty working directory"""
+    for name in ('logs', 'reports', 'data'):
+        (tmp_path / name).mkdir()
+    monkeypatch.chdir(tmp_path)
+    with open(PROJECT_ROOT / 'config' / 'audit-settings.json', 'r') as f:
+        config = json.load(f)
+    config['general']['delay_between_requests'] = 0
+    config['redirects']['probe_host_variants'] = False
+    config['crawl']['analysis_workers'] = 1
+    return config
+
+
+@asynccontextmanager
+async def _serve(app):
+    from aiohttp import web
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    try:
+        yield f"http://127.0.0.1:{runner.addresses[0][1]}"
+    finally:
+        await runner.cleanup()
+
+
+@pytest.fixture
+def serve():
+    """Serve an aiohttp app on the running event loop: ``async with serve(app) as base_url``"""
+    return _serve
+
+
+def _site_app(pages, hits=None, delay=0.0):
+    """
+    An app serving pages (path -> HTML, or -> aiohttp Response factory);
+    every request is counted in hits by (method, path), anything else is a 404
+    """
+    from aiohttp import web
+
+    async def handle(request):
+        if hits is not None:
+            hits[(request.method, request.path)] += 1
+        if delay:
+            await asyncio.sleep(delay)
+        page = pages.get(request.path)
+        if page is None:
+            return web.Response(status=404, text='not found')
+        if callable(page):
+            return page(request)
+        return web.Response(text=page, content_type='text/html')
+
+    app = web.Application()
+    app.router.add_route('*', '/{path:.*}', handle)
+    return app
+
+
+@pytest.fixture
+def site_app():
+    return _site_app
+
+
+def html_page(title, links=(), body=''):
+    """A page whose meta tags pass, with the given links"""
+    anchors = ''.join(f'<a href="{href}">{href}</a>' for href in links)
+    return (f'<html><head><title>{title}</title>'
+            f'<meta name="description" content="{"d" * 155}">'
+            f'<meta name="viewport" content="width=device-width, initial-scale=1"></head>'
+            f'<body><h1>{title}</h1><p>{body}</p>{anchors}</body></html>')
+
+
+@pytest.fixture
+def page_html():
+    return html_page
@@ -0,0 +1,121 @@
+import asyncio
+import importlib.util
+import io
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from audit_core.sitemaps import iter_sitemap
+from audit_core.synthetic_site import SyntheticSite, serve_in_process
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / 'scripts'
+
+
+@pytest.fixture(scope='module')
+def benchmark():
+    """benchmark-technical-audit.py, imported by path"""
+    spec = importlib.util.spec_from_file_location(
+        'benchmark_technical_audit', SCRIPTS_DIR / 'benchmark-technical-audit.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def sitemap_locs(xml):
+    return [item.loc if kind == 'url' else item
+            for kind, item in iter_sitemap(io.BytesIO(xml.encode()))]
+
+
+def test_pages_depend_only_on_seed_and_number():
+    site = SyntheticSite(pages=50, links_per_page=5, page_kb=8)
+    again = SyntheticSite(pages=50, links_per_page=5, page_kb=8)
+    other = SyntheticSite(pages=50, links_per_page=5, page_kb=8, seed=2)
+    assert site.page_html(7) == again.page_html(7)
+    assert site.page_html(7) != other.page_html(7)
+    assert site.page_html(None) != site.page_html(0)
+    # page_kb is approximate
+    assert 7 * 1024 < len(site.page_html(7)) < 9 * 1024
+    # Every page links to the next one, so a crawl reaches them all
+    assert 'href="/p8/"' in site.page_html(7)
+    assert 'href="/p0/"' in site.page_html(49)
+
+
+def test_sitemap_shapes():
+    site = SyntheticSite(pages=25, sitemap='index', urls_per_sitemap=10)
+    assert sitemap_locs(site.sitemap_index()) == ['/sitemap-0.xml', '/sitemap-1.xml', '/sitemap-2.xml']
+    assert sitemap_locs(site.urlset(20, 25)) == [f'/p{n}/' for n in range(20, 25)]
+    assert 'Sitemap:' not in SyntheticSite(sitemap='none').robots_txt()
+    with pytest.raises(ValueError):
+        SyntheticSite(sitemap='nested')
+
+
+def test_site_serves_from_a_child_process():
+    site = SyntheticSite(pages=3, page_kb=1)
+    process, base_url = serve_in_process(site)
+    try:
+        with urllib.request.urlopen(f'{base_url}/robots.txt') as response:
+            assert f'Sitemap: {base_url}/sitemap.xml' in response.read().decode()
+        with urllib.request.urlopen(f'{base_url}/sitemap.xml') as response:
+            assert sitemap_locs(response.read().decode()) == [f'{base_url}/p{n}/' for n in range(3)]
+        with urllib.request.urlopen(f'{base_url}/p2/') as response:
+            assert response.read().decode() == site.page_html(2)
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f'{base_url}/p3/')
+        assert error.value.code == 404
+    finally:
+        process.terminate()
+        process.join()
+
+
+def test_serving_on_the_running_loop_sets_base_url():
+    async def run():
+        site = SyntheticSite(pages=2)
+        runner = await site.start()
+        try:
+            return site.base_url, site.urlset(0, 1)
+        finally:
+            await runner.cleanup()
+
+    base_url, urlset = asyncio.run(run())
+    assert base_url.startswith('http://127.0.0.1:')
+    assert sitemap_locs(urlset) == [f'{base_url}/p0/']
+
+
+def test_compare_reports_direction_of_change(benchmark):
+    site = {'pages': 10}
+    baseline = {'revision': 'abc123', 'timestamp': 't', 'site': site, 'pages_per_second': 100.0,
+                'latency_ms': {'p50': 20.0, 'p95': 40.0}, 'peak_rss_mb': 200.0}
+    result = {'site': site, 'pages_per_second': 125.0,
+              'latency_ms': {'p50': 25.0, 'p95': 40.0}, 'peak_rss_mb': 150.0}
+    assert benchmark.compare(result, baseline) == [
+        'Compared with abc123 (t):',
+        '  pages/sec: 100.0 -> 125.0 (+25.0%, better)',
+        '  p50 latency ms: 20.0 -> 25.0 (+25.0%, worse)',
+        '  p95 latency ms: 40.0 -> 40.0 (+0.0%, same)',
+        '  peak RSS MB: 200.0 -> 150.0 (-25.0%, better)',
+    ]
+    assert 'different site shape' in benchmark.compare(dict(result, site={'pages': 20}), baseline)[1]
+
+
+def test_benchmark_keeps_cross_run_state_out_of_the_project(benchmark, tmp_path):
+    params = {'pages': 10, 'concurrency': 4, 'analysis_workers': 0}
+    config = benchmark.benchmark_config(tmp_path, params)
+    assert config['crawl']['max_pages'] == 11
+    assert not config['cache']['enabled'] and not config['checkpoint']['enabled']
+    assert not config['redirects']['probe_host_variants']
+    for path in (config['duplicates']['fingerprint_path'], config['link_check']['cache_path'],
+                 config['tls']['cache_path']):
+        assert path.startswith(str(tmp_path))
+
+
+def test_benchmark_audits_the_whole_site(benchmark):
+    pytest.importorskip('certificate_transparency_monitor')
+    params = {'pages': 6, 'links_per_page': 2, 'page_kb': 2, 'sitemap': 'index',
+              'urls_per_sitemap': 4, 'concurrency': 3, 'analysis_workers': 0}
+    result = benchmark.run_benchmark(params)
+    assert result['pages_audited'] == 7
+    assert result['summary']['total_pages_audited'] == 7
+    assert result['latency_ms']['p50'] is not None
+    assert result['stage_timings']['analyze_document']['count'] == 7
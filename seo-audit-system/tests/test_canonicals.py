@@ -0,0 +1,46 @@
+from audit_core.canonicals import resolve_canonicals, target_status
+from audit_core.fetch_memo import FetchMemo
+from audit_core.records import PageRecord
+from audit_core.url_index import URLIndex
+
+
+def redirected_page(url_index, url, final_url, history):
+    url_id = url_index.id_for(url)
+    page = PageRecord(url_id, url_index.url(url_id))
+    page.status_code = 200
+    page.meta_tags = {}
+    page.redirect_history = history
+    page.final_url = final_url
+    return page
+
+
+def test_single_redirect_reports_where_it_ends():
+    url_index = URLIndex()
+    target = redirected_page(url_index, 'https://example.com/old/', 'https://example.com/new/',
+                             ('https://example.com/old/',))
+    source_id = url_index.id_for('https://example.com/a/')
+    source = PageRecord(source_id, url_index.url(source_id))
+    source.status_code = 200
+    source.meta_tags = {'canonical': '/old/'}
+
+    summary = resolve_canonicals([source, target], url_index, FetchMemo())
+    assert summary['redirecting_targets'] == 1
+    assert source.canonical['issues'] == [
+        'Canonical target redirects: https://example.com/old/ -> https://example.com/new/']
+
+
+def test_redirect_chain_reports_final_url_not_last_hop():
+    url_index = URLIndex()
+    page = redirected_page(url_index, 'https://example.com/old/', 'https://example.com/newest/',
+                           ('https://example.com/old/', 'https://example.com/older/'))
+    status = target_status(page.url, page, FetchMemo())
+    assert status.redirects_to == 'https://example.com/newest/'
+
+
+def test_final_url_survives_a_checkpoint_round_trip():
+    url_index = URLIndex()
+    page = redirected_page(url_index, 'https://example.com/old/', 'https://example.com/new/',
+                           ('https://example.com/old/',))
+    restored = PageRecord.from_dict(page.to_dict(url_index), url_index)
+    assert restored.final_url == 'https://example.com/new/'
+    assert target_status(restored.url, restored, FetchMemo()).redirects_to == 'https://example.com/new/'
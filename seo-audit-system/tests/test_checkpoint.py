@@ -0,0 +1,77 @@
+import asyncio
+from collections import Counter
+from urllib.parse import urlparse
+
+from audit_core.checkpoint import CrawlCheckpoint
+
+BASE_URL = 'https://example.com'
+
+
+def test_rows_are_buffered_until_the_interval_passes(tmp_path):
+    path = str(tmp_path / 'crawl.sqlite')
+    checkpoint = CrawlCheckpoint(path, BASE_URL, interval=3600)
+    checkpoint.start()
+    checkpoint.queued(BASE_URL + '/', 0)
+    checkpoint.queued(BASE_URL + '/a/', 1)
+    checkpoint.completed(BASE_URL + '/', {'url': BASE_URL + '/', 'status_code': 200})
+
+    reader = CrawlCheckpoint(path, BASE_URL)
+    assert reader.load() == ({}, [])
+
+    checkpoint.flush()
+    visited, pages = reader.load()
+    assert visited == {BASE_URL + '/': 0, BASE_URL + '/a/': 1}
+    assert pages == [{'url': BASE_URL + '/', 'status_code': 200}]
+    reader.close()
+    checkpoint.close()
+
+
+def test_only_unfinished_runs_of_the_same_site_resume(tmp_path):
+    path = str(tmp_path / 'crawl.sqlite')
+    checkpoint = CrawlCheckpoint(path, BASE_URL, interval=0)
+    assert checkpoint.load() is None
+
+    checkpoint.start()
+    checkpoint.queued(BASE_URL + '/', 0)
+    checkpoint.completed(BASE_URL + '/', {'url': BASE_URL + '/'})
+    other_site = CrawlCheckpoint(path, 'https://other.example')
+    assert other_site.load() is None
+    other_site.close()
+
+    checkpoint.finish()
+    assert checkpoint.load() is None
+    checkpoint.close()
+
+
+def test_resume_skips_urls_finished_before_the_interruption(technical_audit, audit_config, serve,
+                                                            site_app, page_html, monkeypatch):
+    hits = Counter()
+    pages = {'/': page_html('Home page of the checkpoint test site', ['/a/', '/b/', '/c/'])}
+    for name in 'abc':
+        pages[f'/{name}/'] = page_html(f'Section {name} of the checkpoint test site', ['/'])
+    audit_config['checkpoint']['interval_seconds'] = 0
+    audit_config['crawl']['analysis_workers'] = 0
+    audit_config['general']['concurrent_requests'] = 1
+    # An interrupted run never marks its checkpoint complete
+    monkeypatch.setattr(CrawlCheckpoint, 'finish', CrawlCheckpoint.flush)
+
+    async def audit(base_url, max_pages, resume):
+        audit_config['crawl']['max_pages'] = max_pages
+        auditor = technical_audit.TechnicalSEOAuditor(base_url, audit_config)
+        results = await asyncio.wait_for(auditor.run_full_audit(resume=resume), timeout=60)
+        return sorted(urlparse(page.url).path for page in results['pages'])
+
+    async def run():
+        async with serve(site_app(pages, hits)) as base_url:
+            first = await audit(base_url, 2, resume=False)
+            crawled = Counter({key: count for key, count in hits.items() if key[0] == 'GET'})
+            resumed = await audit(base_url, 100, resume=True)
+            return first, crawled, resumed
+
+    first, crawled, resumed = asyncio.run(run())
+    assert len(first) == 2
+    assert resumed == ['/', '/a/', '/b/', '/c/']
+    for path in first:
+        assert hits[('GET', path)] == crawled[('GET', path)]
+    for path in set(resumed) - set(first):
+        assert hits[('GET', path)] == 1
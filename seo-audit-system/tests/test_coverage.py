@@ -0,0 +1,17 @@
+from audit_core.coverage import diff_sitemap_coverage, linked_url_ids
+from audit_core.url_index import URLIndex
+
+
+def test_page_linking_only_to_itself_is_an_orphan():
+    url_index = URLIndex()
+    home, about, orphan = (url_index.id_for(f'https://example.com{path}')
+                           for path in ('/', '/about/', '/orphan/'))
+    internal_links = {home: {home, about}, about: {home, about}, orphan: {orphan}}
+
+    linked_ids = linked_url_ids(internal_links)
+    assert linked_ids == {home, about}
+
+    coverage = diff_sitemap_coverage(url_index, {home, about, orphan}, linked_ids,
+                                     {home: 200, about: 200, orphan: 200})
+    assert coverage['orphans'] == {'count': 1, 'urls': ['https://example.com/orphan/']}
+    assert coverage['missing_from_sitemap']['count'] == 0
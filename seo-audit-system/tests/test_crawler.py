@@ -0,0 +1,137 @@
+import asyncio
+from types import SimpleNamespace
+
+from audit_core.crawler import SiteCrawler
+from audit_core.fetching import FetchResult
+from audit_core.url_index import URLIndex
+
+BASE = 'https://example.com/'
+
+
+class FakeAuditor:
+    """A site of linked pages, each fetched as a finished page record"""
+
+    def __init__(self, links):
+        self.base_url = BASE
+        self.url_index = URLIndex()
+        self.internal_links = {}
+        self.fetched = []
+        for source, targets in links.items():
+            self.internal_links[self.url_index.id_for(BASE + source)] = [
+                self.url_index.id_for(target if '://' in target else BASE + target)
+                for target in targets]
+
+    async def fetch_for_audit(self, url):
+        self.fetched.append(url)
+        return SimpleNamespace(url=url, url_id=self.url_index.id_for(url), error=None)
+
+
+def crawl(links, max_pages=100, max_depth=5):
+    auditor = FakeAuditor(links)
+    crawler = SiteCrawler(auditor, max_depth=max_depth, max_pages=max_pages, concurrency=3)
+    asyncio.run(crawler.crawl([BASE]))
+    return auditor, crawler
+
+
+SITE = {'': ['a', 'b'], 'a': ['b', 'c'], 'b': [''], 'c': ['a']}
+
+
+def test_each_url_is_audited_once():
+    links = dict(SITE, b=['', 'a#reviews', 'c?', 'C'])
+    auditor, crawler = crawl(links)
+    assert sorted(auditor.fetched) == [BASE, BASE + 'C', BASE + 'a', BASE + 'b', BASE + 'c']
+    assert sorted(page.url for page in crawler.results) == sorted(auditor.fetched)
+
+
+def test_only_same_host_html_links_are_followed():
+    links = {'': ['a', 'https://other.example/', 'brochure.pdf', 'logo.svg',
+                  'https://example.com:8443/']}
+    auditor, _ = crawl(links)
+    assert sorted(auditor.fetched) == [BASE, BASE + 'a']
+
+
+def test_links_beyond_max_depth_are_not_followed():
+    chain = {'': ['d1'], 'd1': ['d2'], 'd2': ['d3'], 'd3': ['d4']}
+    auditor, crawler = crawl(chain, max_depth=2)
+    assert auditor.fetched == [BASE, BASE + 'd1', BASE + 'd2']
+    assert [page.crawl_depth for page in crawler.results] == [0, 1, 2]
+
+
+def test_site_of_exactly_max_pages_is_not_cut_short():
+    auditor, crawler = crawl(SITE, max_pages=4)
+    stats = crawler.budget_stats()
+    assert len(auditor.fetched) == 4
+    assert stats['audited'] == 4
+    assert stats['skipped'] == 0
+    assert stats['stopped_by'] is None
+
+
+def test_refused_url_records_max_pages():
+    auditor, crawler = crawl(SITE, max_pages=3)
+    stats = crawler.budget_stats()
+    assert len(auditor.fetched) == 3
+    assert stats['skipped'] == 1
+    assert stats['stopped_by'] == 'max_pages'
+
+
+def test_failing_on_page_does_not_stall_the_crawl():
+    auditor = FakeAuditor(SITE)
+    recorded = []
+
+    def on_page(page):
+        recorded.append(page.url)
+        if page.url == BASE:
+            raise OSError('disk full')
+
+    crawler = SiteCrawler(auditor, max_depth=5, max_pages=10, on_page=on_page)
+    pages = asyncio.run(asyncio.wait_for(crawler.crawl([BASE]), timeout=5))
+    assert len(pages) == 4
+    assert len(recorded) == 4
+
+
+class AnalyzingAuditor(FakeAuditor):
+    """Fetches return response bodies, which go through the analysis stage"""
+
+    def __init__(self, links, fail=()):
+        super().__init__(links)
+        self.fail = fail
+        self.waiting = 0
+        self.most_waiting = 0
+
+    async def fetch_for_audit(self, url):
+        self.fetched.append(url)
+        self.waiting += 1
+        self.most_waiting = max(self.most_waiting, self.waiting)
+        return FetchResult(url, 200, {}, url.encode(), 0.0)
+
+    async def analyze_response(self, response):
+        await asyncio.sleep(0.01)
+        self.waiting -= 1
+        if response.url in self.fail:
+            raise ValueError('unparseable')
+        return response.content.decode()
+
+    def complete_page(self, url, response, analysis):
+        return SimpleNamespace(url=analysis, url_id=self.url_index.id_for(url), error=None)
+
+    def failed_page(self, url, error):
+        return SimpleNamespace(url=url, url_id=self.url_index.id_for(url), error=error)
+
+
+def test_fetched_bodies_are_analyzed_then_recorded():
+    links = {'': [f'p{n}' for n in range(20)]}
+    auditor = AnalyzingAuditor(links)
+    crawler = SiteCrawler(auditor, max_depth=5, concurrency=4, analyzers=2, queue_size=2)
+    pages = asyncio.run(asyncio.wait_for(crawler.crawl([BASE]), timeout=5))
+    assert sorted(page.url for page in pages) == sorted(auditor.fetched)
+    assert len(pages) == 21
+    # Bounded queues: a fetcher waits instead of piling up bodies
+    assert auditor.most_waiting <= 4 + 2 + 2
+
+
+def test_failed_analysis_records_the_page_as_failed():
+    auditor = AnalyzingAuditor(SITE, fail=(BASE + 'a',))
+    crawler = SiteCrawler(auditor, max_depth=5, analyzers=2)
+    pages = asyncio.run(asyncio.wait_for(crawler.crawl([BASE]), timeout=5))
+    errors = {page.url: page.error for page in pages}
+    assert errors == {BASE: None, BASE + 'a': 'unparseable', BASE + 'b': None}
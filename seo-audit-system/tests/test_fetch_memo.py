@@ -0,0 +1,49 @@
+import asyncio
+
+from audit_core.fetch_memo import FetchMemo
+from audit_core.fetching import FetchResult
+
+HTML = ('text/html',)
+LIMIT = 1024
+
+
+def fetcher(calls):
+    async def fetch(url):
+        calls.append(url)
+        await asyncio.sleep(0)
+        return FetchResult(url, 200, {}, b'<html></html>', 0.0)
+    return fetch
+
+
+def test_one_fetch_per_url_in_a_run():
+    memo = FetchMemo()
+    calls = []
+    fetch = fetcher(calls)
+
+    async def run():
+        # The page audit and the SSL check ask for the homepage concurrently
+        first = await asyncio.gather(
+            memo.fetch('https://example.com/', fetch, HTML, LIMIT),
+            memo.fetch('https://example.com/#main', fetch, HTML, LIMIT))
+        later = await memo.fetch('https://example.com/', fetch, HTML, LIMIT)
+        return first + [later]
+
+    responses = asyncio.run(run())
+    assert calls == ['https://example.com/']
+    assert all(response is responses[0] for response in responses)
+    assert memo.stats() == {'urls': 1, 'hits': 2, 'misses': 1}
+
+
+def test_body_released_across_option_sets():
+    memo = FetchMemo()
+    fetch = fetcher([])
+
+    async def run():
+        return (await memo.fetch('https://example.com/a', fetch, HTML, LIMIT),
+                await memo.fetch('https://example.com/a', fetch, None, LIMIT))
+
+    page, other = asyncio.run(run())
+    assert 'https://example.com/a' in memo
+    assert memo.peek('https://example.com/a') is page
+    memo.release_body('https://example.com/a')
+    assert page.content == b'' and other.content == b''
@@ -0,0 +1,189 @@
+import asyncio
+import gzip
+import os
+
+import aiohttp
+from aiohttp import web
+
+from audit_core.fetching import HTML_CONTENT_TYPES, accepts_content_type, fetch_async, read_limited
+from audit_core.http_cache import HTTPValidatorCache
+
+BODY = b'<html><title>fresh</title></html>'
+
+
+class EvictingCache(HTTPValidatorCache):
+    """Loses each entry between reading its validators and replaying it"""
+
+    def get(self, url):
+        return None
+
+
+def app_recording(requests):
+    async def handler(request):
+        requests.append(request.headers.get('If-None-Match'))
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=BODY, content_type='text/html', headers={'ETag': '"v1"'})
+
+    app = web.Application()
+    app.router.add_get('/', handler)
+    return app
+
+
+async def fetch_with_evicted_entry(cache):
+    requests = []
+    runner = web.AppRunner(app_recording(requests))
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    url = f"http://127.0.0.1:{runner.addresses[0][1]}/"
+    cache.store(url, 200, {'ETag': '"v1"'}, b'old')
+    try:
+        async with aiohttp.ClientSession() as session:
+            result = await fetch_async(session, url, cache=cache)
+    finally:
+        await runner.cleanup()
+    return result, requests
+
+
+def test_304_for_evicted_entry_is_fetched_again(tmp_path):
+    cache = EvictingCache(str(tmp_path / 'cache.sqlite'))
+    try:
+        result, requests = asyncio.run(fetch_with_evicted_entry(cache))
+    finally:
+        cache.close()
+    assert requests == ['"v1"', None]
+    assert result.status_code == 200
+    assert result.content == BODY
+
+
+def test_cache_stores_only_validated_200s(tmp_path):
+    cache = HTTPValidatorCache(str(tmp_path / 'cache.sqlite'))
+    try:
+        assert cache.store('https://example.com/a', 200, {'ETag': '"a"'}, b'a')
+        assert cache.store('https://example.com/b', 200, {'Last-Modified': 'Tue, 01 Oct 2024 00:00:00 GMT'}, b'b')
+        assert not cache.store('https://example.com/c', 200, {}, b'c')
+        assert not cache.store('https://example.com/d', 404, {'ETag': '"d"'}, b'd')
+        assert not cache.store('https://example.com/e', 200, {'ETag': '"e"', 'Cache-Control': 'no-store'}, b'e')
+
+        assert cache.conditional_headers('https://example.com/a') == {'If-None-Match': '"a"'}
+        assert cache.conditional_headers('https://example.com/b') == {
+            'If-Modified-Since': 'Tue, 01 Oct 2024 00:00:00 GMT'}
+        assert cache.conditional_headers('https://example.com/c') == {}
+        assert cache.get('https://example.com/a').body == b'a'
+    finally:
+        cache.close()
+
+
+def test_cache_evicts_least_recently_used(tmp_path, monkeypatch):
+    clock = iter(range(1000))
+    monkeypatch.setattr('audit_core.http_cache.time.time', lambda: next(clock))
+    bodies = {name: os.urandom(400) for name in 'abc'}
+    cache = HTTPValidatorCache(str(tmp_path / 'cache.sqlite'), max_bytes=1000)
+    try:
+        cache.store('https://example.com/a', 200, {'ETag': '"a"'}, bodies['a'])
+        cache.store('https://example.com/b', 200, {'ETag': '"b"'}, bodies['b'])
+        cache.get('https://example.com/a')
+        cache.store('https://example.com/c', 200, {'ETag': '"c"'}, bodies['c'])
+        assert cache.get('https://example.com/b') is None
+        assert cache.get('https://example.com/a').body == bodies['a']
+        assert cache.get('https://example.com/c').body == bodies['c']
+    finally:
+        cache.close()
+
+
+def test_read_limited_stops_at_the_cap():
+    assert read_limited([b'abc', b'def'], None) == (b'abcdef', False)
+    assert read_limited([b'abc', b'def'], 6) == (b'abcdef', False)
+    assert read_limited([b'abc', b'def', b'ghi'], 4) == (b'abcd', True)
+    assert read_limited(iter(()), 4) == (b'', False)
+
+
+def test_content_type_filter_compares_media_types():
+    assert accepts_content_type({'content-type': 'text/html; charset=utf-8'}, HTML_CONTENT_TYPES)
+    assert accepts_content_type({'content-type': 'Application/XHTML+XML'}, HTML_CONTENT_TYPES)
+    assert not accepts_content_type({'content-type': 'application/pdf'}, HTML_CONTENT_TYPES)
+    # Unlabelled responses are read, and no filter accepts everything
+    assert accepts_content_type({}, HTML_CONTENT_TYPES)
+    assert accepts_content_type({'content-type': 'application/pdf'}, None)
+
+
+def capped_app():
+    big = b'<html>' + b'x' * 100_000 + b'</html>'
+
+    async def stream(request):
+        response = web.StreamResponse(headers={'Content-Type': request.match_info['type'].replace('-', '/'),
+                                               'ETag': '"big"'})
+        await response.prepare(request)
+        for start in range(0, len(big), 10_000):
+            await response.write(big[start:start + 10_000])
+        await response.write_eof()
+        return response
+
+    async def bomb(request):
+        # 50 MB of zeros, about 50 KB on the wire
+        body = gzip.compress(b'\0' * (50 * 1024 * 1024))
+        return web.Response(body=body, headers={'Content-Type': 'text/html',
+                                                'Content-Encoding': 'gzip'})
+
+    app = web.Application()
+    app.router.add_get('/bomb', bomb)
+    app.router.add_get('/{type}', stream)
+    return app
+
+
+def fetch_capped(serve, tmp_path, paths):
+    cache = HTTPValidatorCache(str(tmp_path / 'cache.sqlite'))
+
+    async def run():
+        async with serve(capped_app()) as base_url:
+            async with aiohttp.ClientSession() as session:
+                results = {}
+                for path in paths:
+                    results[path] = await fetch_async(session, base_url + path, cache=cache,
+                                                      max_bytes=20_000, content_types=HTML_CONTENT_TYPES)
+                stored = {path: cache.get(base_url + path) is not None for path in paths}
+                return results, stored
+
+    try:
+        results, stored = asyncio.run(run())
+    finally:
+        cache.close()
+    return results, stored
+
+
+def test_body_cap_truncates_and_skips_other_types(serve, tmp_path):
+    results, stored = fetch_capped(serve, tmp_path, ['/text-html', '/application-pdf', '/bomb'])
+    page = results['/text-html']
+    assert len(page.content) == 20_000 and page.truncated and not page.body_skipped
+    other = results['/application-pdf']
+    assert other.content == b'' and other.body_skipped and not other.truncated
+    assert other.status_code == 200
+    bomb = results['/bomb']
+    assert len(bomb.content) == 20_000 and bomb.truncated
+    # Partial bodies must never be replayed on a later 304
+    assert stored == {'/text-html': False, '/application-pdf': False, '/bomb': False}
+
+
+def test_audit_records_truncated_and_headers_only_pages(technical_audit, audit_config, serve,
+                                                        site_app, page_html):
+    pages = {
+        '/': page_html('Home page of the body cap test site', ['/feed/'],
+                       body='filler ' * 2000),
+        '/feed/': lambda request: web.Response(text='{"items": []}', content_type='application/json'),
+    }
+    audit_config['general']['max_body_bytes'] = 4096
+
+    async def run():
+        async with serve(site_app(pages)) as base_url:
+            auditor = technical_audit.TechnicalSEOAuditor(base_url, audit_config)
+            async with auditor.client_session():
+                return {path: await auditor.audit_url(base_url + path) for path in ('/', '/feed/')}
+
+    records = asyncio.run(run())
+    home = records['/']
+    assert home.truncated and home.content_length == 4096
+    assert home.meta_tags['title'] == 'Home page of the body cap test site'
+    feed = records['/feed/']
+    assert feed.status_code == 200 and feed.content_type.startswith('application/json')
+    assert feed.meta_tags is None and not feed.truncated
@@ -0,0 +1,106 @@
+import asyncio
+import shutil
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlparse
+
+from aiohttp import web
+
+from audit_core.incremental import PreviousRun
+from audit_core.result_stream import ResultStreamWriter
+from audit_core.sitemaps import SitemapURL
+
+
+def previous_run(path, records):
+    writer = ResultStreamWriter(str(path / 'previous'))
+    for record in records:
+        writer.write(record)
+    return PreviousRun.load(writer.close({'base_url': 'https://example.com'}))
+
+
+def test_previous_run_keeps_only_successful_pages(tmp_path):
+    previous = previous_run(tmp_path, [
+        {'url': 'https://example.com/a', 'status_code': 200, 'body_hash': 'x',
+         'link_graph': {'pagerank': 0.5}},
+        {'url': 'https://example.com/gone', 'status_code': 404},
+        {'url': 'https://example.com/down', 'error': 'timeout'},
+    ])
+    assert previous.stats['loaded'] == 1
+    assert previous.get('https://example.com/a') == {
+        'url': 'https://example.com/a', 'status_code': 200, 'body_hash': 'x'}
+    assert previous.get('https://example.com/gone') is None
+
+
+def test_sitemap_lastmod_before_the_previous_audit_means_unchanged():
+    record = {'timestamp': '2026-03-01T12:00:00'}
+    assert PreviousRun.unchanged_since(record, '2026-02-28')
+    assert not PreviousRun.unchanged_since(record, '2026-03-02T00:00:00')
+    assert not PreviousRun.unchanged_since(record, None)
+    assert not PreviousRun.unchanged_since({}, '2026-02-28')
+
+
+def test_unchanged_pages_are_reused(technical_audit, audit_config, serve, site_app, page_html):
+    hits = Counter()
+    version = {'b': 1}
+    home = page_html('Home page of the incremental test site', ['/a/', '/b/'])
+
+    def with_etag(request):
+        if request.headers.get('If-None-Match') == '"home"':
+            return web.Response(status=304, headers={'ETag': '"home"'})
+        return web.Response(text=home, content_type='text/html', headers={'ETag': '"home"'})
+
+    pages = {
+        '/': with_etag,
+        '/a/': page_html('Static page A of the incremental test site', ['/']),
+        '/b/': lambda request: web.Response(
+            text=page_html(f'Page B of the incremental test site, version {version["b"]}', ['/']),
+            content_type='text/html'),
+    }
+
+    async def run():
+        async with serve(site_app(pages, hits)) as base_url:
+            auditor = technical_audit.TechnicalSEOAuditor(base_url, audit_config)
+            await asyncio.wait_for(auditor.run_full_audit(), timeout=60)
+            # Results are named by the second, so keep the first run's apart
+            shutil.move('reports', 'previous')
+            Path('reports').mkdir()
+            audit_config['incremental']['previous_results'] = str(next(Path('previous').glob('*.json')))
+
+            version['b'] = 2
+            auditor = technical_audit.TechnicalSEOAuditor(base_url, audit_config)
+            return await asyncio.wait_for(auditor.run_full_audit(incremental=True), timeout=60)
+
+    results = asyncio.run(run())
+    pages_by_path = {urlparse(page.url).path: page for page in results['pages']}
+    assert {path: page.reused for path, page in pages_by_path.items()} == {
+        '/': 'not_modified', '/a/': 'body_hash', '/b/': None}
+    assert pages_by_path['/b/'].meta_tags['title'].endswith('version 2')
+    assert results['incremental']['reused'] == 2
+    assert results['incremental']['reaudited'] == 1
+
+
+def test_sitemap_lastmod_reuse_skips_the_request(technical_audit, audit_config, serve, site_app,
+                                                 page_html, tmp_path):
+    hits = Counter()
+    pages = {'/a/': page_html('Page A of the incremental test site')}
+
+    async def run():
+        async with serve(site_app(pages, hits)) as base_url:
+            url = base_url + '/a/'
+            auditor = technical_audit.TechnicalSEOAuditor(base_url, audit_config)
+            async with auditor.client_session():
+                record = (await auditor.audit_url(url)).to_dict(auditor.url_index)
+            record['timestamp'] = '2026-03-01T12:00:00'
+            previous = previous_run(tmp_path, [record])
+
+            reused = {}
+            for lastmod in ('2026-02-01', '2026-04-01'):
+                auditor = technical_audit.TechnicalSEOAuditor(base_url, audit_config)
+                auditor.previous_run = previous
+                auditor.sitemap_entries[auditor.url_index.id_for(url)] = SitemapURL(url, lastmod)
+                async with auditor.client_session():
+                    reused[lastmod] = (await auditor.audit_url(url)).reused
+            return reused
+
+    assert asyncio.run(run()) == {'2026-02-01': 'sitemap_lastmod', '2026-04-01': 'body_hash'}
+    assert hits == Counter({('GET', '/a/'): 2})
@@ -0,0 +1,61 @@
+from array import array
+
+import pytest
+
+from audit_core import issues
+from audit_core.issues import ISSUES, IssueList, IssueRegistry, summarize_issues
+
+
+def test_codes_are_unique_and_grouped_by_category():
+    prefixes = {'meta_tags': 1, 'header_structure': 2, 'internal_links': 3,
+                'mobile_friendliness': 4, 'schema_markup': 5}
+    for code, issue_type in ISSUES.types.items():
+        assert code // 100 == prefixes[issue_type.category]
+    assert ISSUES[302] is issues.BROKEN_LINKS
+
+
+def test_register_rejects_duplicates_and_unknown_severities():
+    registry = IssueRegistry()
+    registry.register(1, 'one', 'cat', issues.WARNING, "One")
+    with pytest.raises(ValueError):
+        registry.register(1, 'again', 'cat', issues.WARNING, "Again")
+    with pytest.raises(ValueError):
+        registry.register(2, 'two', 'cat', 'fatal', "Two")
+
+
+def test_messages_map_back_to_their_codes():
+    message = issues.TITLE_TOO_LONG.message(length=80, maximum=60)
+    assert message == "Title too long (80 chars, max: 60)"
+    assert ISSUES.code_for_message(message) == 103
+    assert ISSUES.code_for_message(message, 'meta_tags') == 103
+    assert ISSUES.code_for_message(message, 'header_structure') == 0
+    assert ISSUES.code_for_message("Something nobody reports") == 0
+    # Templates are matched whole, not by prefix
+    assert ISSUES.code_for_message("Missing title tag and more") == 0
+
+
+def test_issue_list_keeps_codes_next_to_messages():
+    found = IssueList()
+    found.add(issues.H1_MULTIPLE, count=2)
+    found.add(issues.HEADER_LEVEL_SKIPPED, tag='H4', previous=2)
+    assert found == ["Multiple H1 tags found (2)", "Header hierarchy skip: H4 after H2"]
+    assert found.codes.tolist() == [202, 203]
+
+
+def test_summary_counts_issues_and_affected_pages():
+    pages = [array('H', [101, 104, 301, 301]), array('H', [301]), array('H'), array('H', [999])]
+    summary = summarize_issues(pages)
+    assert summary['total_issues'] == 6
+    assert summary['by_severity'] == {issues.WARNING: 3, issues.CRITICAL: 2}
+    assert summary['by_category']['internal_links'] == 3
+    assert summary['by_category']['meta_tags'] == 2
+    top = summary['issues'][0]
+    assert (top['code'], top['name'], top['count'], top['pages']) == (301, 'generic_anchor_text', 3, 2)
+    unknown = next(issue for issue in summary['issues'] if issue['code'] == 999)
+    assert unknown['name'] == 'unknown' and unknown['severity'] is None
+
+
+def test_summary_of_no_pages_is_empty():
+    summary = summarize_issues([])
+    assert summary['total_issues'] == 0
+    assert summary['issues'] == []
@@ -0,0 +1,80 @@
+import asyncio
+from collections import Counter
+
+import aiohttp
+from aiohttp import web
+
+from audit_core.link_checker import LinkChecker, LinkStatusCache, is_broken
+
+
+def link_app(hits):
+    async def handle(request):
+        hits[(request.method, request.path)] += 1
+        if request.path == '/ok':
+            return web.Response(text='ok')
+        if request.path == '/no-head':
+            if request.method == 'HEAD':
+                return web.Response(status=405)
+            return web.Response(text='ok')
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_route('*', '/{path:.*}', handle)
+    return app
+
+
+def check(serve, paths, known_paths=()):
+    hits = Counter()
+
+    async def run():
+        async with serve(link_app(hits)) as base_url:
+            async with aiohttp.ClientSession() as session:
+                checker = LinkChecker(session, concurrency=4)
+                statuses = await checker.check_all([base_url + path for path in paths],
+                                                   known={base_url + path: 200 for path in known_paths})
+                return {url[len(base_url):]: status for url, status in statuses.items()}, checker.stats
+
+    statuses, stats = asyncio.run(run())
+    return statuses, stats, hits
+
+
+def test_each_unique_target_is_checked_once(serve):
+    statuses, stats, hits = check(serve, ['/ok', '/ok', '/gone', '/page', '/no-head'], known_paths=['/page'])
+    assert statuses == {'/ok': 200, '/gone': 404, '/page': 200, '/no-head': 200}
+    assert hits == Counter({('HEAD', '/ok'): 1, ('HEAD', '/gone'): 1, ('HEAD', '/no-head'): 1,
+                            ('GET', '/no-head'): 1})
+    assert stats == {'unique': 4, 'known': 1, 'cached': 0, 'checked': 3, 'get_fallbacks': 1}
+
+
+def test_cached_statuses_are_reused_within_their_ttl(serve, tmp_path):
+    hits = Counter()
+    path = str(tmp_path / 'links.sqlite')
+
+    async def run():
+        async with serve(link_app(hits)) as base_url:
+            urls = [base_url + '/ok', base_url + '/gone']
+            async with aiohttp.ClientSession() as session:
+                stats = []
+                for ttl in (3600, 3600, 0):
+                    cache = LinkStatusCache(path, ttl=ttl)
+                    try:
+                        checker = LinkChecker(session, cache=cache)
+                        await checker.check_all(urls)
+                    finally:
+                        cache.close()
+                    stats.append((checker.stats['cached'], checker.stats['checked']))
+                return stats
+
+    # The second run reads both statuses from the cache; with no TTL left they are checked again
+    assert asyncio.run(run()) == [(0, 2), (2, 0), (0, 2)]
+    assert hits[('HEAD', '/ok')] == 2
+
+
+def test_unreachable_links_are_broken(serve):
+    async def run():
+        async with aiohttp.ClientSession() as session:
+            return await LinkChecker(session, timeout=2).check('http://127.0.0.1:1/')
+
+    status = asyncio.run(run())
+    assert status == 0 and is_broken(status)
+    assert not is_broken(301) and is_broken(404)
@@ -0,0 +1,17 @@
+import numpy as np
+
+from audit_core.link_graph import LinkGraph
+
+
+def test_from_url_ids_keeps_only_linked_and_listed_ids():
+    # URL IDs 1..4 are assets and external URLs that never enter the graph
+    graph, url_ids = LinkGraph.from_url_ids([(0, 5), (5, 7), (7, 0)], nodes=[0, 9])
+    assert url_ids.tolist() == [0, 5, 7, 9]
+    assert graph.num_nodes == 4
+    assert graph.num_edges == 3
+    rank = graph.pagerank()
+    assert np.isclose(rank.sum(), 1.0)
+    # The three pages in the cycle share rank equally; the isolated page gets the least
+    assert np.allclose(rank[:3], rank[0])
+    assert rank[3] < rank[0]
+    assert graph.click_depth(0).tolist() == [0, 1, 2, -1]
@@ -0,0 +1,69 @@
+import os
+import random
+import subprocess
+import sys
+
+from audit_core.near_duplicates import NearDuplicateIndex, hamming, simhash
+
+TEXT = ' '.join(f'Screen repair service number {n} for phones and tablets in Dallas.' for n in range(40))
+
+
+def test_near_duplicate_pages_are_found():
+    index = NearDuplicateIndex(max_distance=3)
+    index.add('https://example.com/a/', TEXT)
+    near = index.add('https://example.com/b/', TEXT.replace('Dallas.', 'Dallas!', 1) + ' Call today.')
+    other = index.add('https://example.com/c/', 'A completely different article about gardening ' * 20)
+    exact = index.add('https://example.com/d/', TEXT)
+
+    assert [match['url'] for match in near['near_duplicates']] == ['https://example.com/a/']
+    assert not near['is_duplicate']
+    assert other['near_duplicates'] == []
+    assert exact['is_duplicate'] and exact['duplicate_of'] == 'https://example.com/a/'
+    assert index.clusters() == [{'size': 3, 'urls': ['https://example.com/a/', 'https://example.com/b/',
+                                                      'https://example.com/d/']}]
+
+
+def test_lsh_finds_every_pair_a_full_comparison_would():
+    rng = random.Random(7)
+    fingerprints = []
+    for _ in range(60):
+        base = rng.getrandbits(64)
+        fingerprints.append(base)
+        for flips in (1, 3, 4):
+            variant = base
+            for bit in rng.sample(range(64), flips):
+                variant ^= 1 << bit
+            fingerprints.append(variant)
+
+    index = NearDuplicateIndex(max_distance=3)
+    found = set()
+    for doc_id, fingerprint in enumerate(fingerprints):
+        result = index.add_fingerprint(str(doc_id), str(doc_id), fingerprint)
+        found.update((int(match['url']), doc_id) for match in result['near_duplicates'])
+
+    expected = {(i, j) for j in range(len(fingerprints)) for i in range(j)
+                if hamming(fingerprints[i], fingerprints[j]) <= 3}
+    assert found == expected
+
+
+def test_fingerprints_persist_between_runs(tmp_path):
+    path = str(tmp_path / 'fingerprints.json')
+    first = NearDuplicateIndex(path=path)
+    first.add('https://example.com/a/', TEXT)
+    first.add('https://example.com/b/', 'Old text for page b ' * 10)
+    first.save()
+
+    second = NearDuplicateIndex(path=path)
+    assert second.changed_last_run('https://example.com/a/') is True
+    assert second.add('https://example.com/a/', TEXT)['changed_since_last_run'] is False
+    assert second.add('https://example.com/b/', 'New text for page b ' * 10)['changed_since_last_run'] is True
+    assert second.add('https://example.com/new/', TEXT)['changed_since_last_run'] is None
+
+
+def test_simhash_is_stable_across_processes():
+    # BLAKE2b shingle hashes, not the builtin hash() that is salted per process
+    sentence = 'the quick brown fox jumps over the lazy dog'
+    script = f"from audit_core.near_duplicates import simhash; print(simhash({sentence!r}))"
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True,
+                            env=dict(os.environ, PYTHONHASHSEED='12345', PYTHONPATH=os.pathsep.join(sys.path)))
+    assert int(output.stdout) == simhash(sentence)
@@ -0,0 +1,80 @@
+import socket
+from urllib.parse import urlparse
+
+import pytest
+
+from audit_core.offline import (astro_site_url, iter_build_files, path_to_url, read_local_sitemaps,
+                                read_mapped, url_to_path)
+
+SITE = 'https://example.com'
+
+
+@pytest.fixture
+def build_dir(tmp_path, page_html):
+    """A small Astro-style dist/ directory"""
+    dist = tmp_path / 'dist'
+    files = {
+        'index.html': page_html('Home page of the offline test build', ['/about/', '/blog/post', '/missing/']),
+        'about/index.html': page_html('About page of the offline test build', ['/']),
+        'blog/post.html': page_html('A blog post in the offline test build', ['/', '/about/']),
+        '404.html': page_html('Page not found in the offline test build'),
+        'robots.txt': f'User-agent: *\nAllow: /\nSitemap: {SITE}/sitemap-index.xml\n',
+        'sitemap-index.xml': ('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                              f'<sitemap><loc>{SITE}/sitemap-0.xml</loc></sitemap></sitemapindex>'),
+        'sitemap-0.xml': ('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                          f'<url><loc>{SITE}/</loc></url><url><loc>{SITE}/about/</loc></url>'
+                          f'<url><loc>{SITE}/orphan/</loc></url></urlset>'),
+        'empty.html': '',
+    }
+    for name, content in files.items():
+        path = dist / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return dist
+
+
+def test_build_files_map_to_the_urls_they_are_served_at(build_dir):
+    paths = iter_build_files(build_dir)
+    urls = [path_to_url(build_dir, path, SITE + '/') for path in paths]
+    assert urls == [f'{SITE}/404', f'{SITE}/about/', f'{SITE}/blog/post', f'{SITE}/empty', f'{SITE}/']
+    for path, url in zip(paths, urls):
+        assert url_to_path(build_dir, url) == path
+    assert url_to_path(build_dir, f'{SITE}/about') == build_dir / 'about' / 'index.html'
+    assert url_to_path(build_dir, f'{SITE}/missing/') is None
+
+
+def test_read_mapped_handles_empty_files(build_dir):
+    assert read_mapped(build_dir / 'empty.html') == b''
+    assert read_mapped(build_dir / 'index.html').startswith(b'<html>')
+
+
+def test_astro_site_url_is_read_from_the_config(tmp_path):
+    assert astro_site_url(tmp_path) is None
+    (tmp_path / 'astro.config.mjs').write_text(
+        "export default defineConfig({\n  site: 'https://example.com/',\n  integrations: []\n});\n")
+    assert astro_site_url(tmp_path) == SITE
+
+
+def test_local_sitemap_indexes_resolve_to_build_files(build_dir):
+    entries, found, issues = read_local_sitemaps(build_dir, SITE)
+    assert [entry.loc for entry in entries] == [f'{SITE}/', f'{SITE}/about/', f'{SITE}/orphan/']
+    assert found == [f'{SITE}/sitemap-index.xml', f'{SITE}/sitemap-0.xml']
+    assert issues == []
+
+
+def test_offline_audit_needs_no_network(technical_audit, audit_config, build_dir, monkeypatch):
+    def no_network(*args, **kwargs):
+        raise AssertionError('offline audits must not open connections')
+
+    monkeypatch.setattr(socket, 'create_connection', no_network)
+    monkeypatch.setattr(socket.socket, 'connect', no_network)
+    audit_config['offline']['workers'] = 1
+
+    auditor = technical_audit.TechnicalSEOAuditor(SITE, audit_config)
+    results = auditor.run_offline_audit(str(build_dir))
+
+    paths = sorted(urlparse(page.url).path for page in results['pages'])
+    assert paths == ['/', '/404', '/about/', '/blog/post', '/empty']
+    assert results['sitemap']['total_urls'] == 3
+    assert results['link_check']['broken_links'] == {f'{SITE}/missing/': 404}
+    assert results['sitemap_coverage']['orphans']['urls'] == [f'{SITE}/orphan/']
@@ -0,0 +1,53 @@
+from audit_core.page_facts import extract_page_facts
+
+PAGE = b'''<!doctype html>
+<html><head>
+<title> Phone Repair </title><title>Second title</title>
+<meta name="Description" content=" Fast repairs ">
+<meta name="description" content="ignored duplicate">
+<meta name="twitter:card" content="summary">
+<meta property="og:title" content="OG title">
+<link rel="alternate stylesheet" href="/a.css">
+<link rel="Canonical" href=" https://example.com/repair/ ">
+<script type="application/ld+json">{"@type": "Organization"}</script>
+</head><body>
+<h1>Repairs</h1><h3>Screens</h3>
+<div itemscope itemtype="https://schema.org/Product">
+  <span itemprop="name">Screen</span>
+  <div itemprop="offers" itemscope itemtype="https://schema.org/Offer">
+    <meta itemprop="price" content="99">
+  </div>
+</div>
+<div typeof="LocalBusiness"></div>
+<a href=" /contact/ " title="Contact" rel="nofollow noopener" target="_blank">Contact us</a>
+<a name="anchor-only">x</a>
+<img src="a.png"><img src="b.png" srcset="b2.png 2x">
+</body></html>'''
+
+
+def test_one_pass_collects_every_fact():
+    facts = extract_page_facts(PAGE)
+    assert facts.title == 'Phone Repair'
+    assert facts.meta_names['description'] == 'Fast repairs'
+    assert facts.twitter_tags == {'twitter:card': 'summary'}
+    assert facts.og_tags == {'og:title': 'OG title'}
+    assert facts.canonical == 'https://example.com/repair/'
+    assert facts.headers == [('h1', 'Repairs'), ('h3', 'Screens')]
+    assert facts.json_ld == ['{"@type": "Organization"}']
+    assert facts.rdfa == ['LocalBusiness']
+    assert facts.links == [('/contact/', 'Contact us', 'Contact', ['nofollow', 'noopener'], '_blank')]
+    assert facts.anchor_count == 2
+    assert (facts.image_count, facts.responsive_image_count) == (2, 1)
+    assert 'Contact us' in facts.text
+
+
+def test_itemprops_belong_to_every_open_item():
+    product, offer = extract_page_facts(PAGE).microdata
+    assert product == ('https://schema.org/Product', {'name': 'Screen', 'offers': '', 'price': '99'})
+    assert offer == ('https://schema.org/Offer', {'price': '99'})
+
+
+def test_empty_documents_give_empty_facts():
+    for content in (b'', b' \n '):
+        facts = extract_page_facts(content)
+        assert facts.title is None and facts.links == [] and facts.text == ''
@@ -0,0 +1,49 @@
+import asyncio
+import time
+
+from audit_core.politeness import HostScheduler, TokenBucket
+
+
+def test_bucket_spaces_reservations_by_its_interval():
+    bucket = TokenBucket(rate=10.0)
+    delays = [bucket.reserve() for _ in range(3)]
+    assert delays[0] == 0.0
+    assert 0.09 < delays[1] <= 0.1
+    assert 0.19 < delays[2] <= 0.2
+
+
+def test_crawl_delay_only_slows_a_host_down():
+    scheduler = HostScheduler(delay=1.0)
+    scheduler.set_crawl_delay('Example.com', 5)
+    scheduler.set_crawl_delay('other.example', 0.5)
+    assert scheduler.interval_for('example.com') == 5.0
+    assert scheduler.interval_for('other.example') == 1.0
+    assert scheduler.interval_for('third.example') == 1.0
+
+
+def test_hosts_are_rate_limited_independently():
+    scheduler = HostScheduler(delay=0.2)
+    scheduler.reserve('https://a.example/1')
+    assert scheduler.reserve('https://a.example/2') > 0.1
+    assert scheduler.reserve('https://b.example/1') == 0.0
+
+
+def test_slot_caps_concurrent_requests_per_host():
+    scheduler = HostScheduler(delay=0, max_per_host=2)
+    active = {'a.example': 0, 'b.example': 0}
+    peak = dict(active)
+
+    async def request(host):
+        async with scheduler.slot(f'https://{host}/'):
+            active[host] += 1
+            peak[host] = max(peak[host], active[host])
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+
+    async def run():
+        await asyncio.gather(*(request(host) for host in active for _ in range(6)))
+
+    start = time.monotonic()
+    asyncio.run(run())
+    assert peak == {'a.example': 2, 'b.example': 2}
+    assert time.monotonic() - start < 1
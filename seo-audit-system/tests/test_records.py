@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+from audit_core import issues
+from audit_core.records import HeaderAnalysis, LinkAnalysis, PageRecord
+from audit_core.url_index import URLIndex
+
+
+def sample_record(url_index):
+    record = PageRecord(url_index.id_for('https://example.com/a'), 'https://example.com/a')
+    record.status_code = 200
+    record.response_time = 0.25
+    record.content_type = 'text/html'
+    record.content_length = 1234
+    record.timestamp = '2026-01-01T00:00:00'
+    record.redirect_history = ('https://example.com/old',)
+    record.final_url = 'https://example.com/a'
+    record.meta_tags = {'title': 'A', 'issues': issues.IssueList()}
+    record.meta_tags['issues'].add(issues.TITLE_TOO_SHORT, length=1, minimum=30)
+    record.header_structure = HeaderAnalysis([('h1', 'A'), ('h3', 'Skipped')])
+    record.header_structure.issues.add(issues.HEADER_LEVEL_SKIPPED, tag='H3', previous=1)
+
+    links = LinkAnalysis()
+    for target in ('https://example.com/b', 'https://example.com/c'):
+        links.links.add(url_index.id_for(target), True, 'read more', '', ['nofollow'], '')
+    links.total_links = links.internal_links = 2
+    links.anchor_text_analysis = {'read more': 2}
+    links.issues.add(issues.GENERIC_ANCHOR_TEXT, text='read more')
+    record.internal_links = links
+    record.crawl_depth = 1
+    record.body_hash = 'abc'
+    record.collect_issue_codes()
+    return record
+
+
+def test_records_have_no_instance_dict():
+    record = PageRecord(0, 'https://example.com/')
+    for obj in (record, LinkAnalysis(), HeaderAnalysis([])):
+        assert not hasattr(obj, '__dict__')
+    with pytest.raises(AttributeError):
+        record.unknown_field = 1
+
+
+def test_issue_codes_are_collected_from_the_sections():
+    record = sample_record(URLIndex())
+    assert sorted(record.issue_codes) == [102, 203, 301]
+
+
+def test_to_dict_round_trips_through_json():
+    url_index = URLIndex()
+    data = json.loads(json.dumps(sample_record(url_index).to_dict(url_index)))
+    assert data['internal_links']['links'][0] == {
+        'url': 'https://example.com/b', 'anchor_text': 'read more', 'is_internal': True,
+        'title': '', 'rel': ['nofollow'], 'target': ''}
+    assert data['header_structure']['h1_text'] == ['A']
+
+    fresh_index = URLIndex()
+    restored = PageRecord.from_dict(data, fresh_index)
+    assert restored.to_dict(fresh_index) == data
+    assert restored.redirect_history == ('https://example.com/old',)
+    assert fresh_index.urls_for(restored.internal_links.links.ids()) == [
+        'https://example.com/b', 'https://example.com/c']
+
+
+def test_codes_are_recovered_for_records_written_without_them():
+    url_index = URLIndex()
+    data = sample_record(url_index).to_dict(url_index)
+    del data['issue_codes']
+    restored = PageRecord.from_dict(data, url_index)
+    assert sorted(restored.issue_codes) == [102, 203, 301]
+
+
+def test_failed_records_serialize_as_the_error():
+    url_index = URLIndex()
+    record = PageRecord.failed(url_index, 'https://example.com/x', 'timeout')
+    record.crawl_depth = 2
+    data = record.to_dict(url_index)
+    assert data == {'url': 'https://example.com/x', 'error': 'timeout', 'crawl_depth': 2}
+    assert not PageRecord.from_dict(data, url_index).ok
+
+
+def test_add_issue_updates_section_and_record_codes():
+    url_index = URLIndex()
+    record = sample_record(url_index)
+    record.add_issue(record.internal_links.issues, issues.BROKEN_LINKS, count=3)
+    assert record.internal_links.issues[-1] == '3 broken links'
+    assert record.internal_links.issues.codes[-1] == 302
+    assert record.issue_codes[-1] == 302
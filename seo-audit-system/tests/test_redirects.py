@@ -0,0 +1,82 @@
+import asyncio
+
+import aiohttp
+from aiohttp import web
+
+from audit_core.redirects import RedirectAnalyzer, url_variants
+
+
+def redirect(location, status=301):
+    return lambda request: web.Response(status=status, headers={'Location': location})
+
+
+def analyze(serve, site_app, pages, urls, max_hops=10):
+    async def run():
+        async with serve(site_app(pages)) as base_url:
+            async with aiohttp.ClientSession() as session:
+                analyzer = RedirectAnalyzer(session, max_hops=max_hops)
+                chains = {path: await analyzer.follow(base_url + path) for path in urls}
+                summary = await analyzer.analyze([base_url + path for path in urls],
+                                                 host_variants=False)
+                return base_url, chains, summary
+
+    return asyncio.run(run())
+
+
+def test_url_variants_cover_scheme_host_and_trailing_slash():
+    variants = url_variants('https://example.com/docs/')
+    assert variants == ['http://example.com/docs/', 'http://www.example.com/docs/',
+                        'https://www.example.com/docs/', 'https://example.com/docs']
+    assert url_variants('https://www.example.com/') == [
+        'http://www.example.com/', 'http://example.com/', 'https://example.com/']
+
+
+def test_url_variants_skip_host_twins_for_local_hosts():
+    assert url_variants('http://127.0.0.1:8080/a', host_variants=True) == [
+        'https://127.0.0.1:8080/a', 'http://127.0.0.1:8080/a/']
+    assert url_variants('http://localhost/a/', host_variants=False) == ['http://localhost/a']
+
+
+def test_every_hop_of_a_chain_is_recorded(serve, site_app):
+    pages = {'/a': redirect('/b'), '/b': redirect('/c/', status=302), '/c/': '<html></html>'}
+    base_url, chains, _ = analyze(serve, site_app, pages, ['/a'])
+    chain = chains['/a']
+    assert [(hop['url'], hop['status']) for hop in chain['hops']] == [
+        (base_url + '/a', 301), (base_url + '/b', 302), (base_url + '/c/', 200)]
+    assert chain['redirect_count'] == 2
+    assert chain['final_url'] == base_url + '/c/'
+    assert chain['final_status'] == 200
+    assert not chain['loop'] and not chain['too_many_hops'] and chain['error'] is None
+
+
+def test_loops_and_overlong_chains_are_flagged(serve, site_app):
+    pages = {'/loop-a': redirect('/loop-b'), '/loop-b': redirect('/loop-a'),
+             '/1': redirect('/2'), '/2': redirect('/3'), '/3': redirect('/4'), '/4': '<html></html>'}
+    _, chains, _ = analyze(serve, site_app, pages, ['/loop-a', '/1'], max_hops=2)
+    assert chains['/loop-a']['loop']
+    assert chains['/1']['too_many_hops']
+    assert not chains['/1']['loop']
+
+
+def test_analyze_reports_multi_hop_and_broken_variants(serve, site_app):
+    # The trailing-slash twins of /page and /old are probed, not the URLs themselves
+    pages = {'/page/': redirect('/page-tmp'), '/page-tmp': redirect('/page'),
+             '/page': '<html></html>', '/old/': redirect('/missing')}
+    _, _, summary = analyze(serve, site_app, pages, ['/page', '/old'])
+    assert summary['variants_probed'] == 2
+    assert summary['redirected'] == 2
+    assert summary['multi_hop_chains'] == 1
+    assert summary['broken_chains'] == 1
+    assert summary['worst_chains'][0]['start_url'].endswith('/page/')
+    assert any('2 hops' in issue for issue in summary['issues'])
+    assert any('final status 404' in issue for issue in summary['issues'])
+
+
+def test_head_is_retried_as_get_when_not_allowed(serve, site_app):
+    def no_head(request):
+        if request.method == 'HEAD':
+            return web.Response(status=405)
+        return web.Response(status=301, headers={'Location': '/target'})
+
+    _, chains, _ = analyze(serve, site_app, {'/a': no_head, '/target': '<html></html>'}, ['/a'])
+    assert [hop['status'] for hop in chains['/a']['hops']] == [301, 200]
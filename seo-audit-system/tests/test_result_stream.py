@@ -0,0 +1,31 @@
+from audit_core.result_stream import LazyPages, ResultStreamWriter, home_page, load_results
+
+
+def write_results(tmp_path, urls):
+    writer = ResultStreamWriter(str(tmp_path / 'technical_audit'), compression='gzip')
+    for url in urls:
+        writer.write({'url': url, 'meta_tags': {'issues': []}})
+    writer.annotate('https://example.com/', {'link_graph': {'pagerank': 0.5}})
+    return writer.close({'base_url': 'https://example.com', 'pages': []})
+
+
+def test_home_page_found_by_url_not_position(tmp_path):
+    # Reused pages finish before the fetched homepage in incremental runs
+    results = load_results(write_results(tmp_path, ['https://example.com/p210/',
+                                                    'https://example.com/']))
+    page = home_page(results)
+    assert page['url'] == 'https://example.com/'
+    assert page['link_graph'] == {'pagerank': 0.5}
+
+
+def test_lazy_pages_counts_in_the_annotation_pass(tmp_path):
+    path = write_results(tmp_path, ['https://example.com/', 'https://example.com/a/'])
+    pages = load_results(path)['pages']
+    assert isinstance(pages, LazyPages)
+    assert len(pages) == 2 and pages
+    assert [page['url'] for page in pages] == ['https://example.com/', 'https://example.com/a/']
+
+
+def test_home_page_missing(tmp_path):
+    results = load_results(write_results(tmp_path, ['https://example.com/a/']))
+    assert home_page(results) is None
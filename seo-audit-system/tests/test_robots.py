@@ -0,0 +1,29 @@
+import asyncio
+
+from aiohttp import web
+
+
+def robots_app(requests):
+    async def robots(request):
+        requests.append(request.path)
+        return web.Response(text='User-agent: *\nCrawl-delay: 2\nSitemap: /sitemap.xml\n')
+
+    app = web.Application()
+    app.router.add_get('/robots.txt', robots)
+    return app
+
+
+def test_robots_txt_is_fetched_without_blocking_the_loop(technical_audit, audit_config, serve):
+    requests = []
+
+    async def run():
+        # The server shares the auditor's event loop, so a blocking fetch
+        # could never be answered
+        async with serve(robots_app(requests)) as base_url:
+            auditor = technical_audit.TechnicalSEOAuditor(base_url, audit_config)
+            return auditor, await asyncio.wait_for(auditor.analyze_robots_txt(), timeout=10)
+
+    auditor, results = asyncio.run(run())
+    assert requests == ['/robots.txt']
+    assert results['exists'] and results['crawl_delay'] == 2.0
+    assert auditor.scheduler.interval_for(auditor.domain) == 2.0
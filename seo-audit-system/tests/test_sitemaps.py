@@ -0,0 +1,79 @@
+import asyncio
+import gzip
+import io
+
+import aiohttp
+from aiohttp import web
+
+from audit_core.sitemaps import SitemapEngine, iter_sitemap, parse_timestamp
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+def urlset(*paths, namespace=NS):
+    entries = ''.join(f'<url><loc>https://example.com{path}</loc><priority>0.8</priority>'
+                      f'<lastmod>2024-05-01</lastmod></url>' for path in paths)
+    return f'<?xml version="1.0"?><urlset {namespace}>{entries}</urlset>'.encode()
+
+
+def test_plain_and_namespaced_sitemaps_parse_alike():
+    for namespace in (NS, ''):
+        entries = list(iter_sitemap(io.BytesIO(urlset('/a/', '/b/', namespace=namespace)), source='s'))
+        assert [(kind, entry.loc) for kind, entry in entries] == [
+            ('url', 'https://example.com/a/'), ('url', 'https://example.com/b/')]
+        first = entries[0][1]
+        assert (first.priority, first.lastmod, first.source) == (0.8, '2024-05-01', 's')
+
+
+def test_gzipped_sitemap_is_detected_by_magic():
+    entries = list(iter_sitemap(io.BytesIO(gzip.compress(urlset('/a/')))))
+    assert [entry.loc for _, entry in entries] == ['https://example.com/a/']
+
+
+def test_index_entries_are_reported_as_sitemaps():
+    index = (f'<sitemapindex {NS}><sitemap><loc> https://example.com/s1.xml </loc></sitemap>'
+             f'</sitemapindex>').encode()
+    assert list(iter_sitemap(io.BytesIO(index))) == [('sitemap', 'https://example.com/s1.xml')]
+
+
+def test_parse_timestamp_accepts_dates_and_zulu_times():
+    assert parse_timestamp('2024-05-01').year == 2024
+    assert parse_timestamp('2024-05-01T10:00:00Z') is not None
+    assert parse_timestamp('yesterday') is None
+
+
+def test_engine_streams_index_children_and_skips_repeats(serve):
+    index = ('<sitemapindex {ns}><sitemap><loc>{base}/s1.xml</loc></sitemap>'
+             '<sitemap><loc>{base}/s2.xml.gz</loc></sitemap>'
+             '<sitemap><loc>{base}/s1.xml</loc></sitemap>'
+             '<sitemap><loc>{base}/missing.xml</loc></sitemap></sitemapindex>')
+    bodies = {'/s1.xml': urlset('/a/', '/b/'), '/s2.xml.gz': gzip.compress(urlset('/c/')),
+              '/broken.xml': b'<urlset><url><loc>'}
+    requests = []
+    served = {}
+
+    async def handle(request):
+        requests.append(request.path)
+        if request.path == '/index.xml':
+            return web.Response(body=index.format(ns=NS, base=served['base']).encode())
+        if request.path in bodies:
+            return web.Response(body=bodies[request.path])
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_get('/{path:.*}', handle)
+
+    async def run():
+        async with serve(app) as base_url:
+            served['base'] = base_url
+            async with aiohttp.ClientSession() as session:
+                engine = SitemapEngine(session)
+                locs = [entry.loc async for entry in
+                        engine.stream([f'{base_url}/index.xml', f'{base_url}/broken.xml'])]
+                return engine, locs
+
+    engine, locs = asyncio.run(run())
+    assert sorted(locs) == ['https://example.com/a/', 'https://example.com/b/', 'https://example.com/c/']
+    assert requests.count('/s1.xml') == 1
+    assert len(engine.found_sitemaps) == 4
+    assert len(engine.issues) == 1 and 'Invalid XML' in engine.issues[0]
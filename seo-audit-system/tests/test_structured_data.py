@@ -0,0 +1,45 @@
+import gzip
+import json
+
+from audit_core import issues
+from audit_core.schema_vocabulary import VOCABULARY_PATH, vocabulary
+from audit_core.structured_data import validate_json_ld
+
+
+def test_bundled_vocabulary_is_builder_output():
+    with gzip.open(VOCABULARY_PATH, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+    # build-schema-vocabulary.py writes the release as a string
+    assert data['version'] == '12.0'
+    assert vocabulary().version == '12.0'
+
+
+def test_profiles_skip_nested_references():
+    found = validate_json_ld({
+        '@context': 'https://schema.org',
+        '@type': 'LocalBusiness',
+        'name': 'Repair Shop',
+        'address': '1 Main St',
+        'makesOffer': {
+            '@type': 'Offer',
+            'itemOffered': {'@type': 'Service', 'name': 'Screen repair'}
+        }
+    })
+    assert issues.SCHEMA_REQUIRED_MISSING.code not in found.codes
+
+
+def test_profiles_apply_to_graph_entities():
+    found = validate_json_ld({
+        '@context': 'https://schema.org',
+        '@graph': [{'@type': 'Service', 'name': 'Screen repair'}]
+    })
+    assert "Service is missing required property 'provider'" in found
+
+
+def test_faq_questions_are_checked_when_nested():
+    found = validate_json_ld({
+        '@context': 'https://schema.org',
+        '@type': 'FAQPage',
+        'mainEntity': [{'@type': 'Question', 'name': 'How long does it take?'}]
+    })
+    assert "Question is missing required property 'acceptedAnswer'" in found
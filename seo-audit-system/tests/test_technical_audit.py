@@ -0,0 +1,106 @@
+import asyncio
+from collections import Counter
+from urllib.parse import urlparse
+
+from aiohttp import web
+
+PAGES = 12
+
+
+def test_full_audit_crawls_pages_concurrently(technical_audit, audit_config, serve, page_html):
+    hits = Counter()
+    in_flight = [0, 0]
+
+    async def page(request):
+        hits[request.path] += 1
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight[1], in_flight[0])
+        await asyncio.sleep(0.05)
+        in_flight[0] -= 1
+        number = int(request.match_info['number'])
+        links = ['/'] + [f'/p{(number + k) % PAGES}/' for k in (1, 2)]
+        return web.Response(text=page_html(f'Synthetic page number {number} of the site', links),
+                            content_type='text/html')
+
+    async def home(request):
+        hits['/'] += 1
+        return web.Response(text=page_html('Home page of the synthetic test site', ['/p0/', '/p6/']),
+                            content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/', home)
+    app.router.add_get('/p{number:\\d+}/', page)
+
+    audit_config['general']['max_requests_per_host'] = 4
+    audit_config['crawl']['max_depth'] = PAGES
+
+    async def run():
+        async with serve(app) as base_url:
+            auditor = technical_audit.TechnicalSEOAuditor(base_url, audit_config)
+            return await asyncio.wait_for(auditor.run_full_audit(), timeout=60)
+
+    results = asyncio.run(run())
+    audited = sorted(urlparse(page.url).path for page in results['pages'])
+    assert audited == sorted(['/'] + [f'/p{n}/' for n in range(PAGES)])
+    assert all(count == 1 for path, count in hits.items())
+    assert in_flight[1] > 1
+    assert results['summary']['total_pages_audited'] == PAGES + 1
+
+
+def test_pool_analysis_matches_in_loop_analysis(technical_audit, audit_config, serve, site_app,
+                                                page_html):
+    pages = {'/': page_html('Home page of the analysis pool test site', ['/a/', '/b/'])}
+    for name in 'ab':
+        pages[f'/{name}/'] = page_html(f'Page {name} of the analysis pool test site', ['/'],
+                                       body=f'Some words about {name}. ' * 20)
+
+    async def audit(workers):
+        audit_config['crawl']['analysis_workers'] = workers
+        async with serve(site_app(pages)) as base_url:
+            auditor = technical_audit.TechnicalSEOAuditor(base_url, audit_config)
+            results = await asyncio.wait_for(auditor.run_full_audit(), timeout=60)
+            analyses = {urlparse(page.url).path: (page.meta_tags, page.header_structure.to_dict(),
+                                                  page.duplicate_content['simhash'],
+                                                  page.issue_codes.tolist())
+                        for page in results['pages']}
+            return analyses, results['stage_timings']
+
+    in_loop, loop_timings = asyncio.run(audit(0))
+    pooled, pool_timings = asyncio.run(audit(2))
+    assert pooled == in_loop
+    assert len(pooled) == 3
+    assert pool_timings['analysis_queue_wait']['wall']['count'] == 3
+    assert pool_timings['analyze_document']['wall']['count'] == 3
+    assert 'analysis_queue_wait' not in loop_timings
+
+
+def test_sitemap_urls_seed_the_crawl(technical_audit, audit_config, serve, site_app, page_html):
+    urls = {}
+
+    def robots(request):
+        return web.Response(text=f"User-agent: *\nDisallow:\nSitemap: {urls['base']}/sitemap.xml\n")
+
+    def sitemap(request):
+        entries = ''.join(f"<url><loc>{urls['base']}{path}</loc></url>" for path in ('/', '/orphan/'))
+        return web.Response(text=f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                                 f'{entries}</urlset>', content_type='application/xml')
+
+    pages = {
+        '/robots.txt': robots,
+        '/sitemap.xml': sitemap,
+        '/': page_html('Home page of the sitemap seeding test site', ['/', '/linked/']),
+        '/linked/': page_html('Linked page of the sitemap seeding test site', ['/']),
+        '/orphan/': page_html('Orphan page of the sitemap seeding test site', ['/']),
+    }
+
+    async def run():
+        async with serve(site_app(pages)) as base_url:
+            urls['base'] = base_url
+            auditor = technical_audit.TechnicalSEOAuditor(base_url, audit_config)
+            return base_url, await asyncio.wait_for(auditor.run_full_audit(), timeout=60)
+
+    base_url, results = asyncio.run(run())
+    assert sorted(urlparse(page.url).path for page in results['pages']) == ['/', '/linked/', '/orphan/']
+    coverage = results['sitemap_coverage']
+    assert coverage['orphans']['urls'] == [base_url + '/orphan/']
+    assert coverage['missing_from_sitemap']['urls'] == [base_url + '/linked/']
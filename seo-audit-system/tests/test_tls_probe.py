@@ -0,0 +1,86 @@
+import asyncio
+import json
+import shutil
+import ssl
+import subprocess
+import time
+
+import pytest
+
+from audit_core.tls_probe import TLSProber
+
+
+@pytest.fixture(scope='module')
+def certificate(tmp_path_factory):
+    """A self-signed certificate for localhost and its key"""
+    if shutil.which('openssl') is None:
+        pytest.skip('openssl is not installed')
+    directory = tmp_path_factory.mktemp('tls')
+    cert, key = directory / 'cert.pem', directory / 'key.pem'
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '30',
+                    '-subj', '/CN=localhost', '-addext', 'subjectAltName=DNS:localhost',
+                    '-keyout', str(key), '-out', str(cert)], check=True, capture_output=True)
+    return str(cert), str(key)
+
+
+def probe_local(prober, certificate, hosts=('localhost',)):
+    """Run probe_all against a local TLS server; returns (results, handshakes)"""
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(*certificate)
+    handshakes = []
+
+    async def handle(reader, writer):
+        handshakes.append(1)
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0, ssl=context)
+        port = server.sockets[0].getsockname()[1]
+        original = prober.probe
+
+        async def probe(host, _port=443):
+            return await original(host, port)
+
+        prober.probe = probe
+        async with server:
+            return await prober.probe_all(hosts)
+
+    return asyncio.run(run()), handshakes
+
+
+def test_trusted_certificate_is_probed_then_cached(certificate, tmp_path):
+    cache_path = str(tmp_path / 'tls.json')
+    prober = TLSProber(cache_path=cache_path, timeout=5, refresh_days=7)
+    prober.context = ssl.create_default_context(cafile=certificate[0])
+    results, handshakes = probe_local(prober, certificate, hosts=['LOCALHOST', 'localhost', ''])
+    facts = results['localhost']
+    assert facts['certificate_valid'] and facts['subject'] == {'commonName': 'localhost'}
+    assert 29 < facts['days_remaining'] <= 30
+    assert facts['subject_alt_names'] == ['localhost']
+    assert len(handshakes) == 1 and prober.stats['probed'] == 1
+
+    # Cached until refresh_days before notAfter, so the next run does no handshake
+    again = TLSProber(cache_path=cache_path)
+    results, handshakes = probe_local(again, certificate)
+    assert results['localhost']['from_cache'] and handshakes == []
+
+
+def test_untrusted_certificate_fails_verification(certificate, tmp_path):
+    prober = TLSProber(cache_path=str(tmp_path / 'tls.json'), timeout=5)
+    results, _ = probe_local(prober, certificate)
+    assert results['localhost']['certificate_valid'] is False
+    assert 'verification failed' in results['localhost']['error']
+    assert prober.stats['failed'] == 1 and prober.cache == {}
+
+
+def test_expired_cache_entries_are_dropped(tmp_path):
+    cache_path = tmp_path / 'tls.json'
+    cache_path.write_text(json.dumps({
+        'old.example': {'facts': {}, 'expires_at': time.time() - 1},
+        'new.example': {'facts': {'not_after_epoch': time.time() + 86400}, 'expires_at': time.time() + 60}
+    }))
+    prober = TLSProber(cache_path=str(cache_path))
+    assert prober.cached('old.example') is None
+    assert prober.cached('new.example')['days_remaining'] == 1.0
+    prober.save()
+    assert list(json.loads(cache_path.read_text())) == ['new.example']